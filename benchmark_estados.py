@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark de generación de estados financieros según los años cerrados.
+
+Carga historia sintética (cuentas y saldos mensuales) de 1 a 40 años antes
+de los datos reales y mide FinancialStatementsService.generar_estados con y
+sin snapshots anuales. Todo corre dentro de una transacción que se deshace
+al terminar: la base queda como estaba.
+
+Uso: python benchmark_estados.py [cuentas]
+"""
+import sys
+import os
+import time
+from datetime import date
+from statistics import median
+
+# Añadir src al path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+ANIOS_CERRADOS = (1, 5, 10, 20, 40)
+REPETICIONES = 5
+TIPOS = ('activo', 'pasivo', 'patrimonio', 'ingreso', 'gasto')
+
+def crear_cuentas(connection, cantidad):
+    from sqlalchemy import insert
+    from models import CuentaContable, ruta_de_codigo
+
+    filas = []
+    for n in range(1, cantidad + 1):
+        codigo = f"9.{n}"
+        filas.append({'codigo': codigo, 'nombre': f"CUENTA BENCHMARK {n}",
+                      'tipo': TIPOS[n % len(TIPOS)], 'activa': True,
+                      'nivel': 2, 'ruta': ruta_de_codigo(codigo)})
+    connection.execute(insert(CuentaContable), filas)
+
+def cargar_historia(connection, anio_desde, anio_hasta):
+    from sqlalchemy import text
+
+    connection.execute(text("""
+        INSERT INTO saldos_cuenta (cuenta_id, periodo, total_debe, total_haber, movimientos)
+        SELECT c.id, make_date(a, m, 1), 100 + c.id % 7, 50 + c.id % 3, 10
+        FROM cuentas_contables c, generate_series(:desde, :hasta) a, generate_series(1, 12) m
+        WHERE c.codigo LIKE '9.%'
+    """), {'desde': anio_desde, 'hasta': anio_hasta})
+    connection.execute(text("ANALYZE saldos_cuenta"))
+
+def medir(session, servicio, fecha_fin):
+    tiempos = []
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        servicio.generar_estados(session, fecha_fin, periodicidad='anual', comparativos=2)
+        tiempos.append(time.perf_counter() - inicio)
+    return median(tiempos) * 1000
+
+def main():
+    from sqlalchemy import text
+    from sqlalchemy.orm import Session
+    from models import init_db, SaldoSnapshot
+    from services.account_balance_service import AccountBalanceService
+    from services.financial_statements_service import FinancialStatementsService
+
+    cantidad_cuentas = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    fecha_fin = date.today()
+
+    engine = init_db()
+    with engine.connect() as connection:
+        # La historia sintética va antes del primer mes con movimientos reales
+        primero = connection.execute(text("SELECT min(periodo) FROM saldos_cuenta")).scalar()
+    primer_anio_real = primero.year if primero else fecha_fin.year
+    saldos = AccountBalanceService()
+    estados = FinancialStatementsService()
+
+    print("🦇 BENCHMARK - ESTADOS FINANCIEROS")
+    print(f"   {cantidad_cuentas} cuentas sintéticas, 3 columnas comparativas, mediana de {REPETICIONES}")
+    print("=" * 60)
+    print(f"{'Años cerrados':>14} | {'Sin snapshots (ms)':>19} | {'Con snapshots (ms)':>19}")
+
+    with engine.connect() as connection:
+        transaccion = connection.begin()
+        try:
+            crear_cuentas(connection, cantidad_cuentas)
+
+            for anios in ANIOS_CERRADOS:
+                punto = connection.begin_nested()
+                # commit() de la sesión libera su propio savepoint, no la transacción del benchmark
+                session = Session(bind=connection, join_transaction_mode="create_savepoint")
+
+                cargar_historia(connection, primer_anio_real - anios, primer_anio_real - 1)
+                session.query(SaldoSnapshot).delete()
+                sin_snapshots = medir(session, estados, fecha_fin)
+
+                for anio in range(primer_anio_real - anios + 1, fecha_fin.year + 1):
+                    saldos.crear_snapshot(session, date(anio, 1, 1))
+                con_snapshots = medir(session, estados, fecha_fin)
+
+                print(f"{anios:>14} | {sin_snapshots:>19.1f} | {con_snapshots:>19.1f}")
+                session.close()
+                punto.rollback()
+        finally:
+            transaccion.rollback()
+
+    print("=" * 60)
+    print("Con snapshots el tiempo depende sólo del periodo abierto, no de los años cerrados")
+
+if __name__ == "__main__":
+    main()
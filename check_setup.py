@@ -26,12 +26,12 @@ def check_dependencies():
 def check_database():
     print("\n🔍 Verificando base de datos...")
     try:
-        from src.models import init_db
-        engine = init_db()
+        from models import init_db
+        init_db()
         
         # Verificar que podemos crear sesión
-        from src.models import get_session, create_default_user
-        session = get_session(engine)
+        from models import get_session, create_default_user
+        session = get_session()
         create_default_user(session)
         session.close()
         
@@ -41,6 +41,79 @@ def check_database():
         print(f"❌ Error de base de datos: {e}")
         return False
 
+def check_indexes():
+    print("\n🔍 Verificando índices...")
+    try:
+        from sqlalchemy import inspect
+        from models import Base, get_engine
+        
+        inspector = inspect(get_engine())
+        faltantes = []
+        for tabla in Base.metadata.sorted_tables:
+            existentes = {ix['name'] for ix in inspector.get_indexes(tabla.name)}
+            for indice in tabla.indexes:
+                if indice.name in existentes:
+                    print(f"✅ {tabla.name}.{indice.name}")
+                else:
+                    faltantes.append(indice.name)
+                    print(f"❌ {tabla.name}.{indice.name} - No existe")
+        
+        return faltantes
+    except Exception as e:
+        print(f"❌ Error verificando índices: {e}")
+        return None
+
+def check_saldos():
+    print("\n🔍 Verificando saldos por cuenta...")
+    try:
+        from models import get_session
+        from services.account_balance_service import AccountBalanceService
+        
+        session = get_session()
+        diferencias = AccountBalanceService().verificar_saldos(session)
+        session.close()
+        
+        if diferencias:
+            print(f"❌ {len(diferencias)} saldos no coinciden con las líneas de asiento")
+        else:
+            print("✅ saldos_cuenta consistente")
+        return len(diferencias)
+    except Exception as e:
+        print(f"❌ Error verificando saldos: {e}")
+        return None
+
+def explain_queries():
+    print("\n🔍 Planes de ejecución de las consultas principales...")
+    try:
+        from datetime import date, timedelta
+        from models import AsientoContable, LineaAsiento, get_session
+        from services.journal_service import JournalService
+        
+        session = get_session()
+        journal_service = JournalService()
+        hasta = date.today()
+        desde = hasta - timedelta(days=30)
+        
+        consultas = {
+            "Libro diario (obtener_asientos)": journal_service._consulta_lineas_asientos(session)
+                .filter(AsientoContable.fecha >= desde, AsientoContable.fecha <= hasta)
+                .order_by(AsientoContable.fecha.desc(), AsientoContable.numero.desc(), LineaAsiento.id),
+            "Totales del periodo (obtener_estadisticas_generales)": journal_service._totales_periodo(session)
+                .filter(AsientoContable.fecha >= desde, AsientoContable.fecha <= hasta),
+        }
+        
+        connection = session.connection()
+        for titulo, query in consultas.items():
+            compilada = query.statement.compile(dialect=connection.dialect)
+            plan = connection.exec_driver_sql(f"EXPLAIN {compilada}", compilada.params).scalars().all()
+            print(f"\n📋 {titulo}")
+            for linea in plan:
+                print(f"   {linea}")
+        
+        session.close()
+    except Exception as e:
+        print(f"❌ Error obteniendo planes de ejecución: {e}")
+
 def main():
     print("🦇 NECROLEDGER - VERIFICACIÓN DE INSTALACIÓN")
     print("=" * 50)
@@ -51,8 +124,14 @@ def main():
     # Verificar base de datos
     db_ok = check_database()
     
+    # Verificar índices y planes de las consultas principales
+    indices_faltantes = check_indexes() if db_ok else None
+    saldos_erroneos = check_saldos() if db_ok else None
+    if db_ok:
+        explain_queries()
+    
     print("\n" + "=" * 50)
-    if not missing and db_ok:
+    if not missing and db_ok and not indices_faltantes and not saldos_erroneos:
         print("🎉 ¡Todo está listo! Puedes ejecutar: python main.py")
     else:
         if missing:
@@ -61,6 +140,12 @@ def main():
         if not db_ok:
             print("⚠️  Problemas con la base de datos")
             print("   Verifica que Docker esté corriendo en puerto 5433")
+        if indices_faltantes:
+            print(f"⚠️  Faltan índices: {', '.join(indices_faltantes)}")
+            print("   Ejecuta: alembic upgrade head")
+        if saldos_erroneos:
+            print(f"⚠️  {saldos_erroneos} saldos por cuenta desactualizados")
+            print("   Ejecuta: python src/services/account_balance_service.py --reconstruir")
 
 if __name__ == "__main__":
     main()
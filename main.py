@@ -8,7 +8,7 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.views.login_window import LoginWindow
 from src.views.main_window import MainWindow
-from src.models import init_db, create_default_user, create_default_accounts, get_session
+from models import init_db, create_default_user, create_default_accounts, get_session, dispose_engine
 
 class ContabilidadApp:
     def __init__(self):
@@ -24,10 +24,11 @@ class ContabilidadApp:
     
     def init_database(self):
         try:
+            # Engine compartido por toda la aplicación
             self.engine = init_db()
             
             # Crear usuario y cuentas por defecto
-            session = get_session(self.engine)
+            session = get_session()
             create_default_user(session)
             create_default_accounts(session)
             session.close()
@@ -66,7 +67,9 @@ class ContabilidadApp:
         self.show_login()
     
     def run(self):
-        return self.app.exec()
+        result = self.app.exec()
+        dispose_engine()
+        return result
 
 def main():
     print("🚀 Iniciando NecroLedger...")
@@ -0,0 +1,38 @@
+"""Índices para las consultas del libro diario y la auditoría
+
+Revision ID: 0001_indices_libro
+Revises:
+Create Date: 2026-10-18
+
+Las tablas base las crea init_db(); esta migración sólo agrega los índices
+a bases existentes. IF NOT EXISTS la hace segura sobre bases nuevas, donde
+create_all ya los creó desde los modelos.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_indices_libro'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+INDICES = [
+    ('ix_asientos_contables_fecha_numero', 'asientos_contables', 'fecha, numero'),
+    ('ix_lineas_asiento_asiento_id', 'lineas_asiento', 'asiento_id'),
+    ('ix_lineas_asiento_cuenta_asiento', 'lineas_asiento', 'cuenta_id, asiento_id'),
+    ('ix_audit_logs_fecha', 'audit_logs', 'fecha'),
+    ('ix_audit_logs_usuario_fecha', 'audit_logs', 'usuario_id, fecha'),
+]
+
+
+def upgrade():
+    for nombre, tabla, columnas in INDICES:
+        op.execute(f"CREATE INDEX IF NOT EXISTS {nombre} ON {tabla} ({columnas})")
+
+
+def downgrade():
+    for nombre, _tabla, _columnas in INDICES:
+        op.execute(f"DROP INDEX IF EXISTS {nombre}")
@@ -0,0 +1,51 @@
+"""Tabla saldos_cuenta con totales por cuenta y mes
+
+Revision ID: 0002_saldos_cuenta
+Revises: 0001_indices_libro
+Create Date: 2026-10-18
+
+En bases nuevas init_db() ya creó la tabla desde los modelos; IF NOT EXISTS
+mantiene la migración segura. La carga inicial recalcula los saldos desde las
+líneas existentes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_saldos_cuenta'
+down_revision = '0001_indices_libro'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS saldos_cuenta (
+            cuenta_id INTEGER NOT NULL REFERENCES cuentas_contables (id),
+            periodo DATE NOT NULL,
+            total_debe NUMERIC(18, 2) NOT NULL DEFAULT 0,
+            total_haber NUMERIC(18, 2) NOT NULL DEFAULT 0,
+            movimientos INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (cuenta_id, periodo)
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_saldos_cuenta_periodo ON saldos_cuenta (periodo)")
+
+    op.execute("DELETE FROM saldos_cuenta")
+    op.execute("""
+        INSERT INTO saldos_cuenta (cuenta_id, periodo, total_debe, total_haber, movimientos)
+        SELECT l.cuenta_id,
+               date_trunc('month', a.fecha)::date,
+               COALESCE(SUM(l.debe), 0),
+               COALESCE(SUM(l.haber), 0),
+               COUNT(l.id)
+        FROM lineas_asiento l
+        JOIN asientos_contables a ON a.id = l.asiento_id
+        WHERE l.cuenta_id IS NOT NULL
+        GROUP BY l.cuenta_id, date_trunc('month', a.fecha)::date
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS saldos_cuenta")
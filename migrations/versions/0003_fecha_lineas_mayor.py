@@ -0,0 +1,38 @@
+"""Fecha en las líneas de asiento e índice del libro mayor
+
+Revision ID: 0003_fecha_lineas_mayor
+Revises: 0002_saldos_cuenta
+Create Date: 2026-10-18
+
+El libro mayor recorre los movimientos de una cuenta por fecha. Con la fecha
+copiada en lineas_asiento, el índice (cuenta_id, fecha, id) con debe/haber
+incluidos resuelve el rango y el saldo acumulado sin tocar asientos_contables.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_fecha_lineas_mayor'
+down_revision = '0002_saldos_cuenta'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("ALTER TABLE lineas_asiento ADD COLUMN IF NOT EXISTS fecha TIMESTAMP WITHOUT TIME ZONE")
+    op.execute("""
+        UPDATE lineas_asiento l
+        SET fecha = a.fecha
+        FROM asientos_contables a
+        WHERE a.id = l.asiento_id AND l.fecha IS DISTINCT FROM a.fecha
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_lineas_asiento_cuenta_fecha
+        ON lineas_asiento (cuenta_id, fecha, id) INCLUDE (debe, haber)
+    """)
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_lineas_asiento_cuenta_fecha")
+    op.execute("ALTER TABLE lineas_asiento DROP COLUMN IF EXISTS fecha")
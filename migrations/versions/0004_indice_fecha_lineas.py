@@ -0,0 +1,30 @@
+"""Índice por fecha en las líneas para los balances
+
+Revision ID: 0004_indice_fecha_lineas
+Revises: 0003_fecha_lineas_mayor
+Create Date: 2026-10-18
+
+Los balances suman los meses completos desde saldos_cuenta y sólo leen
+líneas en los días sueltos al inicio y al final del periodo; este índice
+resuelve esos rangos sin recorrer la tabla.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_indice_fecha_lineas'
+down_revision = '0003_fecha_lineas_mayor'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_lineas_asiento_fecha
+        ON lineas_asiento (fecha) INCLUDE (cuenta_id, debe, haber)
+    """)
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_lineas_asiento_fecha")
@@ -0,0 +1,64 @@
+"""Jerarquía materializada del plan de cuentas
+
+Revision ID: 0005_jerarquia_cuentas
+Revises: 0004_indice_fecha_lineas
+Create Date: 2026-10-18
+
+Agrega parent_id, nivel y ruta (código con segmentos rellenados a 6 dígitos,
+collation C) a cuentas_contables y los calcula para las cuentas existentes.
+Después los mantiene el modelo al insertar o actualizar.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_jerarquia_cuentas'
+down_revision = '0004_indice_fecha_lineas'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        ALTER TABLE cuentas_contables
+            ADD COLUMN IF NOT EXISTS parent_id INTEGER REFERENCES cuentas_contables (id),
+            ADD COLUMN IF NOT EXISTS nivel INTEGER,
+            ADD COLUMN IF NOT EXISTS ruta VARCHAR(150) COLLATE "C"
+    """)
+    op.execute("""
+        UPDATE cuentas_contables c
+        SET nivel = array_length(string_to_array(trim(c.codigo), '.'), 1),
+            ruta = (
+                SELECT string_agg(CASE WHEN length(s) >= 6 THEN s ELSE lpad(s, 6, '0') END, '.' ORDER BY n)
+                FROM unnest(string_to_array(trim(c.codigo), '.')) WITH ORDINALITY AS t(s, n)
+            )
+    """)
+    op.execute("""
+        WITH padres AS (
+            SELECT h.id, (
+                SELECT p.id FROM cuentas_contables p
+                WHERE h.ruta LIKE p.ruta || '.%'
+                ORDER BY p.nivel DESC
+                LIMIT 1
+            ) AS padre
+            FROM cuentas_contables h
+        )
+        UPDATE cuentas_contables c
+        SET parent_id = padres.padre
+        FROM padres
+        WHERE c.id = padres.id AND c.parent_id IS DISTINCT FROM padres.padre
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_cuentas_contables_ruta ON cuentas_contables (ruta)")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_cuentas_contables_parent_id ON cuentas_contables (parent_id)")
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_cuentas_contables_parent_id")
+    op.execute("DROP INDEX IF EXISTS ix_cuentas_contables_ruta")
+    op.execute("""
+        ALTER TABLE cuentas_contables
+            DROP COLUMN IF EXISTS ruta,
+            DROP COLUMN IF EXISTS nivel,
+            DROP COLUMN IF EXISTS parent_id
+    """)
@@ -0,0 +1,35 @@
+"""Snapshots de saldos acumulados por cuenta
+
+Revision ID: 0006_saldos_snapshot
+Revises: 0005_jerarquia_cuentas
+Create Date: 2026-10-18
+
+Los estados financieros parten del último snapshot anterior a cada fecha y
+sólo suman los meses posteriores desde saldos_cuenta.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_saldos_snapshot'
+down_revision = '0005_jerarquia_cuentas'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS saldos_snapshot (
+            fecha_corte DATE NOT NULL,
+            cuenta_id INTEGER NOT NULL REFERENCES cuentas_contables (id),
+            total_debe NUMERIC(18, 2) NOT NULL DEFAULT 0,
+            total_haber NUMERIC(18, 2) NOT NULL DEFAULT 0,
+            creado_en TIMESTAMP WITHOUT TIME ZONE,
+            PRIMARY KEY (fecha_corte, cuenta_id)
+        )
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS saldos_snapshot")
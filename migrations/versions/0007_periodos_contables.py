@@ -0,0 +1,44 @@
+"""Periodos contables y cierre de periodos
+
+Revision ID: 0007_periodos_contables
+Revises: 0006_saldos_snapshot
+Create Date: 2026-10-18
+
+Un periodo cerrado bloquea los asientos con fecha hasta su fin; el índice
+parcial sobre fecha_fin de los cerrados hace que la validación al registrar
+o eliminar sea una sola lectura del índice.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_periodos_contables'
+down_revision = '0006_saldos_snapshot'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS periodos_contables (
+            id SERIAL PRIMARY KEY,
+            fecha_inicio DATE NOT NULL,
+            fecha_fin DATE NOT NULL,
+            cerrado BOOLEAN NOT NULL DEFAULT FALSE,
+            cerrado_en TIMESTAMP WITHOUT TIME ZONE,
+            cerrado_por INTEGER REFERENCES usuarios (id)
+        )
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_periodos_contables_cierre
+        ON periodos_contables (fecha_fin) WHERE cerrado
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS ix_periodos_contables_inicio
+        ON periodos_contables (fecha_inicio)
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS periodos_contables")
@@ -0,0 +1,49 @@
+"""Numeración de asientos con contador por serie
+
+Revision ID: 0008_numeracion_asientos
+Revises: 0007_periodos_contables
+Create Date: 2026-10-18
+
+Crea numeracion_asientos (formato por año fiscal) y contadores_asiento, y
+arranca los contadores diarios desde los números AS-AAAAMMDD-NNN existentes.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_numeracion_asientos'
+down_revision = '0007_periodos_contables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS numeracion_asientos (
+            anio INTEGER PRIMARY KEY,
+            prefijo VARCHAR(10) NOT NULL DEFAULT 'AS',
+            reinicio VARCHAR(10) NOT NULL DEFAULT 'diario',
+            digitos INTEGER NOT NULL DEFAULT 3
+        )
+    """)
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS contadores_asiento (
+            serie VARCHAR(30) PRIMARY KEY,
+            ultimo INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+    op.execute(r"""
+        INSERT INTO contadores_asiento (serie, ultimo)
+        SELECT substring(numero FROM '^(AS-\d{8})-\d+$'),
+               max(CAST(substring(numero FROM '-(\d+)$') AS INTEGER))
+        FROM asientos_contables
+        WHERE numero ~ '^AS-\d{8}-\d+$'
+        GROUP BY 1
+        ON CONFLICT (serie) DO NOTHING
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS contadores_asiento")
+    op.execute("DROP TABLE IF EXISTS numeracion_asientos")
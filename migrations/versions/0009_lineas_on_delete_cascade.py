@@ -0,0 +1,36 @@
+"""Borrado en cascada de las líneas de asiento
+
+Revision ID: 0009_lineas_on_delete_cascade
+Revises: 0008_numeracion_asientos
+Create Date: 2026-10-18
+
+Recrea la FK lineas_asiento.asiento_id con ON DELETE CASCADE: al borrar un
+asiento la base de datos elimina sus líneas por el índice de asiento_id.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_lineas_on_delete_cascade'
+down_revision = '0008_numeracion_asientos'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("ALTER TABLE lineas_asiento DROP CONSTRAINT IF EXISTS lineas_asiento_asiento_id_fkey")
+    op.execute("""
+        ALTER TABLE lineas_asiento
+        ADD CONSTRAINT lineas_asiento_asiento_id_fkey
+        FOREIGN KEY (asiento_id) REFERENCES asientos_contables (id) ON DELETE CASCADE
+    """)
+
+
+def downgrade():
+    op.execute("ALTER TABLE lineas_asiento DROP CONSTRAINT IF EXISTS lineas_asiento_asiento_id_fkey")
+    op.execute("""
+        ALTER TABLE lineas_asiento
+        ADD CONSTRAINT lineas_asiento_asiento_id_fkey
+        FOREIGN KEY (asiento_id) REFERENCES asientos_contables (id)
+    """)
@@ -0,0 +1,42 @@
+"""Anulación de asientos por reversión
+
+Revision ID: 0010_anulacion_asientos
+Revises: 0009_lineas_on_delete_cascade
+Create Date: 2026-10-18
+
+Un asiento anulado queda marcado y otro asiento con reversion_de apuntando a
+él registra sus líneas invertidas. El índice único parcial impide revertir
+dos veces el mismo asiento.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_anulacion_asientos'
+down_revision = '0009_lineas_on_delete_cascade'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        ALTER TABLE asientos_contables
+            ADD COLUMN IF NOT EXISTS anulado BOOLEAN NOT NULL DEFAULT FALSE,
+            ADD COLUMN IF NOT EXISTS anulado_en TIMESTAMP WITHOUT TIME ZONE,
+            ADD COLUMN IF NOT EXISTS reversion_de INTEGER REFERENCES asientos_contables (id)
+    """)
+    op.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS ix_asientos_contables_reversion
+        ON asientos_contables (reversion_de) WHERE reversion_de IS NOT NULL
+    """)
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_asientos_contables_reversion")
+    op.execute("""
+        ALTER TABLE asientos_contables
+            DROP COLUMN IF EXISTS reversion_de,
+            DROP COLUMN IF EXISTS anulado_en,
+            DROP COLUMN IF EXISTS anulado
+    """)
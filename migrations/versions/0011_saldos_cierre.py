@@ -0,0 +1,45 @@
+"""Saldos de cierre de periodo
+
+Revision ID: 0011_saldos_cierre
+Revises: 0010_anulacion_asientos
+Create Date: 2026-10-18
+
+Copia de los saldos acumulados al cerrar cada periodo. Al reabrir un
+periodo el snapshot de saldos_snapshot vuelve a ser una caché que el
+próximo asiento descarta; saldos_cierre conserva lo que se cerró.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_saldos_cierre'
+down_revision = '0010_anulacion_asientos'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS saldos_cierre (
+            periodo_id INTEGER NOT NULL REFERENCES periodos_contables (id),
+            cuenta_id INTEGER NOT NULL REFERENCES cuentas_contables (id),
+            total_debe NUMERIC(18, 2) NOT NULL DEFAULT 0,
+            total_haber NUMERIC(18, 2) NOT NULL DEFAULT 0,
+            creado_en TIMESTAMP WITHOUT TIME ZONE,
+            PRIMARY KEY (periodo_id, cuenta_id)
+        )
+    """)
+    # Periodos ya cerrados: su snapshot todavía está en saldos_snapshot
+    op.execute("""
+        INSERT INTO saldos_cierre (periodo_id, cuenta_id, total_debe, total_haber, creado_en)
+        SELECT p.id, s.cuenta_id, s.total_debe, s.total_haber, s.creado_en
+        FROM periodos_contables p
+        JOIN saldos_snapshot s ON s.fecha_corte = p.fecha_fin + 1
+        WHERE p.cerrado
+        ON CONFLICT DO NOTHING
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS saldos_cierre")
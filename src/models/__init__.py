@@ -1,8 +1,11 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Numeric, Text, Boolean, ForeignKey
+from sqlalchemy import create_engine, event, text, and_, or_, select, update, inspect, Column, Integer, String, Date, DateTime, Numeric, Text, Boolean, ForeignKey, Index
+from sqlalchemy.engine import URL
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import sessionmaker, relationship, aliased
 from datetime import datetime
+from decimal import Decimal
 import os
+import threading
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -28,6 +31,85 @@ class CuentaContable(Base):
     tipo = Column(String(20))  # activo, pasivo, patrimonio, ingreso, gasto
     descripcion = Column(Text)
     activa = Column(Boolean, default=True)
+    
+    # Jerarquía materializada a partir del código; se mantiene al insertar/actualizar
+    parent_id = Column(Integer, ForeignKey('cuentas_contables.id'))
+    nivel = Column(Integer)
+    ruta = Column(String(150, collation='C'))  # 1.2 → 000001.000002 (orden natural)
+    
+    padre = relationship("CuentaContable", remote_side=[id])
+    
+    __table_args__ = (
+        # Orden natural del plan de cuentas y subárboles por rango de ruta
+        Index('ix_cuentas_contables_ruta', 'ruta'),
+        Index('ix_cuentas_contables_parent_id', 'parent_id'),
+    )
+    
+    @classmethod
+    def en_subarbol(cls, ruta, columna=None):
+        """
+        Condición "la cuenta es ruta o una de sus subcuentas" como rango sobre
+        el índice de ruta: con collation C, '/' sigue a '.' y a ningún dígito
+        """
+        columna = cls.ruta if columna is None else columna
+        return and_(columna >= ruta, columna < ruta + '/')
+
+CENTAVO = Decimal('0.01')
+
+def a_monto(valor):
+    """
+    Importe exacto en Bs como Decimal con dos decimales. Los float (spin boxes,
+    hojas de cálculo) se convierten por su texto, sin arrastrar el error binario.
+    Un importe con fracciones de centavo no se redondea: queda tal cual para
+    que la validación lo rechace
+    """
+    if valor is None or valor == '':
+        return Decimal('0.00')
+    if isinstance(valor, float):
+        valor = repr(valor)
+    monto = Decimal(valor)
+    exacto = monto.quantize(CENTAVO)
+    return exacto if exacto == monto else monto
+
+def ruta_de_codigo(codigo):
+    """Clave ordenable del código: cada segmento con ceros a la izquierda"""
+    return '.'.join(segmento.rjust(6, '0') for segmento in codigo.strip().split('.'))
+
+def enlazar_subarbol(connection, ruta):
+    """
+    Apunta la cuenta de esa ruta y sus subcuentas a su ancestro existente más
+    cercano. Los candidatos son los prefijos de la ruta (búsqueda por índice)
+    y el propio subárbol, así el costo depende del subárbol y no del plan
+    """
+    segmentos = ruta.split('.')
+    ancestros = ['.'.join(segmentos[:i]) for i in range(1, len(segmentos))]
+    tabla = CuentaContable.__table__
+    padre = aliased(CuentaContable, name='padre')
+    ancestro_cercano = select(padre.id).where(
+        or_(padre.ruta.in_(ancestros), CuentaContable.en_subarbol(ruta, padre.ruta)),
+        tabla.c.ruta.like(padre.ruta + '.%')
+    ).order_by(padre.nivel.desc()).limit(1).scalar_subquery()
+    connection.execute(
+        update(tabla)
+        .where(CuentaContable.en_subarbol(ruta, tabla.c.ruta),
+               tabla.c.parent_id.is_distinct_from(ancestro_cercano))
+        .values(parent_id=ancestro_cercano)
+    )
+
+@event.listens_for(CuentaContable, 'before_insert')
+@event.listens_for(CuentaContable, 'before_update')
+def _calcular_ruta(mapper, connection, cuenta):
+    cuenta.ruta = ruta_de_codigo(cuenta.codigo)
+    cuenta.nivel = cuenta.codigo.strip().count('.') + 1
+
+@event.listens_for(CuentaContable, 'after_insert')
+@event.listens_for(CuentaContable, 'after_update')
+def _enlazar_jerarquia(mapper, connection, cuenta):
+    enlazar_subarbol(connection, cuenta.ruta)
+    # Con el código cambiado, las que eran sus subcuentas buscan otro padre
+    for codigo in inspect(cuenta).attrs.codigo.history.deleted:
+        if codigo and ruta_de_codigo(codigo) != cuenta.ruta:
+            enlazar_subarbol(connection, ruta_de_codigo(codigo))
 
 class AsientoContable(Base):
     __tablename__ = 'asientos_contables'
@@ -38,17 +120,32 @@ class AsientoContable(Base):
     descripcion = Column(Text)
     creado_por = Column(Integer, ForeignKey('usuarios.id'))
     creado_en = Column(DateTime, default=datetime.utcnow)
+    # Anulación por reversión: el asiento anulado se conserva y otro asiento
+    # (reversion_de = id del anulado) registra sus líneas con debe y haber invertidos
+    anulado = Column(Boolean, nullable=False, default=False, server_default=text('false'))
+    anulado_en = Column(DateTime)
+    reversion_de = Column(Integer, ForeignKey('asientos_contables.id'))
     
     # Relaciones
     usuario = relationship("Usuario")
-    lineas = relationship("LineaAsiento", back_populates="asiento")
+    # Las líneas las borra la base de datos (ON DELETE CASCADE)
+    lineas = relationship("LineaAsiento", back_populates="asiento", passive_deletes=True)
+    
+    __table_args__ = (
+        # Filtros por rango de fecha y ORDER BY fecha, numero del libro diario
+        Index('ix_asientos_contables_fecha_numero', 'fecha', 'numero'),
+        # Una sola reversión por asiento anulado
+        Index('ix_asientos_contables_reversion', 'reversion_de', unique=True,
+              postgresql_where=text('reversion_de IS NOT NULL')),
+    )
 
 class LineaAsiento(Base):
     __tablename__ = 'lineas_asiento'
     
     id = Column(Integer, primary_key=True)
-    asiento_id = Column(Integer, ForeignKey('asientos_contables.id'))
+    asiento_id = Column(Integer, ForeignKey('asientos_contables.id', ondelete='CASCADE'))
     cuenta_id = Column(Integer, ForeignKey('cuentas_contables.id'))
+    fecha = Column(DateTime)  # Copia de la fecha del asiento para el libro mayor
     debe = Column(Numeric(15, 2), default=0)
     haber = Column(Numeric(15, 2), default=0)
     descripcion = Column(Text)
@@ -56,6 +153,120 @@ class LineaAsiento(Base):
     # Relaciones
     asiento = relationship("AsientoContable", back_populates="lineas")
     cuenta = relationship("CuentaContable")
+    
+    __table_args__ = (
+        # Join asiento -> líneas
+        Index('ix_lineas_asiento_asiento_id', 'asiento_id'),
+        # Movimientos por cuenta (libro mayor, saldos)
+        Index('ix_lineas_asiento_cuenta_asiento', 'cuenta_id', 'asiento_id'),
+        # Libro mayor: movimientos de una cuenta por fecha, con importes en el índice
+        Index('ix_lineas_asiento_cuenta_fecha', 'cuenta_id', 'fecha', 'id',
+              postgresql_include=['debe', 'haber']),
+        # Sumas de todas las cuentas en un rango de fechas (balances)
+        Index('ix_lineas_asiento_fecha', 'fecha',
+              postgresql_include=['cuenta_id', 'debe', 'haber']),
+    )
+
+class SaldoCuenta(Base):
+    """
+    Totales de debe/haber por cuenta y mes, mantenidos al registrar o eliminar
+    asientos. Evita recorrer todas las líneas para obtener saldos
+    """
+    __tablename__ = 'saldos_cuenta'
+    
+    cuenta_id = Column(Integer, ForeignKey('cuentas_contables.id'), primary_key=True)
+    periodo = Column(Date, primary_key=True)  # Primer día del mes
+    total_debe = Column(Numeric(18, 2), nullable=False, default=0)
+    total_haber = Column(Numeric(18, 2), nullable=False, default=0)
+    movimientos = Column(Integer, nullable=False, default=0)
+    
+    cuenta = relationship("CuentaContable")
+    
+    __table_args__ = (
+        # Saldos de todas las cuentas en un rango de periodos
+        Index('ix_saldos_cuenta_periodo', 'periodo'),
+    )
+
+class SaldoSnapshot(Base):
+    """
+    Totales acumulados por cuenta de todos los movimientos anteriores a
+    fecha_corte (primer día de un mes). Se escriben una sola vez y no se
+    modifican: los reportes parten del último corte en lugar de todo el historial
+    """
+    __tablename__ = 'saldos_snapshot'
+    
+    fecha_corte = Column(Date, primary_key=True)
+    cuenta_id = Column(Integer, ForeignKey('cuentas_contables.id'), primary_key=True)
+    total_debe = Column(Numeric(18, 2), nullable=False, default=0)
+    total_haber = Column(Numeric(18, 2), nullable=False, default=0)
+    creado_en = Column(DateTime, default=datetime.utcnow)
+    
+    cuenta = relationship("CuentaContable")
+
+class PeriodoContable(Base):
+    """
+    Periodo fiscal (meses completos). Al cerrarse se guarda el snapshot de
+    saldos al día siguiente de fecha_fin (y su copia en saldos_cierre);
+    desde entonces no se aceptan asientos nuevos ni eliminaciones con fecha
+    hasta el último cierre
+    """
+    __tablename__ = 'periodos_contables'
+    
+    id = Column(Integer, primary_key=True)
+    fecha_inicio = Column(Date, nullable=False)
+    fecha_fin = Column(Date, nullable=False)
+    cerrado = Column(Boolean, nullable=False, default=False)
+    cerrado_en = Column(DateTime)
+    cerrado_por = Column(Integer, ForeignKey('usuarios.id'))
+    
+    usuario = relationship("Usuario")
+    
+    __table_args__ = (
+        # Último periodo cerrado: una lectura del índice al registrar o eliminar
+        Index('ix_periodos_contables_cierre', 'fecha_fin', postgresql_where=text('cerrado')),
+        Index('ix_periodos_contables_inicio', 'fecha_inicio', unique=True),
+    )
+
+class SaldoCierre(Base):
+    """
+    Saldos acumulados de cada cuenta al cerrar un periodo, copiados del
+    snapshot del cierre. saldos_snapshot es una caché que un asiento
+    posterior a la reapertura invalida; éstos quedan como constancia del
+    cierre y sólo se reemplazan al volver a cerrar el mismo periodo
+    """
+    __tablename__ = 'saldos_cierre'
+    
+    periodo_id = Column(Integer, ForeignKey('periodos_contables.id'), primary_key=True)
+    cuenta_id = Column(Integer, ForeignKey('cuentas_contables.id'), primary_key=True)
+    total_debe = Column(Numeric(18, 2), nullable=False, default=0)
+    total_haber = Column(Numeric(18, 2), nullable=False, default=0)
+    creado_en = Column(DateTime, default=datetime.utcnow)
+    
+    periodo = relationship("PeriodoContable")
+    cuenta = relationship("CuentaContable")
+
+class NumeracionAsiento(Base):
+    """
+    Formato de los números de asiento de un año fiscal: prefijo, reinicio del
+    correlativo ('diario' → AS-20261018-001, 'anual' → AS-2026-00001) y dígitos
+    """
+    __tablename__ = 'numeracion_asientos'
+    
+    anio = Column(Integer, primary_key=True)
+    prefijo = Column(String(10), nullable=False, default='AS')
+    reinicio = Column(String(10), nullable=False, default='diario')
+    digitos = Column(Integer, nullable=False, default=3)
+
+class ContadorAsiento(Base):
+    """
+    Último correlativo usado por serie (AS-20261018, AS-2026...). La fila se
+    incrementa dentro de la transacción del asiento y queda bloqueada hasta el
+    commit: dos usuarios nunca reciben el mismo número y un rollback no deja huecos
+    """
+    __tablename__ = 'contadores_asiento'
+    
+    serie = Column(String(30), primary_key=True)
+    ultimo = Column(Integer, nullable=False, default=0)
 
 class AuditLog(Base):
     __tablename__ = 'audit_logs'
@@ -69,17 +280,92 @@ class AuditLog(Base):
     fecha = Column(DateTime, default=datetime.utcnow)
     
     usuario = relationship("Usuario")
+    
+    __table_args__ = (
+        Index('ix_audit_logs_fecha', 'fecha'),
+        Index('ix_audit_logs_usuario_fecha', 'usuario_id', 'fecha'),
+    )
 
 # Configuración de la base de datos
+# Un único engine (y su pool de conexiones) por proceso, compartido por todas
+# las vistas y servicios. Se crea la primera vez que se pide.
+_engine = None
+_Session = sessionmaker(expire_on_commit=False)
+_schema_creado = False
+_engine_lock = threading.Lock()
+
+def _env_bool(nombre, default):
+    valor = os.getenv(nombre)
+    if valor is None or valor == '':
+        return default
+    return valor.strip().lower() in ('1', 'true', 'yes', 'si', 'sí', 'on')
+
+def _env_int(nombre, default):
+    valor = os.getenv(nombre)
+    return int(valor) if valor not in (None, '') else default
+
+def get_database_url():
+    return URL.create(
+        "postgresql+psycopg2",
+        username=os.getenv('DB_USER'),
+        password=os.getenv('DB_PASSWORD'),
+        host=os.getenv('DB_HOST'),
+        port=_env_int('DB_PORT', None),
+        database=os.getenv('DB_NAME')
+    )
+
+def get_engine():
+    """
+    Devuelve el engine de la aplicación, creándolo con el pool configurado en .env:
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT (s), DB_POOL_RECYCLE (s),
+    DB_POOL_PRE_PING y DB_STATEMENT_TIMEOUT (ms, 0 = sin límite)
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                connect_args = {}
+                statement_timeout = _env_int('DB_STATEMENT_TIMEOUT', 0)
+                if statement_timeout > 0:
+                    connect_args['options'] = f"-c statement_timeout={statement_timeout}"
+                
+                _engine = create_engine(
+                    get_database_url(),
+                    pool_size=_env_int('DB_POOL_SIZE', 5),
+                    max_overflow=_env_int('DB_MAX_OVERFLOW', 10),
+                    pool_timeout=_env_int('DB_POOL_TIMEOUT', 30),
+                    pool_recycle=_env_int('DB_POOL_RECYCLE', 1800),
+                    pool_pre_ping=_env_bool('DB_POOL_PRE_PING', True),
+                    connect_args=connect_args
+                )
+                _Session.configure(bind=_engine)
+    return _engine
+
 def init_db():
-    db_url = f"postgresql://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}:{os.getenv('DB_PORT')}/{os.getenv('DB_NAME')}"
-    engine = create_engine(db_url)
-    Base.metadata.create_all(engine)
+    """Crea las tablas una sola vez por proceso y devuelve el engine compartido"""
+    global _schema_creado
+    engine = get_engine()
+    if not _schema_creado:
+        with _engine_lock:
+            if not _schema_creado:
+                Base.metadata.create_all(engine)
+                _schema_creado = True
     return engine
 
-def get_session(engine):
-    Session = sessionmaker(bind=engine)
-    return Session()
+def get_session(engine=None):
+    if engine is None or engine is _engine:
+        get_engine()
+        return _Session()
+    return sessionmaker(bind=engine)()
+
+def dispose_engine():
+    """Cierra todas las conexiones del pool (al salir de la aplicación)"""
+    global _engine, _schema_creado
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+            _schema_creado = False
 
 # Crear usuario por defecto
 def create_default_user(session):
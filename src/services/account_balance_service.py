@@ -0,0 +1,357 @@
+import os
+import sys
+from sqlalchemy.orm import Session
+from sqlalchemy import select, delete, func, literal, union_all, values, column, and_, tuple_, Date, Integer
+from datetime import datetime, date, time, timedelta
+from sqlalchemy.dialects.postgresql import insert
+
+# Agregar el directorio raíz al path para imports absolutos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from models import AsientoContable, LineaAsiento, SaldoCuenta, SaldoSnapshot
+    MODELS_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Modelos no disponibles: {e}")
+    MODELS_AVAILABLE = False
+
+COLUMNAS_SALDO = ['cuenta_id', 'periodo', 'total_debe', 'total_haber', 'movimientos']
+COLUMNAS_SNAPSHOT = ['fecha_corte', 'cuenta_id', 'total_debe', 'total_haber']
+
+# Fecha anterior a cualquier periodo, para rangos sin snapshot previo
+INICIO_HISTORIA = date(1900, 1, 1)
+
+
+def limites_periodo(fecha_inicio=None, fecha_fin=None):
+    """Convierte un periodo (fechas incluidas) en el rango semiabierto [inicio, fin) de datetimes"""
+    inicio = fin = None
+    if fecha_inicio:
+        inicio = fecha_inicio if isinstance(fecha_inicio, datetime) else datetime.combine(fecha_inicio, time.min)
+    if fecha_fin:
+        if isinstance(fecha_fin, datetime):
+            fin = fecha_fin + timedelta(microseconds=1)
+        else:
+            fin = datetime.combine(fecha_fin, time.min) + timedelta(days=1)
+    return inicio, fin
+
+
+def meses_completos(inicio=None, fin=None):
+    """
+    Primer y último+1 periodo mensual contenidos por completo en [inicio, fin).
+    None indica que el rango no tiene límite por ese lado
+    """
+    desde = hasta = None
+    if inicio is not None:
+        desde = date(inicio.year, inicio.month, 1)
+        if inicio != datetime.combine(desde, time.min):
+            desde = date(desde.year + desde.month // 12, desde.month % 12 + 1, 1)
+    if fin is not None:
+        hasta = date(fin.year, fin.month, 1)
+    return desde, hasta
+
+
+class AccountBalanceService:
+    """
+    Mantiene la tabla saldos_cuenta (totales por cuenta y mes).
+    Las actualizaciones se hacen en la misma transacción que el asiento,
+    así la tabla nunca queda desfasada respecto de las líneas
+    """
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def periodo_de(columna_fecha):
+        """Expresión SQL del periodo (primer día del mes) de una fecha"""
+        return func.date_trunc('month', columna_fecha).cast(Date)
+
+    def _totales_lineas(self, signo=1):
+        """
+        SELECT de totales agrupados por cuenta y periodo sobre las líneas.
+        Ordenado por (cuenta, periodo): el upsert bloquea las filas de saldos
+        siempre en ese orden y dos asientos concurrentes no se traban
+        """
+        periodo = self.periodo_de(AsientoContable.fecha)
+        return (
+            select(
+                LineaAsiento.cuenta_id,
+                periodo.label('periodo'),
+                (literal(signo) * func.coalesce(func.sum(LineaAsiento.debe), 0)).label('total_debe'),
+                (literal(signo) * func.coalesce(func.sum(LineaAsiento.haber), 0)).label('total_haber'),
+                (literal(signo) * func.count(LineaAsiento.id)).label('movimientos'),
+            )
+            .select_from(LineaAsiento)
+            .join(AsientoContable, AsientoContable.id == LineaAsiento.asiento_id)
+            .where(LineaAsiento.cuenta_id.isnot(None))
+            .group_by(LineaAsiento.cuenta_id, periodo)
+            .order_by(LineaAsiento.cuenta_id, periodo)
+        )
+
+    def aplicar_asiento(self, session: Session, asiento_id: int, signo: int = 1):
+        """
+        Suma (signo=1) o resta (signo=-1) las líneas de un asiento a los saldos.
+        Debe llamarse dentro de la transacción del asiento: al crear después de
+        insertar las líneas y al eliminar antes de borrarlas
+        """
+        self.aplicar_lineas(session, LineaAsiento.asiento_id == asiento_id, signo)
+
+    def aplicar_lineas(self, session: Session, filtro, signo: int = 1):
+        """
+        Como aplicar_asiento, para todas las líneas que cumplen el filtro
+        (por ejemplo, los asientos de una importación) en un solo upsert agrupado
+        """
+        session.flush()
+
+        consulta = self._totales_lineas(signo).where(filtro)
+        upsert = insert(SaldoCuenta).from_select(COLUMNAS_SALDO, consulta)
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[SaldoCuenta.cuenta_id, SaldoCuenta.periodo],
+            set_={
+                'total_debe': SaldoCuenta.total_debe + upsert.excluded.total_debe,
+                'total_haber': SaldoCuenta.total_haber + upsert.excluded.total_haber,
+                'movimientos': SaldoCuenta.movimientos + upsert.excluded.movimientos,
+            }
+        )
+        if signo < 0:
+            # Periodos que quedaron sin movimientos, entre los que tocó el upsert
+            tocados = session.execute(upsert.returning(
+                SaldoCuenta.cuenta_id, SaldoCuenta.periodo, SaldoCuenta.movimientos)).all()
+            vacios = [(fila.cuenta_id, fila.periodo) for fila in tocados if fila.movimientos <= 0]
+            if vacios:
+                session.execute(delete(SaldoCuenta).where(
+                    tuple_(SaldoCuenta.cuenta_id, SaldoCuenta.periodo).in_(vacios)))
+        else:
+            session.execute(upsert)
+
+        # Los snapshots posteriores a la fecha de las líneas dejan de valer; los de
+        # periodos cerrados no se tocan porque ahí no se admiten asientos, y el de
+        # un periodo reabierto es sólo caché: sus saldos de cierre están en saldos_cierre
+        fecha = select(func.min(LineaAsiento.fecha)).where(filtro).scalar_subquery()
+        session.execute(delete(SaldoSnapshot).where(SaldoSnapshot.fecha_corte > fecha))
+
+    def reconstruir_saldos(self, session: Session) -> tuple[bool, str]:
+        """
+        Recalcula toda la tabla desde las líneas con un único INSERT ... SELECT.
+        La tabla se bloquea durante la reconstrucción para no perder asientos
+        registrados en paralelo
+        """
+        try:
+            if not MODELS_AVAILABLE:
+                return False, "Modelos no disponibles"
+
+            session.connection().exec_driver_sql(
+                "LOCK TABLE saldos_cuenta IN SHARE ROW EXCLUSIVE MODE"
+            )
+            session.execute(delete(SaldoCuenta))
+            resultado = session.execute(
+                insert(SaldoCuenta).from_select(COLUMNAS_SALDO, self._totales_lineas())
+            )
+            session.commit()
+            return True, f"✅ Saldos reconstruidos: {resultado.rowcount} registros"
+
+        except Exception as e:
+            session.rollback()
+            return False, f"❌ Error al reconstruir saldos: {str(e)}"
+
+    def crear_snapshot(self, session: Session, fecha_corte: date) -> tuple[bool, str]:
+        """
+        Guarda los totales acumulados de cada cuenta antes de fecha_corte.
+        Fuera de un cierre de periodo el snapshot es provisional: un asiento
+        con fecha anterior al corte lo invalida
+        """
+        try:
+            if not MODELS_AVAILABLE:
+                return False, "Modelos no disponibles"
+
+            if isinstance(fecha_corte, datetime):
+                fecha_corte = fecha_corte.date()
+            if fecha_corte.day != 1:
+                return False, "❌ La fecha de corte debe ser el primer día de un mes"
+
+            if self.existe_snapshot(session, fecha_corte):
+                return False, f"❌ Ya existe un snapshot al {fecha_corte.strftime('%d/%m/%Y')}"
+
+            cuentas = self.insertar_snapshot(session, fecha_corte)
+            session.commit()
+            return True, f"✅ Snapshot al {fecha_corte.strftime('%d/%m/%Y')}: {cuentas} cuentas"
+
+        except Exception as e:
+            session.rollback()
+            return False, f"❌ Error al crear snapshot: {str(e)}"
+
+    def existe_snapshot(self, session: Session, fecha_corte: date) -> bool:
+        return session.query(SaldoSnapshot.fecha_corte).filter(
+            SaldoSnapshot.fecha_corte == fecha_corte).first() is not None
+
+    def insertar_snapshot(self, session: Session, fecha_corte: date) -> int:
+        """
+        Inserta el snapshot sin confirmar la transacción (para el cierre de periodo).
+        Parte del snapshot anterior y suma sólo los meses intermedios de
+        saldos_cuenta, así su costo no depende de los años ya cerrados
+        """
+        anterior = session.query(func.max(SaldoSnapshot.fecha_corte)).filter(
+            SaldoSnapshot.fecha_corte < fecha_corte).scalar()
+
+        partes = [
+            select(SaldoCuenta.cuenta_id, SaldoCuenta.total_debe.label('debe'),
+                   SaldoCuenta.total_haber.label('haber'))
+            .where(SaldoCuenta.periodo >= (anterior or INICIO_HISTORIA),
+                   SaldoCuenta.periodo < fecha_corte)
+        ]
+        if anterior is not None:
+            partes.append(
+                select(SaldoSnapshot.cuenta_id, SaldoSnapshot.total_debe.label('debe'),
+                       SaldoSnapshot.total_haber.label('haber'))
+                .where(SaldoSnapshot.fecha_corte == anterior)
+            )
+        todas = union_all(*partes).subquery('partes')
+        acumulado = (
+            select(literal(fecha_corte, Date), todas.c.cuenta_id,
+                   func.sum(todas.c.debe), func.sum(todas.c.haber))
+            .group_by(todas.c.cuenta_id)
+        )
+        return session.execute(insert(SaldoSnapshot).from_select(COLUMNAS_SNAPSHOT, acumulado)).rowcount
+
+    def obtener_saldos_acumulados(self, session: Session, fechas_corte: list,
+                                  cuenta_ids: list = None) -> dict:
+        """
+        Totales acumulados (debe, haber) por cuenta antes de cada fecha de corte,
+        en una sola consulta: último snapshot anterior a cada corte, más los
+        meses siguientes de saldos_cuenta, más las líneas del mes del corte.
+        cuenta_ids limita el resultado a esas cuentas.
+        Devuelve {fecha_corte: {cuenta_id: (debe, haber)}}
+        """
+        resultado = {corte: {} for corte in fechas_corte}
+        if not MODELS_AVAILABLE or not fechas_corte:
+            return resultado
+
+        for k, cuenta_id, debe, haber in session.execute(self.consulta_saldos_acumulados(fechas_corte, cuenta_ids)):
+            resultado[fechas_corte[k]][cuenta_id] = (debe, haber)
+        return resultado
+
+    def consulta_saldos_acumulados(self, fechas_corte: list, cuenta_ids: list = None):
+        """
+        SELECT (k, cuenta_id, debe, haber) de obtener_saldos_acumulados, con k
+        el índice del corte en fechas_corte, para unirlo a otras consultas
+        """
+        cortes = values(column('k', Integer), column('corte', Date), name='cortes').data(
+            [(k, corte) for k, corte in enumerate(fechas_corte)])
+        snapshot = (
+            select(func.max(SaldoSnapshot.fecha_corte))
+            .where(SaldoSnapshot.fecha_corte <= cortes.c.corte)
+            .scalar_subquery()
+        )
+        base = select(
+            cortes.c.k,
+            cortes.c.corte,
+            func.coalesce(snapshot, INICIO_HISTORIA).label('desde'),
+            self.periodo_de(cortes.c.corte).label('mes'),
+        ).subquery('base')
+
+        partes = union_all(
+            select(base.c.k, SaldoSnapshot.cuenta_id,
+                   SaldoSnapshot.total_debe.label('debe'), SaldoSnapshot.total_haber.label('haber'))
+            .join(SaldoSnapshot, SaldoSnapshot.fecha_corte == base.c.desde),
+            select(base.c.k, SaldoCuenta.cuenta_id, SaldoCuenta.total_debe, SaldoCuenta.total_haber)
+            .join(SaldoCuenta, and_(SaldoCuenta.periodo >= base.c.desde,
+                                    SaldoCuenta.periodo < base.c.mes)),
+            select(base.c.k, LineaAsiento.cuenta_id,
+                   func.coalesce(LineaAsiento.debe, 0), func.coalesce(LineaAsiento.haber, 0))
+            .join(LineaAsiento, and_(LineaAsiento.fecha >= base.c.mes,
+                                     LineaAsiento.fecha < base.c.corte)),
+        ).subquery('partes')
+
+        consulta = (
+            select(partes.c.k, partes.c.cuenta_id,
+                   func.sum(partes.c.debe).label('debe'), func.sum(partes.c.haber).label('haber'))
+            .where(partes.c.cuenta_id.isnot(None))
+            .group_by(partes.c.k, partes.c.cuenta_id)
+        )
+        if cuenta_ids is not None:
+            consulta = consulta.where(partes.c.cuenta_id.in_(cuenta_ids))
+        return consulta
+
+    def verificar_saldos(self, session: Session) -> list:
+        """
+        Compara saldos_cuenta contra los totales calculados desde las líneas.
+        Devuelve las diferencias (lista vacía si la tabla es consistente)
+        """
+        try:
+            if not MODELS_AVAILABLE:
+                return []
+
+            calculado = self._totales_lineas().subquery('calculado')
+            guardado = select(SaldoCuenta).subquery('guardado')
+            unido = calculado.join(
+                guardado,
+                (calculado.c.cuenta_id == guardado.c.cuenta_id) & (calculado.c.periodo == guardado.c.periodo),
+                full=True
+            )
+
+            calc_debe = func.coalesce(calculado.c.total_debe, 0)
+            calc_haber = func.coalesce(calculado.c.total_haber, 0)
+            calc_mov = func.coalesce(calculado.c.movimientos, 0)
+            guard_debe = func.coalesce(guardado.c.total_debe, 0)
+            guard_haber = func.coalesce(guardado.c.total_haber, 0)
+            guard_mov = func.coalesce(guardado.c.movimientos, 0)
+
+            consulta = (
+                select(
+                    func.coalesce(calculado.c.cuenta_id, guardado.c.cuenta_id).label('cuenta_id'),
+                    func.coalesce(calculado.c.periodo, guardado.c.periodo).label('periodo'),
+                    calc_debe.label('debe_lineas'), guard_debe.label('debe_saldos'),
+                    calc_haber.label('haber_lineas'), guard_haber.label('haber_saldos'),
+                    calc_mov.label('movimientos_lineas'), guard_mov.label('movimientos_saldos'),
+                )
+                .select_from(unido)
+                .where((calc_debe != guard_debe) | (calc_haber != guard_haber) | (calc_mov != guard_mov))
+                .order_by('cuenta_id', 'periodo')
+            )
+
+            return [dict(fila._mapping) for fila in session.execute(consulta)]
+
+        except Exception as e:
+            print(f"❌ Error verificando saldos: {e}")
+            return []
+
+
+def main():
+    """Uso: python src/services/account_balance_service.py [--reconstruir | --snapshot AAAA-MM-01]"""
+    from models import init_db, get_session, dispose_engine
+
+    init_db()
+    session = get_session()
+    service = AccountBalanceService()
+    try:
+        if '--snapshot' in sys.argv[1:]:
+            fecha_corte = datetime.strptime(sys.argv[sys.argv.index('--snapshot') + 1], '%Y-%m-%d').date()
+            ok, mensaje = service.crear_snapshot(session, fecha_corte)
+            print(mensaje)
+            return 0 if ok else 1
+
+        if '--reconstruir' in sys.argv[1:]:
+            ok, mensaje = service.reconstruir_saldos(session)
+            print(mensaje)
+            if not ok:
+                return 1
+
+        diferencias = service.verificar_saldos(session)
+        if not diferencias:
+            print("✅ saldos_cuenta coincide con las líneas de asiento")
+            return 0
+
+        print(f"❌ {len(diferencias)} diferencias entre saldos_cuenta y las líneas:")
+        for d in diferencias:
+            print(f"   cuenta {d['cuenta_id']} {d['periodo']}: "
+                  f"debe {d['debe_lineas']} vs {d['debe_saldos']}, "
+                  f"haber {d['haber_lineas']} vs {d['haber_saldos']}, "
+                  f"movimientos {d['movimientos_lineas']} vs {d['movimientos_saldos']}")
+        print("   Ejecuta con --reconstruir para recalcular la tabla")
+        return 1
+    finally:
+        session.close()
+        dispose_engine()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+import os
+import sys
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import select, func, case, and_
+from datetime import datetime, date, timedelta
+from calendar import monthrange
+
+# Agregar el directorio raíz al path para imports absolutos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from models import CuentaContable
+    from services.account_balance_service import AccountBalanceService
+    MODELS_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Modelos no disponibles: {e}")
+    MODELS_AVAILABLE = False
+
+TIPOS_BALANCE = [('activo', 'ACTIVO'), ('pasivo', 'PASIVO'), ('patrimonio', 'PATRIMONIO')]
+TIPOS_RESULTADO = [('ingreso', 'INGRESOS'), ('gasto', 'GASTOS')]
+# Cuentas de naturaleza acreedora: su saldo se presenta como haber - debe
+TIPOS_ACREEDORES = ('pasivo', 'patrimonio', 'ingreso')
+
+
+class FinancialStatementsService:
+    """
+    Balance General y Estado de Resultados agrupados por tipo de cuenta.
+    Los saldos salen de AccountBalanceService.consulta_saldos_acumulados: el
+    último snapshot de cada fecha más el periodo abierto, en una consulta para
+    todas las columnas comparativas que además suma a cada cuenta sus
+    subcuentas por rango de ruta, como el balance de comprobación
+    """
+
+    def __init__(self):
+        self.saldos = AccountBalanceService() if MODELS_AVAILABLE else None
+
+    def generar_estados(self, session: Session, fecha_fin: date, fecha_inicio: date = None,
+                        periodicidad: str = 'anual', comparativos: int = 0) -> dict:
+        """
+        Genera ambos estados para el periodo [fecha_inicio, fecha_fin] y
+        'comparativos' periodos anteriores equivalentes (años o meses).
+        Devuelve {'periodos', 'balance_general', 'estado_resultados'}
+        """
+        if isinstance(fecha_fin, datetime):
+            fecha_fin = fecha_fin.date()
+        if isinstance(fecha_inicio, datetime):
+            fecha_inicio = fecha_inicio.date()
+        if fecha_inicio is None:
+            fecha_inicio = date(fecha_fin.year, 1, 1) if periodicidad == 'anual' else fecha_fin.replace(day=1)
+
+        paso = 12 if periodicidad == 'anual' else 1
+        periodos = []
+        for k in range(comparativos + 1):
+            inicio = self._desplazar_meses(fecha_inicio, -k * paso)
+            fin = self._desplazar_meses(fecha_fin, -k * paso)
+            periodos.append({
+                'inicio': inicio,
+                'fin': fin,
+                'etiqueta': str(fin.year) if periodicidad == 'anual' else fin.strftime('%m/%Y'),
+                'corte_inicio': inicio,
+                'corte_fin': fin + timedelta(days=1),
+            })
+
+        if not MODELS_AVAILABLE:
+            return {'periodos': periodos, 'balance_general': None, 'estado_resultados': None}
+
+        cuentas = [
+            {'id': c.id, 'codigo': c.codigo, 'nombre': c.nombre, 'tipo': (c.tipo or '').lower(),
+             'nivel': c.nivel or 1}
+            for c in session.query(CuentaContable.id, CuentaContable.codigo, CuentaContable.nombre,
+                                   CuentaContable.tipo, CuentaContable.nivel)
+            .order_by(CuentaContable.ruta)
+        ]
+
+        cortes = sorted({p['corte_inicio'] for p in periodos} | {p['corte_fin'] for p in periodos})
+        acumulados = self._acumulados_subarbol(session, cortes)
+
+        saldos_fin = [self._saldos_por_cuenta(cuentas, acumulados[p['corte_fin']]) for p in periodos]
+        saldos_inicio = [self._saldos_por_cuenta(cuentas, acumulados[p['corte_inicio']]) for p in periodos]
+        movimiento = [
+            {cid: tuple(a - b for a, b in zip(fin[cid], ini[cid])) for cid in fin}
+            for fin, ini in zip(saldos_fin, saldos_inicio)
+        ]
+
+        balance = self._armar_estado(cuentas, TIPOS_BALANCE, saldos_fin)
+        resultados = self._armar_estado(cuentas, TIPOS_RESULTADO, movimiento)
+
+        # Resultado acumulado a la fecha del balance: cierra la ecuación contable
+        resultado_acumulado = self._resultado(self._armar_estado(cuentas, TIPOS_RESULTADO, saldos_fin))
+        balance['resultado_acumulado'] = resultado_acumulado
+        balance['total_pasivo_patrimonio'] = [
+            pasivo + patrimonio + resultado
+            for pasivo, patrimonio, resultado in zip(balance['totales']['pasivo'],
+                                                     balance['totales']['patrimonio'],
+                                                     resultado_acumulado)
+        ]
+        resultados['utilidad'] = self._resultado(resultados)
+
+        return {'periodos': periodos, 'balance_general': balance, 'estado_resultados': resultados}
+
+    def filas_estado(self, estado: dict, periodos: list, titulo_total: dict = None) -> list:
+        """Filas planas (sección, cuentas y totales) para la tabla y los exportadores"""
+        filas = []
+        for seccion in estado['secciones']:
+            filas.append({'tipo': 'seccion', 'codigo': '', 'nombre': seccion['titulo'], 'nivel': 0,
+                          'valores': [None] * len(periodos)})
+            for cuenta in seccion['cuentas']:
+                filas.append({'tipo': 'cuenta', 'codigo': cuenta['codigo'], 'nombre': cuenta['nombre'],
+                              'nivel': cuenta['nivel'], 'valores': cuenta['saldos']})
+            filas.append({'tipo': 'total', 'codigo': '', 'nombre': f"TOTAL {seccion['titulo']}", 'nivel': 0,
+                          'valores': seccion['totales']})
+        for nombre, valores in (titulo_total or {}).items():
+            filas.append({'tipo': 'total', 'codigo': '', 'nombre': nombre, 'nivel': 0, 'valores': valores})
+        return filas
+
+    def _acumulados_subarbol(self, session, cortes):
+        """
+        {corte: {cuenta_id: (debe, haber, debe_propio, haber_propio)}}: los
+        acumulados de la cuenta más sus subcuentas del mismo tipo, y los propios
+        """
+        acumulados = self.saldos.consulta_saldos_acumulados(cortes).subquery('acumulados')
+        padre = aliased(CuentaContable)
+        hija = aliased(CuentaContable)
+        propia = hija.id == padre.id
+        consulta = (
+            select(
+                acumulados.c.k, padre.id,
+                func.sum(acumulados.c.debe), func.sum(acumulados.c.haber),
+                func.coalesce(func.sum(case((propia, acumulados.c.debe), else_=0)), 0),
+                func.coalesce(func.sum(case((propia, acumulados.c.haber), else_=0)), 0),
+            )
+            .select_from(padre)
+            .join(hija, and_(CuentaContable.en_subarbol(padre.ruta, hija.ruta),
+                             func.lower(func.coalesce(hija.tipo, '')) == func.lower(func.coalesce(padre.tipo, ''))))
+            .join(acumulados, acumulados.c.cuenta_id == hija.id)
+            .group_by(acumulados.c.k, padre.id)
+        )
+        resultado = {corte: {} for corte in cortes}
+        for k, cuenta_id, *totales in session.execute(consulta):
+            resultado[cortes[k]][cuenta_id] = tuple(totales)
+        return resultado
+
+    def _saldos_por_cuenta(self, cuentas, acumulado):
+        """
+        (saldo con subcuentas, saldo propio) de cada cuenta según su naturaleza
+        (deudora o acreedora)
+        """
+        saldos = {}
+        for cuenta in cuentas:
+            debe, haber, debe_propio, haber_propio = acumulado.get(cuenta['id'], (0, 0, 0, 0))
+            if cuenta['tipo'] in TIPOS_ACREEDORES:
+                saldos[cuenta['id']] = (haber - debe, haber_propio - debe_propio)
+            else:
+                saldos[cuenta['id']] = (debe - haber, debe_propio - haber_propio)
+        return saldos
+
+    def _armar_estado(self, cuentas, tipos, saldos_por_periodo):
+        """
+        Secciones por tipo con las cuentas en orden del plan; cada cuenta
+        muestra su saldo más el de sus subcuentas (ya sumado en la consulta)
+        y el total del tipo suma sólo los saldos propios
+        """
+        secciones = []
+        totales = {}
+        for tipo, titulo in tipos:
+            del_tipo = [c for c in cuentas if c['tipo'] == tipo]
+            filas = []
+            for cuenta in del_tipo:
+                valores = [saldos[cuenta['id']][0] for saldos in saldos_por_periodo]
+                if any(valores):
+                    filas.append({'codigo': cuenta['codigo'], 'nombre': cuenta['nombre'],
+                                  'nivel': cuenta['nivel'], 'saldos': valores})
+
+            totales[tipo] = [sum(saldos[c['id']][1] for c in del_tipo) for saldos in saldos_por_periodo]
+            secciones.append({'tipo': tipo, 'titulo': titulo, 'cuentas': filas, 'totales': totales[tipo]})
+
+        return {'secciones': secciones, 'totales': totales}
+
+    @staticmethod
+    def _resultado(estado_resultados):
+        """Ingresos menos gastos por periodo"""
+        totales = estado_resultados['totales']
+        return [ingreso - gasto for ingreso, gasto in zip(totales['ingreso'], totales['gasto'])]
+
+    @staticmethod
+    def _desplazar_meses(fecha, meses):
+        """Mueve una fecha N meses, ajustando el día al último del mes si hace falta"""
+        total = fecha.year * 12 + fecha.month - 1 + meses
+        anio, mes = divmod(total, 12)
+        mes += 1
+        ultimo_dia = monthrange(anio, mes)[1]
+        # Un periodo que termina a fin de mes compara con el fin de mes equivalente
+        if fecha.day == monthrange(fecha.year, fecha.month)[1]:
+            return date(anio, mes, ultimo_dia)
+        return date(anio, mes, min(fecha.day, ultimo_dia))
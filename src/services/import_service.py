@@ -0,0 +1,377 @@
+import os
+import sys
+import csv
+import io
+from sqlalchemy.orm import Session
+from sqlalchemy import text, table, column, select
+from datetime import datetime, date
+from decimal import Decimal, InvalidOperation
+
+# Agregar el directorio raíz al path para imports absolutos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from models import AsientoContable, LineaAsiento, AuditLog, CENTAVO, a_monto
+    from services.account_balance_service import AccountBalanceService
+    from services.period_service import PeriodService
+    MODELS_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Modelos no disponibles: {e}")
+    MODELS_AVAILABLE = False
+
+try:
+    from openpyxl import load_workbook
+    OPENPYXL_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ openpyxl no disponible: {e}")
+    OPENPYXL_AVAILABLE = False
+
+# Una fila por línea de asiento; numero, fecha y descripcion se repiten en cada línea
+COLUMNAS_IMPORTACION = ['numero', 'fecha', 'descripcion', 'cuenta', 'debe', 'haber', 'detalle']
+ALIAS_COLUMNAS = {
+    'número': 'numero', 'nro': 'numero', 'asiento': 'numero',
+    'descripción': 'descripcion', 'glosa': 'descripcion',
+    'código': 'cuenta', 'codigo': 'cuenta', 'cuenta_codigo': 'cuenta',
+    'detalle_linea': 'detalle', 'descripcion_linea': 'detalle',
+}
+FORMATOS_FECHA = ('%Y-%m-%d', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S', '%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M')
+FILAS_POR_COPY = 10000
+
+# Tabla temporal de la importación (se borra al terminar la transacción)
+TABLA_IMPORTACION = "importacion_asientos"
+importacion = table(TABLA_IMPORTACION, column('numero'))
+
+SQL_ERRORES_IMPORTACION = text(f"""
+    SELECT i.fila, i.numero, 'La cuenta ' || i.cuenta || ' no existe' AS error
+    FROM {TABLA_IMPORTACION} i
+    LEFT JOIN cuentas_contables c ON c.codigo = i.cuenta
+    WHERE c.id IS NULL
+    UNION ALL
+    SELECT i.fila, i.numero, 'La cuenta ' || c.codigo || ' - ' || c.nombre || ' está inactiva'
+    FROM {TABLA_IMPORTACION} i
+    JOIN cuentas_contables c ON c.codigo = i.cuenta
+    WHERE c.activa IS NOT TRUE
+    UNION ALL
+    SELECT min(i.fila), i.numero, 'El número de asiento ya existe'
+    FROM {TABLA_IMPORTACION} i
+    JOIN asientos_contables a ON a.numero = i.numero
+    GROUP BY i.numero
+    UNION ALL
+    SELECT min(fila), numero,
+           'La partida no está cuadrada: Debe ' || sum(debe) || ' / Haber ' || sum(haber)
+    FROM {TABLA_IMPORTACION}
+    GROUP BY numero
+    HAVING sum(debe) <> sum(haber)
+    UNION ALL
+    SELECT min(fila), numero, 'Las líneas del asiento tienen fechas distintas'
+    FROM {TABLA_IMPORTACION}
+    GROUP BY numero
+    HAVING count(DISTINCT fecha) > 1
+    UNION ALL
+    SELECT min(fila), numero, 'La fecha cae en un periodo cerrado (hasta ' || to_char(CAST(:cierre AS date), 'DD/MM/YYYY') || ')'
+    FROM {TABLA_IMPORTACION}
+    WHERE fecha < CAST(:cierre AS date) + 1
+    GROUP BY numero
+""")
+
+SQL_INSERTAR_ASIENTOS = text(f"""
+    INSERT INTO asientos_contables (numero, fecha, descripcion, creado_por, creado_en)
+    SELECT DISTINCT ON (numero) numero, fecha, descripcion, :usuario_id, :creado_en
+    FROM {TABLA_IMPORTACION}
+    ORDER BY numero, fila
+""")
+
+SQL_INSERTAR_LINEAS = text(f"""
+    INSERT INTO lineas_asiento (asiento_id, cuenta_id, fecha, debe, haber, descripcion)
+    SELECT a.id, c.id, a.fecha, i.debe, i.haber, coalesce(i.detalle, '')
+    FROM {TABLA_IMPORTACION} i
+    JOIN asientos_contables a ON a.numero = i.numero
+    JOIN cuentas_contables c ON c.codigo = i.cuenta
+    ORDER BY i.fila
+""")
+
+
+class ImportService:
+    """
+    Importación masiva de asientos desde CSV o Excel (una fila por línea).
+    El archivo se lee fila a fila y se copia con COPY a una tabla temporal; el
+    cuadre por número, las cuentas, los números repetidos y los periodos
+    cerrados se validan con consultas sobre esa tabla, y los asientos válidos
+    se insertan con INSERT ... SELECT en una sola transacción. Un asiento con
+    alguna fila errónea se descarta completo
+    """
+
+    def __init__(self):
+        self.saldos = AccountBalanceService() if MODELS_AVAILABLE else None
+        self.periodos = PeriodService() if MODELS_AVAILABLE else None
+
+    def importar(self, session: Session, ruta: str, usuario_id: int = None,
+                 solo_validar: bool = False) -> dict:
+        """
+        Importa el archivo y devuelve {'exito', 'mensaje', 'filas', 'asientos',
+        'lineas', 'errores'}; cada error es {'fila', 'numero', 'error'} con la
+        fila del archivo (la 1 es el encabezado)
+        """
+        resultado = {'exito': False, 'mensaje': '', 'filas': 0, 'asientos': 0, 'lineas': 0, 'errores': []}
+        try:
+            if not MODELS_AVAILABLE:
+                resultado['mensaje'] = "Modelos no disponibles"
+                return resultado
+
+            conexion = session.connection()
+            conexion.exec_driver_sql(f"""
+                CREATE TEMP TABLE {TABLA_IMPORTACION} (
+                    fila INTEGER, numero VARCHAR(20), fecha TIMESTAMP, descripcion TEXT,
+                    cuenta VARCHAR(20), debe NUMERIC(15, 2), haber NUMERIC(15, 2), detalle TEXT
+                ) ON COMMIT DROP
+            """)
+            cursor = conexion.connection.cursor()
+
+            # Formato por fila en Python, mientras se lee; el resto en SQL
+            errores = []
+            buffer = io.StringIO()
+            escritor = csv.writer(buffer)
+            pendientes = 0
+            for fila, datos in self.leer_filas(ruta):
+                resultado['filas'] += 1
+                registro, error = self._convertir_fila(datos)
+                if error:
+                    errores.append({'fila': fila, 'numero': str(datos.get('numero') or '').strip(), 'error': error})
+                    continue
+                escritor.writerow([fila] + registro)
+                pendientes += 1
+                if pendientes >= FILAS_POR_COPY:
+                    self._copiar(cursor, buffer)
+                    buffer = io.StringIO()
+                    escritor = csv.writer(buffer)
+                    pendientes = 0
+            self._copiar(cursor, buffer)
+            conexion.exec_driver_sql(f"ANALYZE {TABLA_IMPORTACION}")
+
+            cierre = self.periodos.ultimo_cierre(session)
+            errores.extend(
+                {'fila': fila, 'numero': numero, 'error': error}
+                for fila, numero, error in session.execute(
+                    SQL_ERRORES_IMPORTACION, {'cierre': cierre.fecha_fin if cierre else date.min})
+            )
+            errores.sort(key=lambda e: e['fila'])
+            resultado['errores'] = errores
+
+            invalidos = sorted({e['numero'] for e in errores})
+            if invalidos:
+                session.execute(text(f"DELETE FROM {TABLA_IMPORTACION} WHERE numero = ANY(:numeros)"),
+                                {'numeros': invalidos})
+
+            if solo_validar:
+                session.rollback()
+                resultado['exito'] = not errores
+                resultado['mensaje'] = (f"✅ {resultado['filas']} filas válidas" if not errores
+                                        else f"❌ {len(errores)} errores en {len(invalidos)} asientos")
+                return resultado
+
+            creado_en = datetime.utcnow()
+            resultado['asientos'] = session.execute(
+                SQL_INSERTAR_ASIENTOS, {'usuario_id': usuario_id, 'creado_en': creado_en}).rowcount
+            resultado['lineas'] = session.execute(SQL_INSERTAR_LINEAS).rowcount
+
+            if resultado['asientos']:
+                importados = select(AsientoContable.id).where(
+                    AsientoContable.numero.in_(select(importacion.c.numero)))
+                self.saldos.aplicar_lineas(session, LineaAsiento.asiento_id.in_(importados))
+
+                # Igual que crear_asiento: se valida con saldos_cuenta ya bloqueada por el upsert
+                fecha_minima = session.execute(text(f"SELECT min(fecha) FROM {TABLA_IMPORTACION}")).scalar()
+                abierto, mensaje = self.periodos.validar_fecha_abierta(session, fecha_minima)
+                if not abierto:
+                    session.rollback()
+                    resultado.update(asientos=0, lineas=0, mensaje=mensaje)
+                    return resultado
+
+                session.add(AuditLog(
+                    usuario_id=usuario_id,
+                    accion="IMPORTAR_ASIENTOS",
+                    tabla_afectada="asientos_contables",
+                    detalles=(f"Importación de {os.path.basename(ruta)}: {resultado['asientos']} asientos, "
+                              f"{resultado['lineas']} líneas, {len(errores)} errores")
+                ))
+
+            session.commit()
+            resultado['exito'] = True
+            resultado['mensaje'] = (f"✅ {resultado['asientos']} asientos importados "
+                                    f"({resultado['lineas']} líneas)")
+            if errores:
+                resultado['mensaje'] += f"\n❌ {len(invalidos)} asientos rechazados ({len(errores)} errores)"
+            return resultado
+
+        except Exception as e:
+            session.rollback()
+            resultado.update(asientos=0, lineas=0, mensaje=f"❌ Error al importar asientos: {str(e)}")
+            return resultado
+
+    def leer_filas(self, ruta: str):
+        """Recorre el archivo (CSV o XLSX) fila a fila: (número de fila, dict por columna)"""
+        if ruta.lower().endswith(('.xlsx', '.xlsm')):
+            yield from self._leer_excel(ruta)
+        else:
+            yield from self._leer_csv(ruta)
+
+    def _leer_csv(self, ruta):
+        with open(ruta, newline='', encoding='utf-8-sig') as archivo:
+            muestra = archivo.read(4096)
+            archivo.seek(0)
+            delimitador = ';' if muestra.count(';') > muestra.count(',') else ','
+            lector = csv.reader(archivo, delimiter=delimitador)
+            columnas = self._normalizar_encabezado(next(lector, []))
+            for fila, valores in enumerate(lector, start=2):
+                if any(v.strip() for v in valores):
+                    yield fila, dict(zip(columnas, valores))
+
+    def _leer_excel(self, ruta):
+        if not OPENPYXL_AVAILABLE:
+            raise RuntimeError("openpyxl no está disponible para leer archivos Excel")
+        libro = load_workbook(ruta, read_only=True, data_only=True)
+        try:
+            filas = libro.active.iter_rows(values_only=True)
+            columnas = self._normalizar_encabezado(next(filas, []))
+            for fila, valores in enumerate(filas, start=2):
+                if any(v not in (None, '') for v in valores):
+                    yield fila, dict(zip(columnas, valores))
+        finally:
+            libro.close()
+
+    @staticmethod
+    def _normalizar_encabezado(encabezado):
+        columnas = []
+        for nombre in encabezado:
+            nombre = str(nombre or '').strip().lower().replace(' ', '_')
+            columnas.append(ALIAS_COLUMNAS.get(nombre, nombre))
+        faltantes = {'numero', 'fecha', 'cuenta', 'debe', 'haber'} - set(columnas)
+        if faltantes:
+            raise ValueError(f"Faltan columnas en el archivo: {', '.join(sorted(faltantes))}")
+        return columnas
+
+    def _convertir_fila(self, datos):
+        """Valores tipados para COPY en el orden de COLUMNAS_IMPORTACION, o el error de la fila"""
+        numero = str(datos.get('numero') or '').strip()
+        cuenta = str(datos.get('cuenta') or '').strip()
+        if not numero:
+            return None, "Falta el número de asiento"
+        if len(numero) > 20:
+            return None, "El número de asiento supera los 20 caracteres"
+        if not cuenta:
+            return None, "Falta el código de cuenta"
+
+        fecha = self._convertir_fecha(datos.get('fecha'))
+        if fecha is None:
+            return None, f"Fecha inválida: {datos.get('fecha')}"
+
+        debe = self._convertir_monto(datos.get('debe'))
+        haber = self._convertir_monto(datos.get('haber'))
+        if debe is None or haber is None:
+            return None, f"Monto inválido: debe {datos.get('debe')} / haber {datos.get('haber')}"
+        for monto in (debe, haber):
+            # Misma regla que al registrar asientos: no se redondea, se rechaza
+            if monto != monto.quantize(CENTAVO):
+                return None, f"El importe {monto} tiene fracciones de centavo"
+        if debe < 0 or haber < 0:
+            return None, "Los montos no pueden ser negativos"
+        if (debe > 0) == (haber > 0):
+            return None, "La línea debe tener monto en el debe o en el haber (sólo uno)"
+
+        descripcion = str(datos.get('descripcion') or '').strip()
+        detalle = str(datos.get('detalle') or '').strip()
+        return [numero, fecha.isoformat(sep=' '), descripcion, cuenta, debe, haber, detalle], None
+
+    @staticmethod
+    def _convertir_fecha(valor):
+        if isinstance(valor, datetime):
+            return valor
+        if isinstance(valor, date):
+            return datetime.combine(valor, datetime.min.time())
+        texto = str(valor or '').strip()
+        for formato in FORMATOS_FECHA:
+            try:
+                return datetime.strptime(texto, formato)
+            except ValueError:
+                continue
+        return None
+
+    @staticmethod
+    def _convertir_monto(valor):
+        """
+        Monto a Decimal con a_monto (sin redondear fracciones de centavo);
+        acepta 1234.50, 1,234.50 y 1.234,50
+        """
+        if valor is None or valor == '':
+            return Decimal('0.00')
+        if isinstance(valor, (int, float, Decimal)):
+            texto = valor
+        else:
+            texto = str(valor).strip().replace(' ', '')
+            if ',' in texto and '.' in texto:
+                miles = ',' if texto.rfind('.') > texto.rfind(',') else '.'
+                texto = texto.replace(miles, '')
+            texto = texto.replace(',', '.')
+        try:
+            monto = a_monto(texto)
+        except InvalidOperation:
+            return None
+        return monto if monto.is_finite() else None
+
+    @staticmethod
+    def _copiar(cursor, buffer):
+        if buffer.tell() == 0:
+            return
+        buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY {TABLA_IMPORTACION} (fila, {', '.join(COLUMNAS_IMPORTACION)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+    @staticmethod
+    def guardar_errores(errores: list, ruta: str):
+        """Escribe el reporte de errores por fila en CSV"""
+        with open(ruta, 'w', newline='', encoding='utf-8-sig') as archivo:
+            escritor = csv.DictWriter(archivo, fieldnames=['fila', 'numero', 'error'])
+            escritor.writeheader()
+            escritor.writerows(errores)
+
+
+def main():
+    """Uso: python src/services/import_service.py archivo.csv|archivo.xlsx [--validar] [--errores errores.csv]"""
+    from models import init_db, get_session, dispose_engine, Usuario
+
+    argumentos = sys.argv[1:]
+    if not argumentos or argumentos[0].startswith('--'):
+        print(main.__doc__)
+        return 1
+
+    init_db()
+    session = get_session()
+    service = ImportService()
+    try:
+        admin = session.query(Usuario).filter_by(username='admin').first()
+        inicio = datetime.now()
+        resultado = service.importar(session, argumentos[0], admin.id if admin else None,
+                                     solo_validar='--validar' in argumentos)
+        segundos = (datetime.now() - inicio).total_seconds()
+
+        print(resultado['mensaje'])
+        print(f"   {resultado['filas']} filas leídas en {segundos:.1f} s")
+        for error in resultado['errores'][:20]:
+            print(f"   fila {error['fila']} ({error['numero']}): {error['error']}")
+        if len(resultado['errores']) > 20:
+            print(f"   ... y {len(resultado['errores']) - 20} errores más")
+
+        if '--errores' in argumentos and resultado['errores']:
+            ruta_errores = argumentos[argumentos.index('--errores') + 1]
+            service.guardar_errores(resultado['errores'], ruta_errores)
+            print(f"   Reporte de errores: {ruta_errores}")
+        return 0 if resultado['exito'] else 1
+    finally:
+        session.close()
+        dispose_engine()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,18 @@
 import os
 import sys
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from datetime import datetime, date
+from sqlalchemy import func, distinct, tuple_, insert, delete, update, select, values, column, literal
+from sqlalchemy import Integer, String, DateTime
+from datetime import datetime, date, time, timedelta
 
 # Agregar el directorio raíz al path para imports absolutos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from models import AsientoContable, LineaAsiento, CuentaContable, AuditLog
+    from models import AsientoContable, LineaAsiento, CuentaContable, SaldoCuenta, AuditLog, ruta_de_codigo, a_monto, CENTAVO
+    from services.account_balance_service import AccountBalanceService
+    from services.period_service import PeriodService
+    from services.numbering_service import NumberingService
     MODELS_AVAILABLE = True
 except ImportError as e:
     print(f"❌ Modelos no disponibles: {e}")
@@ -16,164 +20,590 @@ except ImportError as e:
 
 class JournalService:
     def __init__(self):
-        pass
+        self.saldos = AccountBalanceService() if MODELS_AVAILABLE else None
+        self.periodos = PeriodService() if MODELS_AVAILABLE else None
+        self.numeracion = NumberingService()
     
     def crear_asiento(self, session: Session, numero: str, fecha: datetime, 
                      descripcion: str, lineas: list, usuario_id: int) -> tuple[bool, str]:
         """
-        Crea un nuevo asiento contable con validación de partida doble
+        Crea un nuevo asiento contable con validación de partida doble.
+        Sin número, se le asigna el siguiente de la serie al insertarlo
         """
+        return self.crear_asientos(session, [
+            {'numero': numero, 'fecha': fecha, 'descripcion': descripcion, 'lineas': lineas}
+        ], usuario_id)[0]
+    
+    def crear_asientos(self, session: Session, asientos: list, usuario_id: int) -> list:
+        """
+        Registra varios asientos ({'numero', 'fecha', 'descripcion', 'lineas'})
+        en una sola transacción y devuelve un (éxito, mensaje) por asiento.
+        Los asientos con numero vacío reciben el siguiente número de su serie.
+        Los asientos inválidos se informan y no impiden registrar los demás.
+        Los importes se normalizan a Decimal con centavos y la partida doble se
+        comprueba exacta, sin tolerancia. Números y cuentas se validan con una
+        consulta IN cada uno; asientos, líneas y auditoría se insertan con un
+        INSERT de varias filas
+        """
+        resultados = [None] * len(asientos)
         try:
-            # Validar partida doble
-            total_debe = sum(linea['debe'] for linea in lineas)
-            total_haber = sum(linea['haber'] for linea in lineas)
-            
-            if abs(total_debe - total_haber) > 0.01:  # Tolerancia para decimales
-                return False, f"❌ ERROR: La partida no está cuadrada\nDebe: Bs {total_debe:,.2f}\nHaber: Bs {total_haber:,.2f}\nDiferencia: Bs {total_debe - total_haber:,.2f}"
-            
-            # Verificar que el número de asiento no exista
-            asiento_existente = session.query(AsientoContable).filter_by(numero=numero).first()
-            if asiento_existente:
-                return False, f"❌ El número de asiento {numero} ya existe"
-            
-            # Validar que todas las cuentas existan
-            for linea in lineas:
-                cuenta = session.query(CuentaContable).filter_by(id=linea['cuenta_id']).first()
-                if not cuenta:
-                    return False, f"❌ La cuenta con ID {linea['cuenta_id']} no existe"
-                if not cuenta.activa:
-                    return False, f"❌ La cuenta {cuenta.codigo} - {cuenta.nombre} está inactiva"
-            
-            # Crear asiento
-            nuevo_asiento = AsientoContable(
-                numero=numero,
-                fecha=fecha,
-                descripcion=descripcion,
-                creado_por=usuario_id
-            )
-            session.add(nuevo_asiento)
-            session.flush()  # Para obtener el ID
-            
-            # Crear líneas del asiento
-            for linea in lineas:
-                nueva_linea = LineaAsiento(
-                    asiento_id=nuevo_asiento.id,
-                    cuenta_id=linea['cuenta_id'],
-                    debe=linea['debe'],
-                    haber=linea['haber'],
-                    descripcion=linea.get('descripcion', '')
-                )
-                session.add(nueva_linea)
+            if not MODELS_AVAILABLE:
+                return [(False, "Modelos no disponibles")] * len(asientos)
+            
+            asientos = [
+                {**asiento, 'lineas': [{**linea, 'debe': a_monto(linea.get('debe')),
+                                        'haber': a_monto(linea.get('haber'))}
+                                       for linea in asiento['lineas']]}
+                for asiento in asientos
+            ]
+            usados = {numero for (numero,) in session.query(AsientoContable.numero)
+                      .filter(AsientoContable.numero.in_({a.get('numero') for a in asientos if a.get('numero')}))}
+            cuentas = self._obtener_cuentas(
+                session, {linea['cuenta_id'] for asiento in asientos for linea in asiento['lineas']})
+            cierre = self.periodos.ultimo_cierre(session)
+            
+            validos = []
+            for i, asiento in enumerate(asientos):
+                error = self._validar_asiento(asiento, usados, cuentas, cierre)
+                if error:
+                    resultados[i] = (False, error)
+                    continue
+                if asiento.get('numero'):
+                    usados.add(asiento['numero'])
+                validos.append(i)
+            
+            if not validos:
+                session.rollback()
+                return resultados
+            
+            # Números automáticos: se reservan en esta transacción, en el orden de la lista
+            numeros = {i: asientos[i].get('numero') or self.numeracion.asignar_numero(session, asientos[i]['fecha'])
+                       for i in validos}
+            
+            creados = session.execute(
+                insert(AsientoContable).returning(AsientoContable.id, sort_by_parameter_order=True),
+                [{'numero': numeros[i], 'fecha': asientos[i]['fecha'],
+                  'descripcion': asientos[i]['descripcion'], 'creado_por': usuario_id}
+                 for i in validos]
+            ).scalars().all()
+            
+            session.execute(insert(LineaAsiento), [
+                {'asiento_id': asiento_id, 'cuenta_id': linea['cuenta_id'], 'fecha': asientos[i]['fecha'],
+                 'debe': linea['debe'], 'haber': linea['haber'], 'descripcion': linea.get('descripcion', '')}
+                for i, asiento_id in zip(validos, creados)
+                for linea in asientos[i]['lineas']
+            ])
+            
+            # Saldos por cuenta y mes, en la misma transacción
+            self.saldos.aplicar_lineas(session, LineaAsiento.asiento_id.in_(creados))
+            
+            # Después de tocar saldos_cuenta: un cierre en curso ya terminó y se ve aquí
+            abierto, mensaje = self.periodos.validar_fecha_abierta(
+                session, min(asientos[i]['fecha'] for i in validos))
+            if not abierto:
+                session.rollback()
+                return [resultado or (False, mensaje) for resultado in resultados]
             
             # Registrar en audit log
-            audit = AuditLog(
-                usuario_id=usuario_id,
-                accion="CREAR_ASIENTO",
-                tabla_afectada="asientos_contables",
-                registro_id=nuevo_asiento.id,
-                detalles=f"Asiento {numero} creado: {descripcion} - Total: Bs {total_debe:,.2f}"
-            )
-            session.add(audit)
+            session.execute(insert(AuditLog), [
+                {'usuario_id': usuario_id, 'accion': "CREAR_ASIENTO", 'tabla_afectada': "asientos_contables",
+                 'registro_id': asiento_id,
+                 'detalles': f"Asiento {numeros[i]} creado: {asientos[i]['descripcion']} - "
+                             f"Total: Bs {sum(linea['debe'] for linea in asientos[i]['lineas']):,.2f}"}
+                for i, asiento_id in zip(validos, creados)
+            ])
             
             session.commit()
-            return True, f"✅ Asiento {numero} creado exitosamente\nTotal: Bs {total_debe:,.2f}\nLíneas: {len(lineas)}"
+            for i in validos:
+                asiento = asientos[i]
+                total_debe = sum(linea['debe'] for linea in asiento['lineas'])
+                resultados[i] = (True, f"✅ Asiento {numeros[i]} creado exitosamente\n"
+                                       f"Total: Bs {total_debe:,.2f}\nLíneas: {len(asiento['lineas'])}")
+            return resultados
             
         except Exception as e:
             session.rollback()
-            return False, f"❌ Error al crear asiento: {str(e)}"
+            return [resultado if resultado and not resultado[0] else (False, f"❌ Error al crear asiento: {str(e)}")
+                    for resultado in resultados]
+    
+    def _validar_asiento(self, asiento, usados, cuentas, cierre):
+        """Mensaje de error del asiento, o None si se puede registrar"""
+        lineas = asiento['lineas']
+        
+        for linea in lineas:
+            for importe in (linea['debe'], linea['haber']):
+                if importe != importe.quantize(CENTAVO):
+                    return f"❌ El importe {importe} tiene fracciones de centavo"
+        
+        # Validar partida doble
+        total_debe = sum(linea['debe'] for linea in lineas)
+        total_haber = sum(linea['haber'] for linea in lineas)
+        
+        if total_debe != total_haber:
+            return f"❌ ERROR: La partida no está cuadrada\nDebe: Bs {total_debe:,.2f}\nHaber: Bs {total_haber:,.2f}\nDiferencia: Bs {total_debe - total_haber:,.2f}"
+        
+        if asiento.get('numero') in usados:
+            return f"❌ El número de asiento {asiento['numero']} ya existe"
+        
+        for linea in lineas:
+            cuenta = cuentas.get(linea['cuenta_id'])
+            if cuenta is None:
+                return f"❌ La cuenta con ID {linea['cuenta_id']} no existe"
+            codigo, nombre, activa = cuenta
+            if not activa:
+                return f"❌ La cuenta {codigo} - {nombre} está inactiva"
+        
+        abierto, mensaje = self.periodos.validar_contra_cierre(cierre, asiento['fecha'])
+        return None if abierto else mensaje
+    
+    def _obtener_cuentas(self, session: Session, cuenta_ids: set) -> dict:
+        """
+        id -> (codigo, nombre, activa) de las cuentas pedidas, con una consulta
+        IN dentro de la transacción del asiento. FOR SHARE: una desactivación
+        en curso espera a que el asiento termine, y el asiento ve la que ya terminó
+        """
+        if not cuenta_ids:
+            return {}
+        consulta = session.query(CuentaContable.id, CuentaContable.codigo, CuentaContable.nombre,
+                                 CuentaContable.activa).filter(
+            CuentaContable.id.in_(cuenta_ids)).with_for_update(read=True)
+        return {fila.id: (fila.codigo, fila.nombre, bool(fila.activa)) for fila in consulta}
     
     def obtener_asientos(self, session: Session, fecha_inicio: datetime = None, 
                         fecha_fin: datetime = None) -> list:
         """
-        Obtiene asientos contables con filtros opcionales
+        Obtiene asientos contables con filtros opcionales.
+        Asientos, líneas y cuentas se leen en una sola consulta (sin N+1)
         """
         try:
             if not MODELS_AVAILABLE:
                 return []
                 
-            query = session.query(AsientoContable)
+            query = self._filtrar_periodo(self._consulta_lineas_asientos(session), fecha_inicio, fecha_fin)
             
-            if fecha_inicio:
-                query = query.filter(AsientoContable.fecha >= fecha_inicio)
-            if fecha_fin:
-                query = query.filter(AsientoContable.fecha <= fecha_fin)
+            filas = query.order_by(AsientoContable.fecha.desc(),
+                                   AsientoContable.numero.desc(),
+                                   LineaAsiento.id).all()
             
-            asientos = query.order_by(AsientoContable.fecha.desc(), 
-                                    AsientoContable.numero.desc()).all()
+            return self._agrupar_asientos(filas)
             
-            resultado = []
-            for asiento in asientos:
-                lineas = session.query(LineaAsiento).filter_by(asiento_id=asiento.id).all()
-                
+        except Exception as e:
+            print(f"❌ Error al obtener asientos: {e}")
+            return []
+    
+    def _consulta_lineas_asientos(self, session: Session):
+        """
+        Consulta base: una fila por línea de asiento con los datos del asiento
+        y de la cuenta. Los asientos sin líneas aparecen con columnas de línea nulas
+        """
+        return session.query(
+            AsientoContable.id,
+            AsientoContable.numero,
+            AsientoContable.fecha,
+            AsientoContable.descripcion,
+            AsientoContable.creado_por,
+            AsientoContable.creado_en,
+            AsientoContable.anulado,
+            AsientoContable.reversion_de,
+            LineaAsiento.id.label('linea_id'),
+            LineaAsiento.debe,
+            LineaAsiento.haber,
+            LineaAsiento.descripcion.label('linea_descripcion'),
+            CuentaContable.codigo.label('cuenta_codigo'),
+            CuentaContable.nombre.label('cuenta_nombre')
+        ).outerjoin(
+            LineaAsiento, LineaAsiento.asiento_id == AsientoContable.id
+        ).outerjoin(
+            CuentaContable, CuentaContable.id == LineaAsiento.cuenta_id
+        )
+    
+    def _agrupar_asientos(self, filas, saldo_inicial=None) -> list:
+        """
+        Agrupa las filas de _consulta_lineas_asientos (ordenadas por asiento)
+        en la estructura de asientos con su lista de líneas.
+        Con saldo_inicial, las filas traen la columna saldo_pagina (suma corrida
+        de debe - haber) y cada línea recibe su 'saldo' acumulado
+        """
+        resultado = []
+        asiento_data = None
+        
+        for fila in filas:
+            if asiento_data is None or asiento_data['id'] != fila.id:
                 asiento_data = {
-                    'id': asiento.id,
-                    'numero': asiento.numero,
-                    'fecha': asiento.fecha,
-                    'descripcion': asiento.descripcion,
-                    'creado_por': asiento.creado_por,
-                    'creado_en': asiento.creado_en,
+                    'id': fila.id,
+                    'numero': fila.numero,
+                    'fecha': fila.fecha,
+                    'descripcion': fila.descripcion,
+                    'creado_por': fila.creado_por,
+                    'creado_en': fila.creado_en,
+                    'anulado': fila.anulado,
+                    'reversion_de': fila.reversion_de,
                     'lineas': []
                 }
-                
-                for linea in lineas:
-                    cuenta = session.query(CuentaContable).filter_by(id=linea.cuenta_id).first()
-                    linea_data = {
-                        'id': linea.id,
-                        'cuenta_codigo': cuenta.codigo if cuenta else '',
-                        'cuenta_nombre': cuenta.nombre if cuenta else '',
-                        'debe': float(linea.debe),
-                        'haber': float(linea.haber),
-                        'descripcion': linea.descripcion
-                    }
-                    asiento_data['lineas'].append(linea_data)
-                
                 resultado.append(asiento_data)
             
-            return resultado
+            if fila.linea_id is None:
+                continue
+            
+            linea_data = {
+                'id': fila.linea_id,
+                'cuenta_codigo': fila.cuenta_codigo or '',
+                'cuenta_nombre': fila.cuenta_nombre or '',
+                'debe': fila.debe,
+                'haber': fila.haber,
+                'descripcion': fila.linea_descripcion
+            }
+            if saldo_inicial is not None:
+                linea_data['saldo'] = saldo_inicial + fila.saldo_pagina
+            asiento_data['lineas'].append(linea_data)
+        
+        return resultado
+    
+    def obtener_pagina_asientos(self, session: Session, fecha_inicio: date = None, fecha_fin: date = None,
+                                despues_de: tuple = None, limite: int = 20, acumulado: dict = None) -> dict:
+        """
+        Obtiene una página de asientos con paginación keyset sobre (fecha, numero),
+        en el mismo orden descendente que obtener_asientos.
+        despues_de es la clave (fecha, numero) del último asiento de la página anterior;
+        el costo no depende de cuántas páginas haya antes.
+        
+        acumulado son los totales arrastrados hasta el inicio de la página (el
+        'acumulado_fin' de la página anterior); si no se conoce se calcula con un
+        agregado. Cada línea trae su 'saldo' corrido (ventana SQL sobre la página
+        más el arrastre) y se devuelven los acumulados de inicio y fin de página
+        """
+        vacio = {'asientos': [], 'siguiente': None,
+                 'acumulado_inicio': {'total_debe': 0, 'total_haber': 0},
+                 'acumulado_fin': {'total_debe': 0, 'total_haber': 0}}
+        try:
+            if not MODELS_AVAILABLE:
+                return vacio
+                
+            if acumulado is None:
+                acumulado = self.obtener_totales_anteriores(session, fecha_inicio, fecha_fin, despues_de)
+            
+            pagina = self._filtrar_periodo(
+                session.query(AsientoContable.id), fecha_inicio, fecha_fin)
+            if despues_de:
+                pagina = pagina.filter(
+                    tuple_(AsientoContable.fecha, AsientoContable.numero) < tuple_(*despues_de))
+            # Un asiento de más indica si hay página siguiente, sin contar
+            pagina = pagina.order_by(AsientoContable.fecha.desc(),
+                                     AsientoContable.numero.desc()).limit(limite + 1).subquery()
+            
+            orden = (AsientoContable.fecha.desc(), AsientoContable.numero.desc(), LineaAsiento.id)
+            saldo_pagina = func.sum(
+                func.coalesce(LineaAsiento.debe, 0) - func.coalesce(LineaAsiento.haber, 0)
+            ).over(order_by=orden)
+            
+            filas = self._consulta_lineas_asientos(session).add_columns(
+                saldo_pagina.label('saldo_pagina')
+            ).join(
+                pagina, pagina.c.id == AsientoContable.id
+            ).order_by(*orden).all()
+            
+            saldo_inicial = acumulado['total_debe'] - acumulado['total_haber']
+            asientos = self._agrupar_asientos(filas, saldo_inicial)
+            siguiente = None
+            if len(asientos) > limite:
+                asientos.pop()
+                siguiente = (asientos[-1]['fecha'], asientos[-1]['numero'])
+            
+            lineas = [linea for asiento in asientos for linea in asiento['lineas']]
+            acumulado_fin = {
+                'total_debe': acumulado['total_debe'] + sum(linea['debe'] or 0 for linea in lineas),
+                'total_haber': acumulado['total_haber'] + sum(linea['haber'] or 0 for linea in lineas)
+            }
+            
+            return {'asientos': asientos, 'siguiente': siguiente,
+                    'acumulado_inicio': acumulado, 'acumulado_fin': acumulado_fin}
             
         except Exception as e:
-            print(f"❌ Error al obtener asientos: {e}")
-            return []
+            print(f"❌ Error al obtener página de asientos: {e}")
+            return vacio
+    
+    def obtener_clave_pagina(self, session: Session, fecha_inicio: date = None, fecha_fin: date = None,
+                             pagina: int = 1, limite: int = 20) -> tuple | None:
+        """
+        Obtiene la clave despues_de con la que empieza una página arbitraria.
+        Sólo hace falta al saltar directamente a una página no visitada; recorre
+        el índice (fecha, numero) sin leer líneas
+        """
+        if pagina <= 1 or not MODELS_AVAILABLE:
+            return None
+            
+        query = self._filtrar_periodo(
+            session.query(AsientoContable.fecha, AsientoContable.numero), fecha_inicio, fecha_fin)
+        clave = query.order_by(AsientoContable.fecha.desc(),
+                               AsientoContable.numero.desc()).offset((pagina - 1) * limite - 1).first()
+        return tuple(clave) if clave else None
+    
+    def contar_asientos(self, session: Session, fecha_inicio: date = None, fecha_fin: date = None) -> int:
+        """
+        Cuenta los asientos del periodo (sin tocar las líneas)
+        """
+        try:
+            if not MODELS_AVAILABLE:
+                return 0
+                
+            query = self._filtrar_periodo(
+                session.query(func.count(AsientoContable.id)), fecha_inicio, fecha_fin)
+            return query.scalar()
+        except Exception as e:
+            print(f"❌ Error al contar asientos: {e}")
+            return 0
+    
+    def obtener_totales_anteriores(self, session: Session, fecha_inicio: date = None, fecha_fin: date = None,
+                                   despues_de: tuple = None) -> dict:
+        """
+        Suma debe/haber de los asientos del periodo que preceden a la clave despues_de
+        (en el orden descendente del libro), para el acumulado de una página.
+        Sólo el mes de la clave y el de fecha_fin se suman desde las líneas: los
+        meses completos intermedios salen de saldos_cuenta, así el costo de
+        saltar a una página lejana no depende de cuántas líneas quedan antes
+        """
+        try:
+            if not MODELS_AVAILABLE or not despues_de:
+                return {'total_debe': 0, 'total_haber': 0}
+                
+            lineas = self._filtrar_periodo(self._totales_periodo(session), fecha_inicio, fecha_fin).filter(
+                tuple_(AsientoContable.fecha, AsientoContable.numero) >= tuple_(*despues_de))
+            
+            fecha_clave = despues_de[0]
+            desde = date(fecha_clave.year + fecha_clave.month // 12, fecha_clave.month % 12 + 1, 1)
+            hasta = date(fecha_fin.year, fecha_fin.month, 1) if fecha_fin else None
+            if hasta is not None and hasta < desde:
+                # La clave está en el mes de fecha_fin
+                _, total_debe, total_haber = lineas.one()
+                return {'total_debe': total_debe, 'total_haber': total_haber}
+            
+            _, total_debe, total_haber = lineas.filter(AsientoContable.fecha < desde).one()
+            meses = session.query(
+                func.coalesce(func.sum(SaldoCuenta.total_debe), 0),
+                func.coalesce(func.sum(SaldoCuenta.total_haber), 0)
+            ).filter(SaldoCuenta.periodo >= desde)
+            if hasta is not None:
+                meses = meses.filter(SaldoCuenta.periodo < hasta)
+                _, debe_fin, haber_fin = lineas.filter(AsientoContable.fecha >= hasta).one()
+                total_debe += debe_fin
+                total_haber += haber_fin
+            debe_meses, haber_meses = meses.one()
+            return {'total_debe': total_debe + debe_meses, 'total_haber': total_haber + haber_meses}
+        except Exception as e:
+            print(f"❌ Error obteniendo acumulados: {e}")
+            return {'total_debe': 0, 'total_haber': 0}
+    
+    def _filtrar_periodo(self, query, fecha_inicio=None, fecha_fin=None):
+        if fecha_inicio:
+            query = query.filter(AsientoContable.fecha >= fecha_inicio)
+        if fecha_fin:
+            query = query.filter(AsientoContable.fecha <= fecha_fin)
+        return query
     
     def eliminar_asiento(self, session: Session, asiento_id: int, usuario_id: int) -> tuple[bool, str]:
         """
         Elimina un asiento contable
         """
+        return self._eliminar(session, AsientoContable.id == asiento_id, usuario_id)
+    
+    def eliminar_asiento_por_numero(self, session: Session, numero: str, usuario_id: int) -> tuple[bool, str]:
+        """
+        Elimina un asiento buscándolo por número (índice único de numero)
+        """
+        return self._eliminar(session, AsientoContable.numero == numero, usuario_id)
+    
+    def _eliminar(self, session: Session, condicion, usuario_id: int) -> tuple[bool, str]:
+        """
+        Borra el asiento con unas pocas sentencias por índice: lectura del
+        asiento, descuento de saldos, DELETE del asiento (las líneas caen por
+        ON DELETE CASCADE) y el registro de auditoría
+        """
         try:
             if not MODELS_AVAILABLE:
                 return False, "Modelos no disponibles"
-                
-            asiento = session.query(AsientoContable).filter_by(id=asiento_id).first()
+            
+            # FOR UPDATE: dos eliminaciones simultáneas no descuentan dos veces los saldos
+            asiento = session.query(AsientoContable.id, AsientoContable.numero, AsientoContable.fecha,
+                                    AsientoContable.anulado, AsientoContable.reversion_de).filter(
+                condicion).with_for_update().first()
             if not asiento:
+                session.rollback()
                 return False, "❌ Asiento no encontrado"
+            if asiento.anulado or asiento.reversion_de is not None:
+                session.rollback()
+                return False, f"❌ El asiento {asiento.numero} forma parte de una anulación y no se puede eliminar"
             
             # Obtener información para el log
-            numero_asiento = asiento.numero
-            lineas_count = session.query(LineaAsiento).filter_by(asiento_id=asiento_id).count()
+            lineas_count = session.query(func.count(LineaAsiento.id)).filter(
+                LineaAsiento.asiento_id == asiento.id).scalar()
             
-            # Eliminar líneas primero
-            session.query(LineaAsiento).filter_by(asiento_id=asiento_id).delete()
+            # Descontar de los saldos antes de borrar las líneas
+            self.saldos.aplicar_asiento(session, asiento.id, signo=-1)
             
-            # Eliminar asiento
-            session.delete(asiento)
+            abierto, mensaje = self.periodos.validar_fecha_abierta(session, asiento.fecha)
+            if not abierto:
+                session.rollback()
+                return False, mensaje
+            
+            session.execute(delete(AsientoContable).where(AsientoContable.id == asiento.id))
             
             # Registrar en audit log
             audit = AuditLog(
                 usuario_id=usuario_id,
                 accion="ELIMINAR_ASIENTO",
                 tabla_afectada="asientos_contables",
-                registro_id=asiento_id,
-                detalles=f"Asiento {numero_asiento} eliminado - Líneas: {lineas_count}"
+                registro_id=asiento.id,
+                detalles=f"Asiento {asiento.numero} eliminado - Líneas: {lineas_count}"
             )
             session.add(audit)
             
             session.commit()
-            return True, f"✅ Asiento {numero_asiento} eliminado exitosamente"
+            return True, f"✅ Asiento {asiento.numero} eliminado exitosamente"
             
         except Exception as e:
             session.rollback()
             return False, f"❌ Error al eliminar asiento: {str(e)}"
     
+    def anular_asiento(self, session: Session, numero: str, usuario_id: int,
+                       fecha: datetime = None) -> tuple[bool, str]:
+        """
+        Anula un asiento registrando su reversión (debe y haber invertidos) con
+        fecha 'fecha' (hoy por defecto). El original se conserva, marcado como
+        anulado, aunque esté en un periodo cerrado
+        """
+        return self._anular(session, [AsientoContable.numero == numero], usuario_id, fecha)
+    
+    def anular_asientos(self, session: Session, usuario_id: int, fecha_inicio: datetime = None,
+                        fecha_fin: datetime = None, prefijo: str = None,
+                        fecha: datetime = None) -> tuple[bool, str]:
+        """
+        Anula en una sola transacción los asientos vigentes del rango de fechas
+        y/o cuyo número empieza por prefijo
+        """
+        if not (fecha_inicio or fecha_fin or prefijo):
+            return False, "❌ Indique un rango de fechas o un prefijo de número"
+        
+        condiciones = []
+        if fecha_inicio:
+            condiciones.append(AsientoContable.fecha >= fecha_inicio)
+        if fecha_fin:
+            condiciones.append(AsientoContable.fecha <= fecha_fin)
+        if prefijo:
+            condiciones.append(AsientoContable.numero.startswith(prefijo, autoescape=True))
+        return self._anular(session, condiciones, usuario_id, fecha)
+    
+    def _anular(self, session: Session, condiciones: list, usuario_id: int, fecha=None) -> tuple[bool, str]:
+        """
+        Reversión por conjuntos: un INSERT ... SELECT de los asientos de
+        reversión, otro de sus líneas invertidas y un UPDATE de la marca de
+        anulado. Los saldos sólo reciben las líneas nuevas en la fecha de la
+        reversión: los snapshots y periodos anteriores no cambian
+        """
+        try:
+            if not MODELS_AVAILABLE:
+                return False, "Modelos no disponibles"
+            
+            fecha = fecha or datetime.now()
+            if not isinstance(fecha, datetime):
+                fecha = datetime.combine(fecha, time.min)
+            
+            # FOR UPDATE: dos anulaciones simultáneas no revierten dos veces el mismo asiento
+            originales = session.query(AsientoContable.id, AsientoContable.numero).filter(
+                *condiciones,
+                AsientoContable.anulado.is_(False),
+                AsientoContable.reversion_de.is_(None)
+            ).order_by(AsientoContable.fecha, AsientoContable.numero).with_for_update().all()
+            if not originales:
+                session.rollback()
+                return False, "❌ No hay asientos vigentes para anular (no existen, ya están anulados o son reversiones)"
+            
+            abierto, mensaje = self.periodos.validar_fecha_abierta(session, fecha)
+            if not abierto:
+                session.rollback()
+                return False, mensaje
+            
+            numeros = self.numeracion.asignar_numeros(session, fecha, len(originales))
+            mapa = values(column('id', Integer), column('numero', String), name='reversiones').data(
+                [(original.id, numero) for original, numero in zip(originales, numeros)])
+            
+            reversiones = session.execute(
+                insert(AsientoContable).from_select(
+                    ['numero', 'fecha', 'descripcion', 'creado_por', 'creado_en', 'reversion_de'],
+                    select(
+                        mapa.c.numero,
+                        literal(fecha, DateTime),
+                        func.concat('ANULACIÓN ', AsientoContable.numero, ': ', AsientoContable.descripcion),
+                        literal(usuario_id, Integer),
+                        literal(datetime.utcnow(), DateTime),
+                        AsientoContable.id
+                    ).join(mapa, mapa.c.id == AsientoContable.id)
+                ).returning(AsientoContable.id)
+            ).scalars().all()
+            
+            session.execute(
+                insert(LineaAsiento).from_select(
+                    ['asiento_id', 'cuenta_id', 'fecha', 'debe', 'haber', 'descripcion'],
+                    select(
+                        AsientoContable.id,
+                        LineaAsiento.cuenta_id,
+                        literal(fecha, DateTime),
+                        LineaAsiento.haber,
+                        LineaAsiento.debe,
+                        LineaAsiento.descripcion
+                    ).join(LineaAsiento, LineaAsiento.asiento_id == AsientoContable.reversion_de)
+                    .where(AsientoContable.id.in_(reversiones))
+                    .order_by(AsientoContable.id, LineaAsiento.id)
+                )
+            )
+            
+            session.execute(
+                update(AsientoContable)
+                .where(AsientoContable.id.in_([original.id for original in originales]))
+                .values(anulado=True, anulado_en=datetime.now())
+            )
+            
+            # Las reversiones se suman a los saldos como cualquier asiento nuevo
+            self.saldos.aplicar_lineas(session, LineaAsiento.asiento_id.in_(reversiones))
+            
+            # Después de tocar saldos_cuenta: un cierre en curso ya terminó y se ve aquí
+            abierto, mensaje = self.periodos.validar_fecha_abierta(session, fecha)
+            if not abierto:
+                session.rollback()
+                return False, mensaje
+            
+            session.execute(insert(AuditLog), [
+                {'usuario_id': usuario_id, 'accion': "ANULAR_ASIENTO", 'tabla_afectada': "asientos_contables",
+                 'registro_id': original.id,
+                 'detalles': f"Asiento {original.numero} anulado con el asiento {numero}"}
+                for original, numero in zip(originales, numeros)
+            ])
+            
+            session.commit()
+            if len(originales) == 1:
+                return True, f"✅ Asiento {originales[0].numero} anulado con el asiento {numeros[0]}"
+            return True, f"✅ {len(originales)} asientos anulados con los asientos {numeros[0]} a {numeros[-1]}"
+            
+        except Exception as e:
+            session.rollback()
+            return False, f"❌ Error al anular asientos: {str(e)}"
+    
+    def obtener_asiento_por_numero(self, session: Session, numero: str) -> dict | None:
+        """
+        Un asiento con sus líneas, buscado por número (índice único de numero)
+        """
+        try:
+            if not MODELS_AVAILABLE:
+                return None
+            
+            filas = self._consulta_lineas_asientos(session).filter(
+                AsientoContable.numero == numero).order_by(LineaAsiento.id).all()
+            asientos = self._agrupar_asientos(filas)
+            return asientos[0] if asientos else None
+            
+        except Exception as e:
+            print(f"❌ Error al obtener asiento {numero}: {e}")
+            return None
+    
     def obtener_cuentas_contables(self, session: Session) -> list:
         """
         Obtiene todas las cuentas contables activas
@@ -182,31 +612,41 @@ class JournalService:
             if not MODELS_AVAILABLE:
                 return []
                 
-            cuentas = session.query(CuentaContable).filter_by(activa=True).order_by(CuentaContable.codigo).all()
-            return [{'id': c.id, 'codigo': c.codigo, 'nombre': c.nombre, 'tipo': c.tipo} for c in cuentas]
+            # Orden natural del plan de cuentas (1.2 antes que 1.10)
+            cuentas = session.query(CuentaContable).filter_by(activa=True).order_by(CuentaContable.ruta).all()
+            return [{'id': c.id, 'codigo': c.codigo, 'nombre': c.nombre, 'tipo': c.tipo,
+                     'nivel': c.nivel, 'parent_id': c.parent_id} for c in cuentas]
         except Exception as e:
             print(f"❌ Error al obtener cuentas: {e}")
             return []
     
-    def generar_numero_asiento(self, session: Session) -> str:
+    def obtener_subcuentas(self, session: Session, codigo: str, incluir_cuenta: bool = True) -> list:
         """
-        Genera un número de asiento automático
+        Obtiene la cuenta y todas sus subcuentas (a cualquier nivel) con un
+        rango sobre el índice de ruta
         """
         try:
             if not MODELS_AVAILABLE:
-                return f"AS-{datetime.now().strftime('%Y%m%d')}-001"
-                
-            # Formato: AS-YYYYMMDD-XXX
-            fecha_actual = datetime.now()
-            prefijo = f"AS-{fecha_actual.strftime('%Y%m%d')}"
-            
-            # Contar asientos del día
-            asientos_hoy = session.query(AsientoContable).filter(
-                AsientoContable.numero.like(f"{prefijo}-%")
-            ).count()
+                return []
             
-            numero = f"{prefijo}-{asientos_hoy + 1:03d}"
-            return numero
+            ruta = ruta_de_codigo(codigo)
+            query = session.query(CuentaContable).filter(CuentaContable.en_subarbol(ruta))
+            if not incluir_cuenta:
+                query = query.filter(CuentaContable.ruta != ruta)
+            return [{'id': c.id, 'codigo': c.codigo, 'nombre': c.nombre, 'tipo': c.tipo,
+                     'nivel': c.nivel, 'parent_id': c.parent_id}
+                    for c in query.order_by(CuentaContable.ruta)]
+        except Exception as e:
+            print(f"❌ Error al obtener subcuentas: {e}")
+            return []
+    
+    def generar_numero_asiento(self, session: Session, fecha: date = None) -> str:
+        """
+        Próximo número de asiento de la serie (sólo para mostrarlo); el número
+        definitivo se asigna al guardar
+        """
+        try:
+            return self.numeracion.generar_numero_asiento(session, fecha)
             
         except Exception as e:
             print(f"❌ Error generando número de asiento: {e}")
@@ -223,23 +663,19 @@ class JournalService:
             if not fecha:
                 fecha = datetime.now()
             
-            # Asientos del día
-            asientos = session.query(AsientoContable).filter(
-                AsientoContable.fecha == fecha.date()
-            ).all()
-            
-            total_debe = 0
-            total_haber = 0
+            # Rango semiabierto [día, día siguiente) para cubrir cualquier hora y usar el índice de fecha
+            dia = fecha.date() if isinstance(fecha, datetime) else fecha
+            inicio = datetime.combine(dia, time.min)
+            fin = inicio + timedelta(days=1)
             
-            for asiento in asientos:
-                lineas = session.query(LineaAsiento).filter_by(asiento_id=asiento.id).all()
-                for linea in lineas:
-                    total_debe += float(linea.debe)
-                    total_haber += float(linea.haber)
+            total_asientos, total_debe, total_haber = self._totales_periodo(session).filter(
+                AsientoContable.fecha >= inicio,
+                AsientoContable.fecha < fin
+            ).one()
             
             return {
                 'fecha': fecha,
-                'total_asientos': len(asientos),
+                'total_asientos': total_asientos,
                 'total_debe': total_debe,
                 'total_haber': total_haber,
                 'diferencia': total_debe - total_haber
@@ -257,24 +693,8 @@ class JournalService:
             if not MODELS_AVAILABLE:
                 return {'total_asientos': 0, 'total_debe': 0, 'total_haber': 0, 'balance': 0, 'periodo': 'Error'}
                 
-            query = session.query(AsientoContable)
-            
-            if fecha_inicio:
-                query = query.filter(AsientoContable.fecha >= fecha_inicio)
-            if fecha_fin:
-                query = query.filter(AsientoContable.fecha <= fecha_fin)
-            
-            asientos = query.all()
-            
-            total_asientos = len(asientos)
-            total_debe = 0
-            total_haber = 0
-            
-            for asiento in asientos:
-                lineas = session.query(LineaAsiento).filter_by(asiento_id=asiento.id).all()
-                for linea in lineas:
-                    total_debe += float(linea.debe)
-                    total_haber += float(linea.haber)
+            query = self._filtrar_periodo(self._totales_periodo(session), fecha_inicio, fecha_fin)
+            total_asientos, total_debe, total_haber = query.one()
             
             return {
                 'total_asientos': total_asientos,
@@ -286,4 +706,17 @@ class JournalService:
             
         except Exception as e:
             print(f"❌ Error obteniendo estadísticas: {e}")
-            return {'total_asientos': 0, 'total_debe': 0, 'total_haber': 0, 'balance': 0, 'periodo': 'Error'}
\ No newline at end of file
+            return {'total_asientos': 0, 'total_debe': 0, 'total_haber': 0, 'balance': 0, 'periodo': 'Error'}
+    
+    def _totales_periodo(self, session: Session):
+        """
+        Agregado en la base de datos: (número de asientos, suma debe, suma haber).
+        Las sumas son NUMERIC exactos (Decimal), no float
+        """
+        return session.query(
+            func.count(distinct(AsientoContable.id)),
+            func.coalesce(func.sum(LineaAsiento.debe), 0),
+            func.coalesce(func.sum(LineaAsiento.haber), 0)
+        ).select_from(AsientoContable).outerjoin(
+            LineaAsiento, LineaAsiento.asiento_id == AsientoContable.id
+        )
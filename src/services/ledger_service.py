@@ -0,0 +1,227 @@
+import os
+import sys
+from sqlalchemy.orm import Session
+from sqlalchemy import func, literal, tuple_, Numeric
+from datetime import datetime, date, time
+
+# Agregar el directorio raíz al path para imports absolutos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from models import AsientoContable, LineaAsiento, CuentaContable, ruta_de_codigo
+    from services.account_balance_service import AccountBalanceService, limites_periodo
+    MODELS_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Modelos no disponibles: {e}")
+    MODELS_AVAILABLE = False
+
+
+class LedgerService:
+    """
+    Libro mayor: movimientos por cuenta con saldo inicial y saldo acumulado.
+    El saldo inicial parte del último snapshot, suma los meses siguientes de
+    saldos_cuenta y las líneas del mes en curso; el saldo de cada movimiento
+    lo calcula PostgreSQL con una función de ventana sobre el índice
+    (cuenta_id, fecha, id)
+    """
+
+    def __init__(self):
+        self.saldos = AccountBalanceService() if MODELS_AVAILABLE else None
+
+    def obtener_cuentas_mayor(self, session: Session, codigo_desde: str = None,
+                              codigo_hasta: str = None) -> list:
+        """
+        Cuentas del rango de códigos en el orden del plan de cuentas.
+        El rango incluye ambos extremos y las subcuentas de la cuenta final
+        """
+        try:
+            if not MODELS_AVAILABLE:
+                return []
+
+            query = session.query(CuentaContable.id, CuentaContable.codigo,
+                                  CuentaContable.nombre, CuentaContable.tipo)
+            if codigo_desde:
+                query = query.filter(CuentaContable.ruta >= ruta_de_codigo(codigo_desde))
+            if codigo_hasta:
+                query = query.filter(CuentaContable.ruta < ruta_de_codigo(codigo_hasta) + '/')
+
+            return [
+                {'id': c.id, 'codigo': c.codigo, 'nombre': c.nombre, 'tipo': c.tipo}
+                for c in query.order_by(CuentaContable.ruta)
+            ]
+
+        except Exception as e:
+            print(f"❌ Error obteniendo cuentas del mayor: {e}")
+            return []
+
+    def preparar_mayor(self, session: Session, codigo_desde: str = None, codigo_hasta: str = None,
+                       fecha_inicio: datetime = None, fecha_fin: datetime = None,
+                       incluir_sin_movimientos: bool = False) -> list:
+        """
+        Cuentas del mayor con su resumen del periodo:
+        saldo_inicial, total_debe, total_haber, saldo_final y movimientos.
+        Por defecto omite las cuentas sin movimientos ni saldo inicial
+        """
+        cuentas = self.obtener_cuentas_mayor(session, codigo_desde, codigo_hasta)
+        resumen = self.obtener_resumen_mayor(session, [c['id'] for c in cuentas],
+                                             fecha_inicio, fecha_fin)
+
+        resultado = []
+        for cuenta in cuentas:
+            cuenta.update(resumen.get(cuenta['id'], self._resumen_vacio()))
+            if incluir_sin_movimientos or cuenta['movimientos'] or cuenta['saldo_inicial']:
+                resultado.append(cuenta)
+        return resultado
+
+    def obtener_resumen_mayor(self, session: Session, cuenta_ids: list,
+                              fecha_inicio: datetime = None, fecha_fin: datetime = None) -> dict:
+        """
+        Saldo inicial y totales del periodo por cuenta, en dos consultas agregadas:
+        lo anterior al mes de inicio sale del último snapshot más saldos_cuenta
+        y sólo las líneas del mes de inicio y del periodo se suman directamente
+        """
+        if not MODELS_AVAILABLE or not cuenta_ids:
+            return {}
+
+        inicio, fin = limites_periodo(fecha_inicio, fecha_fin)
+        resumen = {}
+
+        diferencia = func.coalesce(LineaAsiento.debe, 0) - func.coalesce(LineaAsiento.haber, 0)
+        consulta = session.query(LineaAsiento.cuenta_id).filter(LineaAsiento.cuenta_id.in_(cuenta_ids))
+
+        if inicio is not None:
+            # Meses completos anteriores al periodo
+            mes_inicio = date(inicio.year, inicio.month, 1)
+            anteriores = self.saldos.obtener_saldos_acumulados(session, [mes_inicio], cuenta_ids)
+            for cuenta_id, (debe, haber) in anteriores[mes_inicio].items():
+                resumen.setdefault(cuenta_id, self._resumen_vacio())['saldo_inicial'] += debe - haber
+
+            # Días del mes de inicio anteriores al periodo, más el periodo
+            en_periodo = LineaAsiento.fecha >= inicio
+            consulta = consulta.add_columns(
+                func.coalesce(func.sum(diferencia).filter(LineaAsiento.fecha < inicio), 0),
+                func.coalesce(func.sum(LineaAsiento.debe).filter(en_periodo), 0),
+                func.coalesce(func.sum(LineaAsiento.haber).filter(en_periodo), 0),
+                func.count(LineaAsiento.id).filter(en_periodo),
+            ).filter(LineaAsiento.fecha >= datetime.combine(mes_inicio, time.min))
+        else:
+            consulta = consulta.add_columns(
+                literal(0),
+                func.coalesce(func.sum(LineaAsiento.debe), 0),
+                func.coalesce(func.sum(LineaAsiento.haber), 0),
+                func.count(LineaAsiento.id),
+            )
+
+        if fin is not None:
+            consulta = consulta.filter(LineaAsiento.fecha < fin)
+
+        for cuenta_id, saldo_previo, total_debe, total_haber, movimientos in consulta.group_by(LineaAsiento.cuenta_id):
+            datos = resumen.setdefault(cuenta_id, self._resumen_vacio())
+            datos['saldo_inicial'] += saldo_previo
+            datos['total_debe'] = total_debe
+            datos['total_haber'] = total_haber
+            datos['movimientos'] = movimientos
+
+        for datos in resumen.values():
+            datos['saldo_final'] = datos['saldo_inicial'] + datos['total_debe'] - datos['total_haber']
+        return resumen
+
+    def obtener_pagina_mayor(self, session: Session, cuentas: list, fecha_inicio: datetime = None,
+                             fecha_fin: datetime = None, despues_de: dict = None,
+                             limite: int = 500) -> dict:
+        """
+        Siguiente bloque de filas del mayor para las cuentas de preparar_mayor().
+        Cada fila es un dict con 'tipo': 'cuenta' (encabezado con saldo inicial),
+        'movimiento' o 'total'. Devuelve {'filas', 'siguiente'}; 'siguiente' se
+        pasa como despues_de para el bloque que sigue y es None al terminar
+        """
+        estado = dict(despues_de) if despues_de else self._estado_cuenta(0)
+        filas = []
+
+        while estado['indice'] < len(cuentas) and len(filas) < limite:
+            cuenta = cuentas[estado['indice']]
+
+            if estado['saldo'] is None:
+                estado['saldo'] = cuenta['saldo_inicial']
+                filas.append({'tipo': 'cuenta', 'cuenta': cuenta, 'saldo': cuenta['saldo_inicial']})
+                continue
+
+            restantes = limite - len(filas)
+            movimientos = self._movimientos_cuenta(session, cuenta, fecha_inicio, fecha_fin,
+                                                   estado, restantes)
+            filas.extend(movimientos)
+            if movimientos:
+                ultimo = movimientos[-1]
+                estado.update(fecha=ultimo['fecha'], linea_id=ultimo['id'], saldo=ultimo['saldo'])
+
+            if len(movimientos) < restantes:
+                filas.append({'tipo': 'total', 'cuenta': cuenta, 'saldo': estado['saldo']})
+                estado = self._estado_cuenta(estado['indice'] + 1)
+
+        siguiente = estado if estado['indice'] < len(cuentas) else None
+        return {'filas': filas, 'siguiente': siguiente}
+
+    def iterar_mayor(self, session: Session, cuentas: list, fecha_inicio: datetime = None,
+                     fecha_fin: datetime = None, bloque: int = 2000):
+        """Recorre todas las filas del mayor por bloques, para exportaciones"""
+        despues_de = None
+        while True:
+            pagina = self.obtener_pagina_mayor(session, cuentas, fecha_inicio, fecha_fin,
+                                               despues_de, bloque)
+            yield from pagina['filas']
+            despues_de = pagina['siguiente']
+            if despues_de is None:
+                break
+
+    def _movimientos_cuenta(self, session, cuenta, fecha_inicio, fecha_fin, estado, limite):
+        """Movimientos de una cuenta después de la clave (fecha, id), con saldo acumulado"""
+        inicio, fin = limites_periodo(fecha_inicio, fecha_fin)
+        orden = (LineaAsiento.fecha, LineaAsiento.id)
+        diferencia = func.coalesce(LineaAsiento.debe, 0) - func.coalesce(LineaAsiento.haber, 0)
+        saldo = literal(estado['saldo'], Numeric(18, 2)) + func.sum(diferencia).over(order_by=orden)
+
+        query = (
+            session.query(
+                LineaAsiento.id,
+                LineaAsiento.fecha,
+                AsientoContable.numero,
+                AsientoContable.descripcion,
+                LineaAsiento.descripcion.label('linea_descripcion'),
+                LineaAsiento.debe,
+                LineaAsiento.haber,
+                saldo.label('saldo'),
+            )
+            .join(AsientoContable, AsientoContable.id == LineaAsiento.asiento_id)
+            .filter(LineaAsiento.cuenta_id == cuenta['id'])
+        )
+        if inicio is not None:
+            query = query.filter(LineaAsiento.fecha >= inicio)
+        if fin is not None:
+            query = query.filter(LineaAsiento.fecha < fin)
+        if estado['linea_id'] is not None:
+            query = query.filter(tuple_(*orden) > tuple_(estado['fecha'], estado['linea_id']))
+
+        return [
+            {
+                'tipo': 'movimiento',
+                'cuenta': cuenta,
+                'id': fila.id,
+                'fecha': fila.fecha,
+                'numero': fila.numero,
+                'descripcion': (f"{fila.descripcion} - {fila.linea_descripcion}"
+                                if fila.linea_descripcion else fila.descripcion),
+                'debe': fila.debe or 0,
+                'haber': fila.haber or 0,
+                'saldo': fila.saldo,
+            }
+            for fila in query.order_by(*orden).limit(limite)
+        ]
+
+    @staticmethod
+    def _estado_cuenta(indice):
+        return {'indice': indice, 'fecha': None, 'linea_id': None, 'saldo': None}
+
+    @staticmethod
+    def _resumen_vacio():
+        return {'saldo_inicial': 0, 'total_debe': 0, 'total_haber': 0,
+                'saldo_final': 0, 'movimientos': 0}
@@ -0,0 +1,130 @@
+import os
+import sys
+from sqlalchemy.orm import Session
+from sqlalchemy import update, func
+from sqlalchemy.dialects.postgresql import insert
+from datetime import datetime, date
+
+# Agregar el directorio raíz al path para imports absolutos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from models import AsientoContable, NumeracionAsiento, ContadorAsiento
+    MODELS_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Modelos no disponibles: {e}")
+    MODELS_AVAILABLE = False
+
+# Formato por defecto para los años sin fila en numeracion_asientos
+NUMERACION_POR_DEFECTO = {'prefijo': 'AS', 'reinicio': 'diario', 'digitos': 3}
+
+
+class NumberingService:
+    """
+    Numeración correlativa de asientos con un contador por serie.
+    El número se asigna al insertar el asiento, en su misma transacción: el
+    UPDATE del contador bloquea sólo esa fila hasta el commit, así que no hay
+    números repetidos entre usuarios ni huecos si el asiento se descarta
+    """
+
+    def __init__(self):
+        pass
+
+    def obtener_formato(self, session: Session, anio: int) -> dict:
+        """Formato de numeración del año fiscal (o el formato por defecto)"""
+        formato = session.get(NumeracionAsiento, anio) if MODELS_AVAILABLE else None
+        if formato is None:
+            return dict(NUMERACION_POR_DEFECTO)
+        return {'prefijo': formato.prefijo, 'reinicio': formato.reinicio, 'digitos': formato.digitos}
+
+    def configurar_anio(self, session: Session, anio: int, prefijo: str = 'AS',
+                        reinicio: str = 'diario', digitos: int = 3) -> tuple[bool, str]:
+        """Define el formato de numeración de un año fiscal"""
+        try:
+            if not MODELS_AVAILABLE:
+                return False, "Modelos no disponibles"
+            if reinicio not in ('diario', 'anual'):
+                return False, "❌ El reinicio debe ser 'diario' o 'anual'"
+
+            valores = {'anio': anio, 'prefijo': prefijo, 'reinicio': reinicio, 'digitos': digitos}
+            upsert = insert(NumeracionAsiento).values(**valores)
+            session.execute(upsert.on_conflict_do_update(index_elements=[NumeracionAsiento.anio], set_=valores))
+            session.commit()
+            return True, f"✅ Numeración {anio}: {self._formatear(valores, date(anio, 1, 1), 1)}"
+
+        except Exception as e:
+            session.rollback()
+            return False, f"❌ Error al configurar numeración: {str(e)}"
+
+    def asignar_numero(self, session: Session, fecha) -> str:
+        """
+        Reserva el siguiente número para un asiento con esa fecha. Debe llamarse
+        en la transacción que inserta el asiento: el contador queda bloqueado
+        hasta el commit o el rollback
+        """
+        return self.asignar_numeros(session, fecha, 1)[0]
+
+    def asignar_numeros(self, session: Session, fecha, cantidad: int) -> list:
+        """
+        Reserva 'cantidad' números consecutivos de la serie de esa fecha con un
+        solo UPDATE del contador (anulaciones e importaciones por lote)
+        """
+        formato = self.obtener_formato(session, fecha.year)
+        serie = self._serie(formato, fecha)
+
+        numeros = []
+        while len(numeros) < cantidad:
+            faltan = cantidad - len(numeros)
+            ultimo = session.execute(
+                update(ContadorAsiento)
+                .where(ContadorAsiento.serie == serie)
+                .values(ultimo=ContadorAsiento.ultimo + faltan)
+                .returning(ContadorAsiento.ultimo)
+            ).scalar()
+            if ultimo is None:
+                # Primera vez que se usa la serie: parte de los números ya cargados con ese formato
+                ultimo = session.execute(
+                    insert(ContadorAsiento)
+                    .values(serie=serie, ultimo=self._ultimo_existente(session, serie) + faltan)
+                    .on_conflict_do_nothing(index_elements=[ContadorAsiento.serie])
+                    .returning(ContadorAsiento.ultimo)
+                ).scalar()
+            if ultimo is None:
+                # Otra transacción creó la serie al mismo tiempo: se incrementa su fila
+                continue
+            bloque = [self._formatear(formato, fecha, n) for n in range(ultimo - faltan + 1, ultimo + 1)]
+            # Los números cargados a mano con el mismo formato se saltan (ya están usados)
+            usados = {numero for (numero,) in session.query(AsientoContable.numero)
+                      .filter(AsientoContable.numero.in_(bloque))}
+            numeros.extend(numero for numero in bloque if numero not in usados)
+        return numeros
+
+    def generar_numero_asiento(self, session: Session, fecha=None) -> str:
+        """Próximo número de la serie, sólo para mostrarlo (no lo reserva)"""
+        fecha = fecha or datetime.now()
+        formato = self.obtener_formato(session, fecha.year)
+        if not MODELS_AVAILABLE:
+            return self._formatear(formato, fecha, 1)
+        serie = self._serie(formato, fecha)
+        ultimo = session.query(ContadorAsiento.ultimo).filter(ContadorAsiento.serie == serie).scalar()
+        if ultimo is None:
+            ultimo = self._ultimo_existente(session, serie)
+        return self._formatear(formato, fecha, ultimo + 1)
+
+    def _ultimo_existente(self, session, serie):
+        """Mayor correlativo ya usado en la serie (sólo al crear su contador)"""
+        sufijo = func.substr(AsientoContable.numero, len(serie) + 2)
+        ultimo = session.query(func.max(func.cast(sufijo, ContadorAsiento.ultimo.type))).filter(
+            AsientoContable.numero.like(f"{serie}-%"),
+            sufijo.op('~')(r'^\d+$')
+        ).scalar()
+        return ultimo or 0
+
+    @staticmethod
+    def _serie(formato, fecha):
+        if formato['reinicio'] == 'anual':
+            return f"{formato['prefijo']}-{fecha.year}"
+        return f"{formato['prefijo']}-{fecha.strftime('%Y%m%d')}"
+
+    def _formatear(self, formato, fecha, correlativo):
+        return f"{self._serie(formato, fecha)}-{correlativo:0{formato['digitos']}d}"
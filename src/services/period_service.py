@@ -0,0 +1,226 @@
+import os
+import sys
+from sqlalchemy.orm import Session
+from sqlalchemy import select, insert, delete, literal
+from datetime import datetime, date, timedelta
+from calendar import monthrange
+
+# Agregar el directorio raíz al path para imports absolutos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from models import PeriodoContable, SaldoCierre, SaldoSnapshot, AuditLog
+    from services.account_balance_service import AccountBalanceService
+    MODELS_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Modelos no disponibles: {e}")
+    MODELS_AVAILABLE = False
+
+
+class PeriodService:
+    """
+    Cierre de periodos fiscales.
+    Cerrar un periodo guarda el snapshot de saldos al día siguiente de su fin y
+    bloquea toda fecha hasta ese día: así el snapshot no vuelve a cambiar y los
+    reportes sólo recorren el periodo abierto. Los cierres son consecutivos
+    """
+
+    def __init__(self):
+        self.saldos = AccountBalanceService() if MODELS_AVAILABLE else None
+
+    def ultimo_cierre(self, session: Session):
+        """Último periodo cerrado (o None), leído del índice parcial de cierres"""
+        if not MODELS_AVAILABLE:
+            return None
+        return (
+            session.query(PeriodoContable)
+            .filter(PeriodoContable.cerrado.is_(True))
+            .order_by(PeriodoContable.fecha_fin.desc())
+            .first()
+        )
+
+    def validar_fecha_abierta(self, session: Session, fecha) -> tuple[bool, str]:
+        """Rechaza fechas que caen en un periodo cerrado (o antes de él)"""
+        return self.validar_contra_cierre(self.ultimo_cierre(session), fecha)
+
+    @staticmethod
+    def validar_contra_cierre(cierre, fecha) -> tuple[bool, str]:
+        """Como validar_fecha_abierta con el último cierre ya leído (validaciones por lote)"""
+        if cierre is None:
+            return True, ""
+        if isinstance(fecha, datetime):
+            fecha = fecha.date()
+        if fecha <= cierre.fecha_fin:
+            return False, (f"❌ El periodo está cerrado hasta el {cierre.fecha_fin.strftime('%d/%m/%Y')}: "
+                           f"no se pueden registrar ni eliminar asientos del {fecha.strftime('%d/%m/%Y')}")
+        return True, ""
+
+    def cerrar_periodo(self, session: Session, fecha_inicio: date, fecha_fin: date,
+                       usuario_id: int = None) -> tuple[bool, str]:
+        """
+        Cierra el periodo [fecha_inicio, fecha_fin] (meses completos) y guarda
+        el snapshot de saldos al día siguiente de fecha_fin
+        """
+        try:
+            if not MODELS_AVAILABLE:
+                return False, "Modelos no disponibles"
+
+            if isinstance(fecha_inicio, datetime):
+                fecha_inicio = fecha_inicio.date()
+            if isinstance(fecha_fin, datetime):
+                fecha_fin = fecha_fin.date()
+            if fecha_inicio.day != 1 or fecha_fin.day != monthrange(fecha_fin.year, fecha_fin.month)[1]:
+                return False, "❌ El periodo debe empezar el primer día y terminar el último día de un mes"
+            if fecha_fin < fecha_inicio:
+                return False, "❌ La fecha final es anterior a la inicial"
+
+            # Bloquea los saldos mientras se toma el snapshot: un asiento en curso
+            # termina antes o espera al cierre y entonces ve el periodo cerrado
+            session.connection().exec_driver_sql(
+                "LOCK TABLE saldos_cuenta IN SHARE ROW EXCLUSIVE MODE"
+            )
+
+            cierre = self.ultimo_cierre(session)
+            if cierre is not None and fecha_inicio != cierre.fecha_fin + timedelta(days=1):
+                siguiente = cierre.fecha_fin + timedelta(days=1)
+                # Suelta el LOCK: si no, la sesión bloquea todo registro de asientos
+                session.rollback()
+                return False, f"❌ El próximo periodo a cerrar empieza el {siguiente.strftime('%d/%m/%Y')}"
+
+            periodo = session.query(PeriodoContable).filter_by(fecha_inicio=fecha_inicio).first()
+            if periodo is None:
+                periodo = PeriodoContable(fecha_inicio=fecha_inicio)
+                session.add(periodo)
+            periodo.fecha_fin = fecha_fin
+            periodo.cerrado = True
+            periodo.cerrado_en = datetime.now()
+            periodo.cerrado_por = usuario_id
+
+            # Un snapshot provisional al mismo corte sigue siendo válido: nada lo invalidó
+            corte = fecha_fin + timedelta(days=1)
+            if not self.saldos.existe_snapshot(session, corte):
+                self.saldos.insertar_snapshot(session, corte)
+
+            # Copia que no depende de la caché: volver a cerrar la reemplaza
+            session.flush()
+            session.execute(delete(SaldoCierre).where(SaldoCierre.periodo_id == periodo.id))
+            session.execute(insert(SaldoCierre).from_select(
+                ['periodo_id', 'cuenta_id', 'total_debe', 'total_haber'],
+                select(literal(periodo.id), SaldoSnapshot.cuenta_id, SaldoSnapshot.total_debe, SaldoSnapshot.total_haber)
+                .where(SaldoSnapshot.fecha_corte == corte)
+            ))
+            session.add(AuditLog(
+                usuario_id=usuario_id,
+                accion="CERRAR_PERIODO",
+                tabla_afectada="periodos_contables",
+                registro_id=periodo.id,
+                detalles=f"Periodo {fecha_inicio.strftime('%d/%m/%Y')} - {fecha_fin.strftime('%d/%m/%Y')} cerrado"
+            ))
+
+            session.commit()
+            return True, (f"✅ Periodo {fecha_inicio.strftime('%d/%m/%Y')} - "
+                          f"{fecha_fin.strftime('%d/%m/%Y')} cerrado")
+
+        except Exception as e:
+            session.rollback()
+            return False, f"❌ Error al cerrar periodo: {str(e)}"
+
+    def reabrir_periodo(self, session: Session, usuario_id: int = None) -> tuple[bool, str]:
+        """
+        Reabre el último periodo cerrado. Su snapshot en saldos_snapshot queda
+        como provisional (el primer asiento con fecha anterior al corte lo
+        descarta); los saldos del cierre quedan en saldos_cierre
+        """
+        try:
+            if not MODELS_AVAILABLE:
+                return False, "Modelos no disponibles"
+
+            periodo = self.ultimo_cierre(session)
+            if periodo is None:
+                return False, "❌ No hay periodos cerrados"
+
+            periodo.cerrado = False
+            periodo.cerrado_en = None
+            periodo.cerrado_por = None
+            session.add(AuditLog(
+                usuario_id=usuario_id,
+                accion="REABRIR_PERIODO",
+                tabla_afectada="periodos_contables",
+                registro_id=periodo.id,
+                detalles=(f"Periodo {periodo.fecha_inicio.strftime('%d/%m/%Y')} - "
+                          f"{periodo.fecha_fin.strftime('%d/%m/%Y')} reabierto")
+            ))
+
+            session.commit()
+            return True, (f"✅ Periodo {periodo.fecha_inicio.strftime('%d/%m/%Y')} - "
+                          f"{periodo.fecha_fin.strftime('%d/%m/%Y')} reabierto")
+
+        except Exception as e:
+            session.rollback()
+            return False, f"❌ Error al reabrir periodo: {str(e)}"
+
+    def obtener_saldos_cierre(self, session: Session, periodo_id: int) -> dict:
+        """Saldos guardados al cerrar el periodo: {cuenta_id: (debe, haber)}"""
+        try:
+            if not MODELS_AVAILABLE:
+                return {}
+
+            return {
+                fila.cuenta_id: (fila.total_debe, fila.total_haber)
+                for fila in session.query(SaldoCierre).filter(SaldoCierre.periodo_id == periodo_id)
+            }
+
+        except Exception as e:
+            print(f"❌ Error obteniendo saldos de cierre: {e}")
+            return {}
+
+    def obtener_periodos(self, session: Session) -> list:
+        """Periodos registrados, del más reciente al más antiguo"""
+        try:
+            if not MODELS_AVAILABLE:
+                return []
+
+            return [
+                {'id': p.id, 'fecha_inicio': p.fecha_inicio, 'fecha_fin': p.fecha_fin,
+                 'cerrado': p.cerrado, 'cerrado_en': p.cerrado_en}
+                for p in session.query(PeriodoContable).order_by(PeriodoContable.fecha_inicio.desc())
+            ]
+
+        except Exception as e:
+            print(f"❌ Error obteniendo periodos: {e}")
+            return []
+
+
+def main():
+    """Uso: python src/services/period_service.py [--cerrar AAAA-MM-01 AAAA-MM-DD | --reabrir]"""
+    from models import init_db, get_session, dispose_engine
+
+    init_db()
+    session = get_session()
+    service = PeriodService()
+    try:
+        argumentos = sys.argv[1:]
+        if '--cerrar' in argumentos:
+            i = argumentos.index('--cerrar')
+            fecha_inicio = datetime.strptime(argumentos[i + 1], '%Y-%m-%d').date()
+            fecha_fin = datetime.strptime(argumentos[i + 2], '%Y-%m-%d').date()
+            ok, mensaje = service.cerrar_periodo(session, fecha_inicio, fecha_fin)
+            print(mensaje)
+            return 0 if ok else 1
+
+        if '--reabrir' in argumentos:
+            ok, mensaje = service.reabrir_periodo(session)
+            print(mensaje)
+            return 0 if ok else 1
+
+        for p in service.obtener_periodos(session):
+            estado = "🔒 cerrado" if p['cerrado'] else "🔓 abierto"
+            print(f"   {p['fecha_inicio'].strftime('%d/%m/%Y')} - {p['fecha_fin'].strftime('%d/%m/%Y')}  {estado}")
+        return 0
+    finally:
+        session.close()
+        dispose_engine()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
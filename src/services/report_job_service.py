@@ -0,0 +1,202 @@
+import os
+import sys
+import queue
+import shutil
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, date, time, timedelta
+
+# Agregar el directorio raíz al path para imports absolutos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Reportes que sabe generar el pool: tipo -> (método de ExportService, extensión).
+# Un reporte nuevo (balance, mayor) se suma con un método que reciba
+# (session, ruta, fecha_inicio, fecha_fin, progreso=..., **opciones)
+TIPOS_REPORTE = {
+    'excel': ('exportar_excel', '.xlsx'),
+    'csv': ('exportar_csv', '.csv'),
+    'pdf': ('exportar_pdf', '.pdf'),
+    'parquet': ('exportar_columnar', '.parquet'),
+    'arrow': ('exportar_columnar', '.arrow'),
+}
+# Datasets que ya se particionan por mes y llevan una sola marca incremental
+TIPOS_DATASET = {'parquet', 'arrow'}
+# Cada cuánto se revisan avisos de progreso y cancelación (segundos)
+INTERVALO_AVISOS = 0.2
+
+
+def dividir_por_mes(fecha_inicio: date, fecha_fin: date) -> list:
+    """
+    Tramos (inicio, fin) de un mes cada uno. Los fines intermedios son el
+    último instante del mes, así una línea con hora del último día no se
+    pierde entre dos tramos
+    """
+    if isinstance(fecha_inicio, datetime):
+        fecha_inicio = fecha_inicio.date()
+    tramos = []
+    inicio = fecha_inicio
+    while True:
+        siguiente = date(inicio.year + inicio.month // 12, inicio.month % 12 + 1, 1)
+        fin_mes = datetime.combine(siguiente, time.min) - timedelta(microseconds=1)
+        if fin_mes >= (fecha_fin if isinstance(fecha_fin, datetime) else datetime.combine(fecha_fin, time.max)):
+            tramos.append((inicio, fecha_fin))
+            return tramos
+        tramos.append((inicio, fin_mes))
+        inicio = siguiente
+
+
+def _ejecutar_parte(indice, metodo, ruta, fecha_inicio, fecha_fin, opciones, avisos, cancelado):
+    """Corre en un proceso del pool, con su propio engine y su propia sesión"""
+    from models import get_session, dispose_engine
+    from services.export_service import ExportService
+
+    def progreso(hechas, total):
+        if cancelado.is_set():
+            raise InterruptedError("Reporte cancelado")
+        avisos.put((indice, hechas, total))
+
+    session = get_session()
+    try:
+        return getattr(ExportService(), metodo)(session, ruta, fecha_inicio, fecha_fin,
+                                                progreso=progreso, **opciones)
+    finally:
+        session.close()
+        dispose_engine()
+
+
+class ReportJobService:
+    """
+    Genera reportes en un pool de procesos: fuera del proceso de la GUI y, si
+    se dividen por mes, con un tramo por núcleo. Las partes de un CSV se unen
+    en un solo archivo; Excel y PDF divididos dan un archivo por mes.
+    El avance de todas las partes se suma en un solo callback progreso
+    """
+
+    def __init__(self, procesos: int = None):
+        self.procesos = procesos or os.cpu_count() or 1
+
+    def generar(self, tipo: str, ruta: str, fecha_inicio: date = None, fecha_fin: date = None,
+                por_mes: bool = False, opciones: dict = None, progreso=None) -> dict:
+        """
+        Genera el reporte 'tipo' (ver TIPOS_REPORTE) en ruta. Con por_mes
+        (requiere ambas fechas) cada mes va a un proceso. progreso(hechas,
+        total) puede lanzar una excepción para cancelar: se avisa a los
+        procesos, que cortan en su siguiente lote, y se borran las partes.
+        Devuelve {'archivos', 'filas'}
+        """
+        metodo, extension = TIPOS_REPORTE[tipo]
+        if por_mes and tipo in TIPOS_DATASET:
+            raise ValueError(f"El dataset {tipo} ya se particiona por mes: se genera en un solo proceso")
+        opciones = dict(opciones or {})
+        tramos = dividir_por_mes(fecha_inicio, fecha_fin) if por_mes else [(fecha_inicio, fecha_fin)]
+
+        base, sufijo = self._separar_extension(ruta, extension)
+        unir = tipo == 'csv' and len(tramos) > 1
+        if len(tramos) == 1:
+            rutas = [ruta]
+        elif unir:
+            rutas = [f"{base}.parte{i}{sufijo}" for i in range(len(tramos))]
+        else:
+            rutas = [f"{base}_{inicio.strftime('%Y-%m')}{sufijo}" for inicio, _ in tramos]
+
+        # spawn: los procesos no heredan los hilos de Qt ni las conexiones del pool
+        contexto = multiprocessing.get_context('spawn')
+        filas = 0
+        with contexto.Manager() as manager:
+            avisos = manager.Queue()
+            cancelado = manager.Event()
+            avance = {}
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.procesos, len(tramos)),
+                                         mp_context=contexto) as pool:
+                    pendientes = set()
+                    for i, ((inicio, fin), ruta_parte) in enumerate(zip(tramos, rutas)):
+                        opciones_parte = dict(opciones)
+                        if unir:
+                            # Sólo la primera parte lleva encabezado: las demás se concatenan
+                            opciones_parte['encabezado'] = i == 0
+                        pendientes.add(pool.submit(_ejecutar_parte, i, metodo, ruta_parte, inicio, fin,
+                                                   opciones_parte, avisos, cancelado))
+                    try:
+                        while pendientes:
+                            terminados, pendientes = wait(pendientes, timeout=INTERVALO_AVISOS,
+                                                          return_when=FIRST_COMPLETED)
+                            for futuro in terminados:
+                                filas += futuro.result()
+                            self._leer_avisos(avisos, avance)
+                            if progreso:
+                                # También sin avisos (0, 0): así se puede cancelar antes del primer lote
+                                progreso(sum(h for h, _ in avance.values()),
+                                         sum(t for _, t in avance.values()))
+                    except BaseException:
+                        # Cancelación o error de una parte: las demás cortan en su siguiente lote
+                        cancelado.set()
+                        pool.shutdown(wait=True, cancel_futures=True)
+                        raise
+            except BaseException:
+                self._borrar(rutas + [ruta] if unir else rutas)
+                raise
+
+        if unir:
+            self._unir(rutas, ruta)
+            rutas = [ruta]
+        return {'archivos': rutas, 'filas': filas}
+
+    @staticmethod
+    def _leer_avisos(avisos, avance):
+        while True:
+            try:
+                indice, hechas, total = avisos.get_nowait()
+            except queue.Empty:
+                return
+            avance[indice] = (hechas, total)
+
+    @staticmethod
+    def _unir(partes, ruta):
+        """Concatena las partes byte a byte (también vale para gzip: miembros sucesivos)"""
+        with open(ruta, 'wb') as destino:
+            for parte in partes:
+                with open(parte, 'rb') as origen:
+                    shutil.copyfileobj(origen, destino, 1024 * 1024)
+                os.remove(parte)
+
+    @staticmethod
+    def _borrar(rutas):
+        for ruta in rutas:
+            try:
+                os.remove(ruta)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _separar_extension(ruta, extension):
+        """('libro', '.csv.gz') para libro.csv.gz; la extensión del tipo si falta"""
+        for sufijo in (extension + '.gz', extension):
+            if ruta.lower().endswith(sufijo):
+                return ruta[:-len(sufijo)], ruta[-len(sufijo):]
+        return ruta, extension
+
+
+def main():
+    """Uso: python src/services/report_job_service.py excel|csv|pdf|parquet|arrow archivo AAAA-MM-DD AAAA-MM-DD [--por-mes]"""
+    argumentos = sys.argv[1:]
+    if len(argumentos) < 4 or argumentos[0] not in TIPOS_REPORTE:
+        print(main.__doc__)
+        return 1
+
+    tipo, ruta = argumentos[0], argumentos[1]
+    fecha_inicio = datetime.strptime(argumentos[2], '%Y-%m-%d').date()
+    fecha_fin = datetime.strptime(argumentos[3], '%Y-%m-%d').date()
+    inicio = datetime.now()
+    resultado = ReportJobService().generar(
+        tipo, ruta, fecha_inicio, fecha_fin, por_mes='--por-mes' in argumentos,
+        progreso=lambda hechas, total: print(f"   {hechas}/{total} líneas", end='\r'))
+    segundos = (datetime.now() - inicio).total_seconds()
+    print(f"\n✅ {resultado['filas']} líneas en {len(resultado['archivos'])} archivo(s), {segundos:.1f} s")
+    for archivo in resultado['archivos']:
+        print(f"   {archivo}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
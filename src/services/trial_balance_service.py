@@ -0,0 +1,170 @@
+import os
+import sys
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import select, func, case, or_, and_, union_all
+from datetime import datetime, time
+
+# Agregar el directorio raíz al path para imports absolutos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from models import LineaAsiento, CuentaContable, SaldoCuenta
+    from services.account_balance_service import limites_periodo, meses_completos
+    MODELS_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Modelos no disponibles: {e}")
+    MODELS_AVAILABLE = False
+
+
+class TrialBalanceService:
+    """
+    Balance de Comprobación de sumas y saldos.
+    Los meses completos del periodo se toman de saldos_cuenta y sólo los días
+    sueltos de los extremos se suman desde las líneas; las cuentas padre
+    acumulan a sus subcuentas (1 → 1.1 → 1.1.2) por rango de ruta
+    """
+
+    def __init__(self):
+        pass
+
+    def obtener_balance_comprobacion(self, session: Session, fecha_inicio: datetime = None,
+                                     fecha_fin: datetime = None) -> dict:
+        """
+        Devuelve {'cuentas': [...], 'totales': {...}, 'periodo': {...}}.
+        Cada cuenta trae sumas_debe/sumas_haber (propias más subcuentas),
+        saldo_deudor/saldo_acreedor, nivel y es_grupo
+        """
+        try:
+            if not MODELS_AVAILABLE:
+                return self._balance_vacio(fecha_inicio, fecha_fin)
+
+            movimientos = self._movimientos_por_cuenta(fecha_inicio, fecha_fin)
+
+            padre = aliased(CuentaContable)
+            hija = aliased(CuentaContable)
+            propia = hija.id == padre.id
+            debe = func.coalesce(movimientos.c.debe, 0)
+            haber = func.coalesce(movimientos.c.haber, 0)
+
+            consulta = (
+                select(
+                    padre.id, padre.codigo, padre.nombre, padre.tipo, padre.nivel,
+                    func.coalesce(func.sum(debe), 0).label('sumas_debe'),
+                    func.coalesce(func.sum(haber), 0).label('sumas_haber'),
+                    func.coalesce(func.sum(case((propia, debe), else_=0)), 0).label('propio_debe'),
+                    func.coalesce(func.sum(case((propia, haber), else_=0)), 0).label('propio_haber'),
+                    (func.count(hija.id) > 1).label('es_grupo'),
+                )
+                .select_from(padre)
+                .join(hija, CuentaContable.en_subarbol(padre.ruta, hija.ruta))
+                .outerjoin(movimientos, movimientos.c.cuenta_id == hija.id)
+                .group_by(padre.id)
+                .order_by(padre.ruta)
+            )
+
+            cuentas = []
+            total_debe = total_haber = 0
+            for fila in session.execute(consulta):
+                saldo = fila.sumas_debe - fila.sumas_haber
+                cuentas.append({
+                    'id': fila.id,
+                    'codigo': fila.codigo,
+                    'nombre': fila.nombre,
+                    'tipo': fila.tipo,
+                    'nivel': fila.nivel,
+                    'es_grupo': fila.es_grupo,
+                    'sumas_debe': fila.sumas_debe,
+                    'sumas_haber': fila.sumas_haber,
+                    'saldo_deudor': saldo if saldo > 0 else 0,
+                    'saldo_acreedor': -saldo if saldo < 0 else 0,
+                })
+                # Los totales usan sólo los movimientos propios: sin contar dos veces a los padres
+                total_debe += fila.propio_debe
+                total_haber += fila.propio_haber
+
+            return {
+                'cuentas': cuentas,
+                'totales': {
+                    'sumas_debe': total_debe,
+                    'sumas_haber': total_haber,
+                    'diferencia': total_debe - total_haber,
+                },
+                'periodo': {'inicio': fecha_inicio, 'fin': fecha_fin},
+            }
+
+        except Exception as e:
+            print(f"❌ Error obteniendo balance de comprobación: {e}")
+            return self._balance_vacio(fecha_inicio, fecha_fin)
+
+    def filas_exportacion(self, balance: dict, solo_movimiento: bool = True) -> list:
+        """Filas planas del balance para Excel/PDF/CSV"""
+        filas = []
+        for cuenta in balance['cuentas']:
+            if solo_movimiento and not (cuenta['sumas_debe'] or cuenta['sumas_haber']):
+                continue
+            filas.append({
+                'Código': cuenta['codigo'],
+                'Cuenta': '    ' * (cuenta['nivel'] - 1) + cuenta['nombre'],
+                'Sumas Debe (Bs)': cuenta['sumas_debe'],
+                'Sumas Haber (Bs)': cuenta['sumas_haber'],
+                'Saldo Deudor (Bs)': cuenta['saldo_deudor'],
+                'Saldo Acreedor (Bs)': cuenta['saldo_acreedor'],
+            })
+        return filas
+
+    def _movimientos_por_cuenta(self, fecha_inicio, fecha_fin):
+        """
+        Subconsulta (cuenta_id, debe, haber) del periodo: meses completos desde
+        saldos_cuenta y días sueltos de los extremos desde las líneas
+        """
+        inicio, fin = limites_periodo(fecha_inicio, fecha_fin)
+        desde, hasta = meses_completos(inicio, fin)
+        hay_meses = desde is None or hasta is None or desde < hasta
+
+        partes = []
+        if hay_meses:
+            meses = select(SaldoCuenta.cuenta_id.label('cuenta_id'),
+                           SaldoCuenta.total_debe.label('debe'),
+                           SaldoCuenta.total_haber.label('haber'))
+            if desde is not None:
+                meses = meses.where(SaldoCuenta.periodo >= desde)
+            if hasta is not None:
+                meses = meses.where(SaldoCuenta.periodo < hasta)
+            partes.append(meses)
+
+            extremos = []
+            if inicio is not None and inicio < datetime.combine(desde, time.min):
+                extremos.append(and_(LineaAsiento.fecha >= inicio,
+                                     LineaAsiento.fecha < datetime.combine(desde, time.min)))
+            if fin is not None and datetime.combine(hasta, time.min) < fin:
+                extremos.append(and_(LineaAsiento.fecha >= datetime.combine(hasta, time.min),
+                                     LineaAsiento.fecha < fin))
+            filtro_lineas = or_(*extremos) if extremos else None
+        else:
+            # El periodo cae dentro de un solo mes: todo desde las líneas
+            filtro_lineas = and_(LineaAsiento.fecha >= inicio, LineaAsiento.fecha < fin)
+
+        if filtro_lineas is not None:
+            partes.append(
+                select(LineaAsiento.cuenta_id.label('cuenta_id'),
+                       func.coalesce(LineaAsiento.debe, 0).label('debe'),
+                       func.coalesce(LineaAsiento.haber, 0).label('haber'))
+                .where(filtro_lineas)
+            )
+
+        todas = (union_all(*partes) if len(partes) > 1 else partes[0]).subquery('partes')
+        return (
+            select(todas.c.cuenta_id,
+                   func.sum(todas.c.debe).label('debe'),
+                   func.sum(todas.c.haber).label('haber'))
+            .group_by(todas.c.cuenta_id)
+            .subquery('movimientos')
+        )
+
+    @staticmethod
+    def _balance_vacio(fecha_inicio, fecha_fin):
+        return {
+            'cuentas': [],
+            'totales': {'sumas_debe': 0, 'sumas_haber': 0, 'diferencia': 0},
+            'periodo': {'inicio': fecha_inicio, 'fin': fecha_fin},
+        }
@@ -0,0 +1,494 @@
+import os
+import sys
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                               QPushButton, QTableView, QAbstractItemView,
+                               QHeaderView, QDateEdit, QFrame, QMessageBox,
+                               QFileDialog, QGroupBox, QCheckBox, QTabWidget,
+                               QComboBox, QSpinBox, QTableWidget, QTableWidgetItem)
+from PySide6.QtCore import Qt, QDate
+
+# Agregar el directorio raíz al path para imports absolutos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Pandas no disponible: {e}")
+    PANDAS_AVAILABLE = False
+
+try:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib import colors
+    from reportlab.lib.units import inch
+    REPORTLAB_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ ReportLab no disponible: {e}")
+    REPORTLAB_AVAILABLE = False
+
+try:
+    from services.trial_balance_service import TrialBalanceService
+    from services.financial_statements_service import FinancialStatementsService
+    from services.period_service import PeriodService
+    SERVICES_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Servicios no disponibles: {e}")
+    SERVICES_AVAILABLE = False
+
+from views.table_models import BalanceComprobacionTableModel, EstadoFinancieroTableModel
+from views.estilos import ESTILO_LIBROS
+from views.workers import DbRunner, BusyIndicator
+
+class BalancesView(QWidget):
+    def __init__(self, usuario):
+        super().__init__()
+        self.usuario = usuario
+        self.empresa_nombre = "MISKY CHOCLOS S.A."
+        self.balance = None
+        self.estados = None
+        self.runner = DbRunner(self)
+        self.setup_ui()
+        self.setup_connections()
+        self.consultar_comprobacion()
+
+    def setup_ui(self):
+        """Configura la interfaz de balances"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(15, 15, 15, 15)
+        main_layout.setSpacing(12)
+
+        header_frame = QFrame()
+        header_frame.setObjectName("header_frame")
+        header_layout = QVBoxLayout(header_frame)
+        empresa_label = QLabel(self.empresa_nombre)
+        empresa_label.setObjectName("empresa_label")
+        empresa_label.setAlignment(Qt.AlignCenter)
+        titulo_label = QLabel("⚖️ BALANCES")
+        titulo_label.setObjectName("libro_label")
+        titulo_label.setAlignment(Qt.AlignCenter)
+        header_layout.addWidget(empresa_label)
+        header_layout.addWidget(titulo_label)
+        main_layout.addWidget(header_frame)
+
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.crear_tab_comprobacion(), "Balance de Comprobación")
+        self.tabs.addTab(self.crear_tab_estados(), "Estados Financieros")
+        self.tabs.addTab(self.crear_tab_periodos(), "Cierre de Periodos")
+        main_layout.addWidget(self.tabs, 1)
+
+        self.setStyleSheet(ESTILO_LIBROS)
+
+    def crear_tab_comprobacion(self):
+        """Pestaña del balance de comprobación de sumas y saldos"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+
+        controls_frame = QFrame()
+        controls_frame.setObjectName("controls_frame")
+        controls_layout = QHBoxLayout(controls_frame)
+
+        periodo_group = QGroupBox("🕐 PERIODO")
+        periodo_layout = QHBoxLayout(periodo_group)
+        periodo_layout.addWidget(QLabel("Desde:"))
+        self.date_desde = QDateEdit()
+        self.date_desde.setDate(QDate(QDate.currentDate().year(), 1, 1))
+        self.date_desde.setCalendarPopup(True)
+        periodo_layout.addWidget(self.date_desde)
+        periodo_layout.addWidget(QLabel("Hasta:"))
+        self.date_hasta = QDateEdit()
+        self.date_hasta.setDate(QDate.currentDate())
+        self.date_hasta.setCalendarPopup(True)
+        periodo_layout.addWidget(self.date_hasta)
+
+        self.chk_solo_movimiento = QCheckBox("Sólo cuentas con movimiento")
+        self.chk_solo_movimiento.setChecked(True)
+        periodo_layout.addWidget(self.chk_solo_movimiento)
+
+        self.btn_consultar = QPushButton("🔍 GENERAR")
+        self.btn_consultar.setObjectName("primary_btn")
+        periodo_layout.addWidget(self.btn_consultar)
+
+        controls_layout.addWidget(periodo_group)
+        controls_layout.addStretch()
+        controls_layout.addWidget(BusyIndicator(self.runner, "Calculando..."))
+        layout.addWidget(controls_frame)
+
+        tabla_frame = QFrame()
+        tabla_frame.setObjectName("asientos_frame")
+        tabla_layout = QVBoxLayout(tabla_frame)
+        self.modelo_comprobacion = BalanceComprobacionTableModel(self)
+        self.tabla_comprobacion = QTableView()
+        self.tabla_comprobacion.setModel(self.modelo_comprobacion)
+        header = self.tabla_comprobacion.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        self.tabla_comprobacion.verticalHeader().setDefaultSectionSize(26)
+        self.tabla_comprobacion.setAlternatingRowColors(True)
+        self.tabla_comprobacion.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabla_comprobacion.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        tabla_layout.addWidget(self.tabla_comprobacion)
+        layout.addWidget(tabla_frame, 1)
+
+        toolbar_frame = QFrame()
+        toolbar_frame.setObjectName("toolbar_frame")
+        toolbar_layout = QHBoxLayout(toolbar_frame)
+
+        self.lbl_sumas_debe = QLabel("Sumas Debe: Bs 0.00")
+        self.lbl_sumas_haber = QLabel("Sumas Haber: Bs 0.00")
+        self.lbl_estado = QLabel("Estado: ✅ CUADRADO")
+        for lbl in [self.lbl_sumas_debe, self.lbl_sumas_haber, self.lbl_estado]:
+            lbl.setObjectName("stat_label")
+            toolbar_layout.addWidget(lbl)
+        toolbar_layout.addStretch()
+
+        for texto, slot in [("📊 EXPORTAR EXCEL", self.exportar_excel),
+                            ("📄 EXPORTAR PDF", self.exportar_pdf)]:
+            btn = QPushButton(texto)
+            btn.setObjectName("toolbar_btn")
+            btn.clicked.connect(slot)
+            toolbar_layout.addWidget(btn)
+
+        layout.addWidget(toolbar_frame)
+        return tab
+
+    def crear_tab_estados(self):
+        """Pestaña de Balance General y Estado de Resultados con columnas comparativas"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+
+        controls_frame = QFrame()
+        controls_frame.setObjectName("controls_frame")
+        controls_layout = QHBoxLayout(controls_frame)
+
+        periodo_group = QGroupBox("🕐 PERIODO")
+        periodo_layout = QHBoxLayout(periodo_group)
+        periodo_layout.addWidget(QLabel("Al:"))
+        self.date_estados = QDateEdit()
+        self.date_estados.setDate(QDate.currentDate())
+        self.date_estados.setCalendarPopup(True)
+        periodo_layout.addWidget(self.date_estados)
+
+        self.combo_periodicidad = QComboBox()
+        self.combo_periodicidad.addItem("Anual", "anual")
+        self.combo_periodicidad.addItem("Mensual", "mensual")
+        periodo_layout.addWidget(self.combo_periodicidad)
+
+        periodo_layout.addWidget(QLabel("Comparar con:"))
+        self.spin_comparativos = QSpinBox()
+        self.spin_comparativos.setRange(0, 12)
+        self.spin_comparativos.setValue(1)
+        periodo_layout.addWidget(self.spin_comparativos)
+        periodo_layout.addWidget(QLabel("periodos anteriores"))
+
+        self.btn_estados = QPushButton("🔍 GENERAR")
+        self.btn_estados.setObjectName("primary_btn")
+        periodo_layout.addWidget(self.btn_estados)
+
+        controls_layout.addWidget(periodo_group)
+        controls_layout.addStretch()
+        layout.addWidget(controls_frame)
+
+        self.modelo_balance_general = EstadoFinancieroTableModel(self)
+        self.modelo_resultados = EstadoFinancieroTableModel(self)
+
+        estados_tabs = QTabWidget()
+        for modelo, titulo in [(self.modelo_balance_general, "Balance General"),
+                               (self.modelo_resultados, "Estado de Resultados")]:
+            tabla = QTableView()
+            tabla.setModel(modelo)
+            header = tabla.horizontalHeader()
+            header.setSectionResizeMode(QHeaderView.ResizeToContents)
+            header.setSectionResizeMode(1, QHeaderView.Stretch)
+            tabla.verticalHeader().setDefaultSectionSize(26)
+            tabla.setSelectionBehavior(QAbstractItemView.SelectRows)
+            tabla.setEditTriggers(QAbstractItemView.NoEditTriggers)
+            estados_tabs.addTab(tabla, titulo)
+        layout.addWidget(estados_tabs, 1)
+
+        return tab
+
+    def crear_tab_periodos(self):
+        """Pestaña de cierre y reapertura de periodos fiscales"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+
+        controls_frame = QFrame()
+        controls_frame.setObjectName("controls_frame")
+        controls_layout = QHBoxLayout(controls_frame)
+
+        periodo_group = QGroupBox("🔒 CERRAR PERIODO")
+        periodo_layout = QHBoxLayout(periodo_group)
+        periodo_layout.addWidget(QLabel("Desde:"))
+        self.date_cierre_desde = QDateEdit()
+        self.date_cierre_desde.setDisplayFormat("MM/yyyy")
+        self.date_cierre_desde.setDate(QDate(QDate.currentDate().year() - 1, 1, 1))
+        periodo_layout.addWidget(self.date_cierre_desde)
+        periodo_layout.addWidget(QLabel("Hasta:"))
+        self.date_cierre_hasta = QDateEdit()
+        self.date_cierre_hasta.setDisplayFormat("MM/yyyy")
+        self.date_cierre_hasta.setDate(QDate(QDate.currentDate().year() - 1, 12, 1))
+        periodo_layout.addWidget(self.date_cierre_hasta)
+
+        self.btn_cerrar_periodo = QPushButton("🔒 CERRAR")
+        self.btn_cerrar_periodo.setObjectName("primary_btn")
+        periodo_layout.addWidget(self.btn_cerrar_periodo)
+        self.btn_reabrir_periodo = QPushButton("🔓 REABRIR ÚLTIMO")
+        self.btn_reabrir_periodo.setObjectName("toolbar_btn")
+        periodo_layout.addWidget(self.btn_reabrir_periodo)
+
+        controls_layout.addWidget(periodo_group)
+        controls_layout.addStretch()
+        layout.addWidget(controls_frame)
+
+        self.tabla_periodos = QTableWidget(0, 4)
+        self.tabla_periodos.setHorizontalHeaderLabels(["DESDE", "HASTA", "ESTADO", "CERRADO EL"])
+        self.tabla_periodos.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.tabla_periodos.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabla_periodos.setSelectionBehavior(QAbstractItemView.SelectRows)
+        layout.addWidget(self.tabla_periodos, 1)
+
+        return tab
+
+    def setup_connections(self):
+        """Configura las conexiones de señales"""
+        self.btn_consultar.clicked.connect(self.consultar_comprobacion)
+        self.chk_solo_movimiento.toggled.connect(self.mostrar_comprobacion)
+        self.btn_estados.clicked.connect(self.consultar_estados)
+        self.btn_cerrar_periodo.clicked.connect(self.cerrar_periodo)
+        self.btn_reabrir_periodo.clicked.connect(self.reabrir_periodo)
+        self.tabs.currentChanged.connect(self.pestana_cambiada)
+
+    def consultar_comprobacion(self):
+        """Calcula el balance de comprobación en segundo plano"""
+        if not SERVICES_AVAILABLE:
+            QMessageBox.critical(self, "Error",
+                               "Los servicios contables no están disponibles.\n"
+                               "Verifique la conexión a la base de datos y la configuración.")
+            return
+
+        self.btn_consultar.setEnabled(False)
+        self.runner.ejecutar(
+            TrialBalanceService().obtener_balance_comprobacion,
+            self.date_desde.date().toPython(), self.date_hasta.date().toPython(),
+            al_terminar=self.comprobacion_recibida,
+            al_fallar=self.consulta_fallida
+        )
+
+    def comprobacion_recibida(self, balance):
+        self.btn_consultar.setEnabled(True)
+        self.balance = balance
+        self.mostrar_comprobacion()
+
+    def consulta_fallida(self, mensaje):
+        self.btn_consultar.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Error calculando el balance: {mensaje}")
+
+    def mostrar_comprobacion(self):
+        """Carga el balance en la tabla y actualiza los totales"""
+        if self.balance is None:
+            return
+
+        self.modelo_comprobacion.cargar(self.balance['cuentas'], self.chk_solo_movimiento.isChecked())
+
+        totales = self.balance['totales']
+        self.lbl_sumas_debe.setText(f"Sumas Debe: Bs {totales['sumas_debe']:,.2f}")
+        self.lbl_sumas_haber.setText(f"Sumas Haber: Bs {totales['sumas_haber']:,.2f}")
+        if totales['diferencia'] == 0:
+            self.lbl_estado.setText("Estado: ✅ CUADRADO")
+            self.lbl_estado.setStyleSheet("color: #00FF88; font-weight: bold;")
+        else:
+            self.lbl_estado.setText(f"Estado: ❌ DIFERENCIA Bs {totales['diferencia']:,.2f}")
+            self.lbl_estado.setStyleSheet("color: #FF4444; font-weight: bold;")
+
+    def consultar_estados(self):
+        """Genera Balance General y Estado de Resultados en segundo plano"""
+        if not SERVICES_AVAILABLE:
+            return
+
+        self.btn_estados.setEnabled(False)
+        self.runner.ejecutar(
+            FinancialStatementsService().generar_estados,
+            self.date_estados.date().toPython(),
+            periodicidad=self.combo_periodicidad.currentData(),
+            comparativos=self.spin_comparativos.value(),
+            al_terminar=self.estados_recibidos,
+            al_fallar=self.estados_fallidos
+        )
+
+    def estados_recibidos(self, estados):
+        self.btn_estados.setEnabled(True)
+        self.estados = estados
+        servicio = FinancialStatementsService()
+        periodos = estados['periodos']
+        etiquetas = [p['etiqueta'] for p in periodos]
+
+        balance = estados['balance_general']
+        self.modelo_balance_general.cargar(servicio.filas_estado(balance, periodos, {
+            "RESULTADOS ACUMULADOS": balance['resultado_acumulado'],
+            "TOTAL PASIVO + PATRIMONIO + RESULTADOS": balance['total_pasivo_patrimonio'],
+        }), etiquetas)
+
+        resultados = estados['estado_resultados']
+        self.modelo_resultados.cargar(servicio.filas_estado(resultados, periodos, {
+            "UTILIDAD (PÉRDIDA) DEL PERIODO": resultados['utilidad'],
+        }), etiquetas)
+
+    def estados_fallidos(self, mensaje):
+        self.btn_estados.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Error generando estados financieros: {mensaje}")
+
+    def pestana_cambiada(self, index):
+        if self.tabs.widget(index) is self.tabla_periodos.parentWidget():
+            self.consultar_periodos()
+
+    def consultar_periodos(self):
+        if not SERVICES_AVAILABLE:
+            return
+        self.runner.ejecutar(PeriodService().obtener_periodos,
+                             al_terminar=self.mostrar_periodos,
+                             al_fallar=self.operacion_periodo_fallida)
+
+    def mostrar_periodos(self, periodos):
+        self.tabla_periodos.setRowCount(len(periodos))
+        for fila, periodo in enumerate(periodos):
+            valores = [
+                periodo['fecha_inicio'].strftime('%d/%m/%Y'),
+                periodo['fecha_fin'].strftime('%d/%m/%Y'),
+                "🔒 CERRADO" if periodo['cerrado'] else "🔓 ABIERTO",
+                periodo['cerrado_en'].strftime('%d/%m/%Y %H:%M') if periodo['cerrado_en'] else "",
+            ]
+            for columna, valor in enumerate(valores):
+                self.tabla_periodos.setItem(fila, columna, QTableWidgetItem(valor))
+
+    def cerrar_periodo(self):
+        """Cierra los meses seleccionados: no admitirán más asientos"""
+        if not SERVICES_AVAILABLE:
+            return
+
+        desde = self.date_cierre_desde.date()
+        hasta = self.date_cierre_hasta.date()
+        fecha_inicio = QDate(desde.year(), desde.month(), 1).toPython()
+        fecha_fin = QDate(hasta.year(), hasta.month(), hasta.daysInMonth()).toPython()
+
+        reply = QMessageBox.question(self, "Confirmar Cierre",
+                                     f"¿Cerrar el periodo {fecha_inicio.strftime('%d/%m/%Y')} - "
+                                     f"{fecha_fin.strftime('%d/%m/%Y')}?\n"
+                                     "No se podrán registrar ni eliminar asientos hasta esa fecha.",
+                                     QMessageBox.Yes | QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+
+        self.runner.ejecutar(PeriodService().cerrar_periodo, fecha_inicio, fecha_fin, self.usuario.id,
+                             al_terminar=self.operacion_periodo_terminada,
+                             al_fallar=self.operacion_periodo_fallida)
+
+    def reabrir_periodo(self):
+        if not SERVICES_AVAILABLE:
+            return
+
+        reply = QMessageBox.question(self, "Confirmar Reapertura",
+                                     "¿Reabrir el último periodo cerrado?",
+                                     QMessageBox.Yes | QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+
+        self.runner.ejecutar(PeriodService().reabrir_periodo, self.usuario.id,
+                             al_terminar=self.operacion_periodo_terminada,
+                             al_fallar=self.operacion_periodo_fallida)
+
+    def operacion_periodo_terminada(self, resultado):
+        exito, mensaje = resultado
+        if exito:
+            QMessageBox.information(self, "Éxito", mensaje)
+        else:
+            QMessageBox.warning(self, "Error", mensaje)
+        self.consultar_periodos()
+
+    def operacion_periodo_fallida(self, mensaje):
+        QMessageBox.critical(self, "Error", f"Error en periodos contables: {mensaje}")
+
+    def exportar_excel(self):
+        """Exporta el balance de comprobación a Excel"""
+        if not PANDAS_AVAILABLE:
+            QMessageBox.warning(self, "Error", "Pandas no está disponible para exportación Excel")
+            return
+        if self.balance is None:
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar Balance de Comprobación", "balance_comprobacion.xlsx", "Excel Files (*.xlsx)")
+
+        if file_path:
+            filas = TrialBalanceService().filas_exportacion(self.balance, self.chk_solo_movimiento.isChecked())
+
+            def exportar():
+                pd.DataFrame(filas).to_excel(file_path, index=False, engine='openpyxl')
+
+            self.runner.ejecutar(
+                exportar,
+                con_sesion=False,
+                al_terminar=lambda _: QMessageBox.information(
+                    self, "Éxito", "Balance de comprobación exportado a Excel correctamente"),
+                al_fallar=lambda mensaje: QMessageBox.critical(
+                    self, "Error", f"Error exportando a Excel: {mensaje}")
+            )
+
+    def exportar_pdf(self):
+        """Exporta el balance de comprobación a PDF"""
+        if not REPORTLAB_AVAILABLE:
+            QMessageBox.warning(self, "Error", "ReportLab no está disponible para exportación PDF")
+            return
+        if self.balance is None:
+            return
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar Balance de Comprobación", "balance_comprobacion.pdf", "PDF Files (*.pdf)")
+
+        if file_path:
+            balance = self.balance
+            filas = TrialBalanceService().filas_exportacion(balance, self.chk_solo_movimiento.isChecked())
+            self.runner.ejecutar(
+                self.generar_pdf_comprobacion, file_path, balance, filas,
+                con_sesion=False,
+                al_terminar=lambda _: QMessageBox.information(
+                    self, "Éxito", "Balance de comprobación exportado a PDF correctamente"),
+                al_fallar=lambda mensaje: QMessageBox.critical(
+                    self, "Error", f"Error exportando a PDF: {mensaje}")
+            )
+
+    def generar_pdf_comprobacion(self, file_path, balance, filas):
+        """Genera el PDF del balance de comprobación (fuera del hilo de la GUI)"""
+        doc = SimpleDocTemplate(file_path, pagesize=A4, topMargin=0.5*inch)
+        styles = getSampleStyleSheet()
+        periodo = balance['periodo']
+        elements = [
+            Paragraph(self.empresa_nombre, styles['Heading1']),
+            Paragraph("BALANCE DE COMPROBACIÓN DE SUMAS Y SALDOS", styles['Heading2']),
+            Paragraph(f"Período: {periodo['inicio'].strftime('%d/%m/%Y')} - "
+                      f"{periodo['fin'].strftime('%d/%m/%Y')}", styles['Normal']),
+            Spacer(1, 20),
+        ]
+
+        table_data = [['Código', 'Cuenta', 'Sumas Debe', 'Sumas Haber', 'Saldo Deudor', 'Saldo Acreedor']]
+        for fila in filas:
+            table_data.append([fila['Código'], fila['Cuenta']] +
+                              [f"{v:,.2f}" for v in list(fila.values())[2:]])
+        totales = balance['totales']
+        table_data.append(['', 'TOTALES', f"{totales['sumas_debe']:,.2f}",
+                           f"{totales['sumas_haber']:,.2f}", '', ''])
+
+        table = Table(table_data, repeatRows=1,
+                      colWidths=[0.7*inch, 2.3*inch, 1*inch, 1*inch, 1*inch, 1*inch])
+        table.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1E293B')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#00E5FF')),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('ALIGN', (2, 1), (-1, -1), 'RIGHT'),
+            ('FONTSIZE', (0, 0), (-1, -1), 8),
+            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#334155'))
+        ]))
+        elements.append(table)
+        doc.build(elements)
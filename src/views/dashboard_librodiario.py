@@ -21,9 +21,13 @@ except ImportError as e:
 
 try:
     from services.journal_service import JournalService
-    from models import get_session
+    from services.export_service import (ExportService, COLUMNAS_DETALLE_ASIENTOS,
+                                         OPENPYXL_AVAILABLE, PYARROW_AVAILABLE)
+    from services.report_job_service import ReportJobService
+    SERVICES_AVAILABLE = True
 except ImportError as e:
     print(f"❌ Error importando servicios: {e}")
+    SERVICES_AVAILABLE = False
     # Fallback para cuando los servicios no estén disponibles
     class JournalService:
         def __init__(self):
@@ -41,15 +45,14 @@ except ImportError as e:
                 'periodo': 'Sin datos'
             }
 
+from views.workers import DbRunner, BusyIndicator
+
 class DashboardLibroDiario(QWidget):
     def __init__(self, usuario=None):
         super().__init__()
         self.usuario = usuario
         self.journal_service = JournalService()
-        try:
-            self.session = get_session()
-        except:
-            self.session = None
+        self.runner = DbRunner(self)
             
         self.setup_ui()
         self.load_data()
@@ -213,14 +216,20 @@ class DashboardLibroDiario(QWidget):
         export_excel_btn.setObjectName("export_btn")
         export_excel_btn.clicked.connect(self.export_excel)
         
+        export_parquet_btn = QPushButton("🧮 Exportar Parquet")
+        export_parquet_btn.setObjectName("export_btn")
+        export_parquet_btn.clicked.connect(self.export_parquet)
+        
         controls_layout.addWidget(date_label)
         controls_layout.addWidget(self.start_date)
         controls_layout.addWidget(QLabel("a"))
         controls_layout.addWidget(self.end_date)
         controls_layout.addWidget(filter_btn)
         controls_layout.addStretch()
+        controls_layout.addWidget(BusyIndicator(self.runner, "Cargando..."))
         controls_layout.addWidget(export_csv_btn)
         controls_layout.addWidget(export_excel_btn)
+        controls_layout.addWidget(export_parquet_btn)
         
         return controls_layout
         
@@ -358,20 +367,33 @@ class DashboardLibroDiario(QWidget):
         """
         self.setStyleSheet(style)
         
-    def load_data(self):
-        """Carga los datos iniciales"""
-        try:
-            # Obtener datos del servicio
-            asientos = self.journal_service.obtener_asientos(self.session)
-            self.update_stats(asientos)
-            self.update_table(asientos)
+    def ejecutar_consulta(self, funcion, *args, al_terminar, al_fallar, **kwargs):
+        """Ejecuta una consulta del servicio en segundo plano (o directo si no hay base de datos)"""
+        if SERVICES_AVAILABLE:
+            self.runner.ejecutar(funcion, *args, al_terminar=al_terminar, al_fallar=al_fallar, **kwargs)
+        else:
+            al_terminar(funcion(None, *args, **kwargs))
             
-            if PANDAS_AVAILABLE:
-                self.update_charts(asientos)
+    def load_data(self):
+        """Carga los datos iniciales: sólo el periodo de los filtros (último mes), no todo el libro"""
+        self.ejecutar_consulta(
+            self.journal_service.obtener_asientos,
+            fecha_inicio=self.start_date.date().toPython(), fecha_fin=self.end_date.date().toPython(),
+            al_terminar=self.mostrar_datos,
+            al_fallar=self.carga_fallida
+        )
+        
+    def mostrar_datos(self, asientos):
+        """Actualiza tarjetas, tabla y gráficos con los asientos recibidos"""
+        self.update_stats(asientos)
+        self.update_table(asientos)
+        
+        if PANDAS_AVAILABLE:
+            self.update_charts(asientos)
             
-        except Exception as e:
-            print(f"❌ Error al cargar datos: {e}")
-            QMessageBox.warning(self, "Error", f"Error al cargar datos: {str(e)}")
+    def carga_fallida(self, mensaje):
+        print(f"❌ Error al cargar datos: {mensaje}")
+        QMessageBox.warning(self, "Error", f"Error al cargar datos: {mensaje}")
             
     def update_stats(self, asientos):
         """Actualiza las estadísticas"""
@@ -421,10 +443,11 @@ class DashboardLibroDiario(QWidget):
                 total_debe = sum(linea['debe'] for linea in asiento['lineas'])
                 total_haber = sum(linea['haber'] for linea in asiento['lineas'])
                 
+                # El gráfico trabaja en float; los importes exactos quedan en el servicio
                 data.append({
                     'fecha': fecha,
-                    'debe': total_debe,
-                    'haber': total_haber
+                    'debe': float(total_debe),
+                    'haber': float(total_haber)
                 })
             
             df = pd.DataFrame(data)
@@ -469,89 +492,109 @@ class DashboardLibroDiario(QWidget):
         
     def apply_filters(self):
         """Aplica los filtros de fecha"""
-        try:
-            start_date = self.start_date.date().toPython()
-            end_date = self.end_date.date().toPython()
+        start_date = self.start_date.date().toPython()
+        end_date = self.end_date.date().toPython()
+        
+        # Obtener asientos filtrados
+        self.ejecutar_consulta(
+            self.journal_service.obtener_asientos,
+            fecha_inicio=start_date, fecha_fin=end_date,
+            al_terminar=self.mostrar_datos,
+            al_fallar=lambda mensaje: QMessageBox.warning(
+                self, "Error", f"Error al aplicar filtros: {mensaje}")
+        )
             
-            # Obtener asientos filtrados
-            asientos = self.journal_service.obtener_asientos(
-                self.session, fecha_inicio=start_date, fecha_fin=end_date)
-                
-            self.update_stats(asientos)
-            self.update_table(asientos)
+    def export_csv(self):
+        """Exporta los datos a CSV"""
+        if not SERVICES_AVAILABLE:
+            QMessageBox.warning(self, "Error", "Servicios no disponibles para exportación CSV")
+            return
             
-            if PANDAS_AVAILABLE:
-                self.update_charts(asientos)
+        file_path, filtro = QFileDialog.getSaveFileName(
+            self, "Exportar CSV", "libro_diario.csv",
+            "CSV Files (*.csv);;CSV comprimido (*.csv.gz)")
             
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Error al aplicar filtros: {str(e)}")
+        if file_path:
+            if filtro.startswith("CSV comprimido") and not file_path.lower().endswith('.gz'):
+                file_path += '.gz'
+            start_date = self.start_date.date().toPython()
+            end_date = self.end_date.date().toPython()
             
-    def export_csv(self):
-        """Exporta los datos a CSV"""
-        try:
-            if not PANDAS_AVAILABLE:
-                QMessageBox.warning(self, "Error", "Pandas no está disponible para exportación CSV")
-                return
-                
-            file_path, _ = QFileDialog.getSaveFileName(
-                self, "Exportar CSV", "libro_diario.csv", "CSV Files (*.csv)")
-                
-            if file_path:
-                asientos = self.journal_service.obtener_asientos(self.session)
-                
-                # Preparar datos para exportación
-                data = []
-                for asiento in asientos:
-                    for linea in asiento['lineas']:
-                        data.append({
-                            'numero_asiento': asiento['numero'],
-                            'fecha': asiento['fecha'],
-                            'descripcion_asiento': asiento['descripcion'],
-                            'cuenta_codigo': linea['cuenta_codigo'],
-                            'cuenta_nombre': linea['cuenta_nombre'],
-                            'debe': linea['debe'],
-                            'haber': linea['haber'],
-                            'descripcion_linea': linea['descripcion']
-                        })
-                
-                df = pd.DataFrame(data)
-                df.to_csv(file_path, index=False, encoding='utf-8')
-                QMessageBox.information(self, "Éxito", "Datos exportados a CSV correctamente")
-                
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Error al exportar CSV: {str(e)}")
+            # Un COPY ... TO STDOUT por mes en paralelo; las partes se unen en file_path
+            self.runner.ejecutar(
+                ReportJobService().generar, 'csv', file_path, start_date, end_date,
+                por_mes=True,
+                con_sesion=False,
+                con_progreso=True,
+                al_terminar=lambda _: QMessageBox.information(
+                    self, "Éxito", "Datos exportados a CSV correctamente"),
+                al_fallar=lambda mensaje: QMessageBox.warning(
+                    self, "Error", f"Error al exportar CSV: {mensaje}")
+            )
             
     def export_excel(self):
         """Exporta los datos a Excel"""
-        try:
-            if not PANDAS_AVAILABLE:
-                QMessageBox.warning(self, "Error", "Pandas no está disponible para exportación Excel")
-                return
-                
-            file_path, _ = QFileDialog.getSaveFileName(
-                self, "Exportar Excel", "libro_diario.xlsx", "Excel Files (*.xlsx)")
-                
-            if file_path:
-                asientos = self.journal_service.obtener_asientos(self.session)
-                
-                # Preparar datos para exportación
-                data = []
-                for asiento in asientos:
-                    for linea in asiento['lineas']:
-                        data.append({
-                            'Número Asiento': asiento['numero'],
-                            'Fecha': asiento['fecha'],
-                            'Descripción Asiento': asiento['descripcion'],
-                            'Código Cuenta': linea['cuenta_codigo'],
-                            'Nombre Cuenta': linea['cuenta_nombre'],
-                            'Débito (Bs)': linea['debe'],
-                            'Crédito (Bs)': linea['haber'],
-                            'Descripción Línea': linea['descripcion']
-                        })
-                
-                df = pd.DataFrame(data)
-                df.to_excel(file_path, index=False, engine='openpyxl')
-                QMessageBox.information(self, "Éxito", "Datos exportados a Excel correctamente")
+        if not SERVICES_AVAILABLE or not OPENPYXL_AVAILABLE:
+            QMessageBox.warning(self, "Error", "openpyxl no está disponible para exportación Excel")
+            return
+            
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar Excel", "libro_diario.xlsx", "Excel Files (*.xlsx)")
+            
+        if file_path:
+            # Exportación en streaming compartida con el libro diario, en un proceso aparte
+            self.runner.ejecutar(
+                ReportJobService().generar, 'excel', file_path,
+                opciones={'columnas': COLUMNAS_DETALLE_ASIENTOS, 'titulo_hoja': "Asientos"},
+                con_sesion=False,
+                con_progreso=True,
+                al_terminar=lambda _: QMessageBox.information(
+                    self, "Éxito", "Datos exportados a Excel correctamente"),
+                al_fallar=lambda mensaje: QMessageBox.warning(
+                    self, "Error", f"Error al exportar Excel: {mensaje}")
+            )
+            
+    def export_parquet(self):
+        """Exporta los asientos como dataset Parquet/Arrow para análisis"""
+        if not SERVICES_AVAILABLE or not PYARROW_AVAILABLE:
+            QMessageBox.warning(self, "Error", "pyarrow no está disponible para exportación Parquet")
+            return
+            
+        dir_path, filtro = QFileDialog.getSaveFileName(
+            self, "Exportar dataset", "libro_diario.parquet",
+            "Parquet (*.parquet);;Arrow IPC (*.arrow)")
+            
+        if dir_path:
+            formato = 'arrow' if filtro.startswith("Arrow") else 'parquet'
+            extension = '.' + formato
+            if not dir_path.lower().endswith(extension):
+                dir_path += extension
+            
+            start_date = self.start_date.date().toPython()
+            end_date = self.end_date.date().toPython()
+            
+            # Con una exportación previa del mismo formato y periodo se ofrece agregar sólo lo nuevo
+            incremental = False
+            marca = ExportService.leer_marca_columnar(dir_path)
+            if (marca and marca.get('formato') == formato
+                    and marca.get('fecha_inicio') == start_date.isoformat()
+                    and marca.get('fecha_fin') == end_date.isoformat()):
+                respuesta = QMessageBox.question(
+                    self, "Exportación incremental",
+                    f"El dataset ya tiene asientos hasta el id {marca['asiento_id']}.\n"
+                    "¿Agregar sólo los asientos nuevos? (No: reescribir con el filtro actual)",
+                    QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel)
+                if respuesta == QMessageBox.Cancel:
+                    return
+                incremental = respuesta == QMessageBox.Yes
                 
-        except Exception as e:
-            QMessageBox.warning(self, "Error", f"Error al exportar Excel: {str(e)}")
\ No newline at end of file
+            self.runner.ejecutar(
+                ReportJobService().generar, formato, dir_path, start_date, end_date,
+                opciones={'formato': formato, 'incremental': incremental},
+                con_sesion=False,
+                con_progreso=True,
+                al_terminar=lambda resultado: QMessageBox.information(
+                    self, "Éxito", f"{resultado['filas']} líneas exportadas a {dir_path}"),
+                al_fallar=lambda mensaje: QMessageBox.warning(
+                    self, "Error", f"Error al exportar Parquet: {mensaje}")
+            )
@@ -0,0 +1,217 @@
+# Hoja de estilos compartida por las vistas de libros contables
+ESTILO_LIBROS = """
+/* Estilos generales */
+QWidget {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+        stop:0 #0A0E17, stop:0.5 #13182B, stop:1 #0A0E17);
+    color: #E6EEF3;
+    font-family: 'Segoe UI', 'Arial', sans-serif;
+}
+
+/* Encabezado principal */
+#header_frame {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 rgba(0, 229, 255, 0.1),
+        stop:0.5 rgba(179, 0, 158, 0.1),
+        stop:1 rgba(0, 229, 255, 0.1));
+    border: 1px solid rgba(0, 229, 255, 0.3);
+    border-radius: 12px;
+    padding: 15px;
+    margin: 5px;
+}
+
+#empresa_label {
+    color: #00E5FF;
+    font-size: 18px;
+    font-weight: 800;
+    letter-spacing: 1px;
+    text-shadow: 0 0 10px rgba(0, 229, 255, 0.5);
+}
+
+#libro_label {
+    color: #B3009E;
+    font-size: 24px;
+    font-weight: 900;
+    letter-spacing: 2px;
+    text-shadow: 0 0 15px rgba(179, 0, 158, 0.6);
+}
+
+#info_label {
+    color: #94A3B8;
+    font-size: 11px;
+    font-weight: 600;
+    letter-spacing: 0.5px;
+}
+
+/* Controles */
+#controls_frame {
+    background: rgba(30, 41, 59, 0.7);
+    border: 1px solid rgba(255, 0, 128, 0.2);
+    border-radius: 8px;
+    padding: 10px;
+}
+
+QGroupBox {
+    color: #00E5FF;
+    font-weight: bold;
+    font-size: 12px;
+    border: 1px solid rgba(0, 229, 255, 0.3);
+    border-radius: 6px;
+    margin-top: 10px;
+    padding-top: 10px;
+}
+
+QGroupBox::title {
+    subcontrol-origin: margin;
+    left: 10px;
+    padding: 0 5px 0 5px;
+    color: #00E5FF;
+}
+
+/* Botones principales */
+#primary_btn {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 #00E5FF, stop:1 #B3009E);
+    color: white;
+    border: none;
+    border-radius: 6px;
+    padding: 8px 15px;
+    font-weight: bold;
+    font-size: 11px;
+    min-height: 25px;
+}
+
+#primary_btn:hover {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 #00F7FF, stop:1 #FF0080);
+    border: 1px solid rgba(0, 229, 255, 0.6);
+}
+
+#secondary_btn {
+    background: rgba(30, 41, 59, 0.8);
+    color: #00E5FF;
+    border: 1px solid rgba(0, 229, 255, 0.4);
+    border-radius: 4px;
+    padding: 6px 12px;
+    font-weight: bold;
+    font-size: 10px;
+}
+
+#secondary_btn:hover {
+    background: rgba(0, 229, 255, 0.1);
+    border: 1px solid rgba(0, 229, 255, 0.8);
+}
+
+/* Tabla de asientos */
+#asientos_frame {
+    background: rgba(15, 23, 42, 0.9);
+    border: 1px solid rgba(0, 229, 255, 0.2);
+    border-radius: 8px;
+}
+
+QTableView {
+    background: rgba(26, 29, 33, 0.8);
+    border: 1px solid rgba(0, 229, 255, 0.3);
+    border-radius: 6px;
+    gridline-color: rgba(0, 229, 255, 0.2);
+    font-size: 10px;
+}
+
+QTableView::item {
+    padding: 4px;
+    border-bottom: 1px solid rgba(0, 229, 255, 0.1);
+}
+
+QTableView::item:selected {
+    background: rgba(0, 229, 255, 0.3);
+}
+
+QHeaderView::section {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 #00E5FF, stop:1 #B3009E);
+    color: white;
+    font-weight: bold;
+    padding: 6px;
+    border: none;
+    font-size: 9px;
+}
+
+/* Resumen y totales */
+#resumen_frame {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+        stop:0 rgba(0, 229, 255, 0.05),
+        stop:1 rgba(255, 0, 128, 0.05));
+    border: 1px solid rgba(0, 229, 255, 0.2);
+    border-radius: 8px;
+    padding: 10px;
+}
+
+#resumen_title {
+    color: #00E5FF;
+    font-size: 14px;
+    font-weight: bold;
+    margin-bottom: 8px;
+}
+
+#stat_label, #total_label {
+    font-size: 11px;
+    font-weight: 600;
+    padding: 4px 8px;
+    border-radius: 4px;
+    background: rgba(30, 41, 59, 0.5);
+}
+
+#stat_label {
+    color: #E6EEF3;
+}
+
+#total_label {
+    color: #00E5FF;
+}
+
+/* Barra de herramientas */
+#toolbar_frame {
+    background: rgba(30, 41, 59, 0.8);
+    border: 1px solid rgba(255, 0, 128, 0.2);
+    border-radius: 8px;
+    padding: 8px;
+}
+
+#toolbar_btn {
+    background: rgba(0, 229, 255, 0.1);
+    color: #00E5FF;
+    border: 1px solid rgba(0, 229, 255, 0.4);
+    border-radius: 5px;
+    padding: 6px 12px;
+    font-weight: bold;
+    font-size: 10px;
+    min-height: 25px;
+}
+
+#toolbar_btn:hover {
+    background: rgba(0, 229, 255, 0.2);
+    border: 1px solid rgba(0, 229, 255, 0.8);
+}
+
+#contador_label {
+    color: #B3009E;
+    font-size: 10px;
+    font-weight: bold;
+    font-family: 'Courier New';
+}
+
+/* Controles de formulario */
+QDateEdit, QSpinBox, QComboBox {
+    background: rgba(26, 29, 33, 0.8);
+    border: 1px solid rgba(0, 229, 255, 0.4);
+    border-radius: 4px;
+    padding: 4px;
+    color: #E6EEF3;
+    font-size: 10px;
+}
+
+QDateEdit::drop-down, QComboBox::drop-down, QSpinBox::up-button, QSpinBox::down-button {
+    background: rgba(0, 229, 255, 0.2);
+    border: none;
+}
+"""
@@ -6,7 +6,8 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout,
                              QPushButton, QLineEdit, QDateEdit, QComboBox,
                              QTextEdit, QHeaderView, QMessageBox, QTabWidget,
                              QSplitter, QFormLayout, QDoubleSpinBox, QToolBar,
-                             QAbstractItemView, QSizePolicy)
+                             QAbstractItemView, QSizePolicy, QDialog, QFileDialog,
+                             QCheckBox, QDialogButtonBox)
 from PySide6.QtCore import Qt, QDate, Signal
 from PySide6.QtGui import QAction
 
@@ -16,17 +17,124 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 # Importación absoluta corregida
 try:
     from services.journal_service import JournalService
-    from models import get_session, init_db
+    from services.import_service import ImportService
+    from models import get_session, a_monto
     SERVICES_AVAILABLE = True
 except ImportError as e:
     print(f"❌ Servicios no disponibles: {e}")
     SERVICES_AVAILABLE = False
 
+from views.workers import DbRunner, BusyIndicator
+
+class ImportacionDialog(QDialog):
+    """Importación masiva de asientos desde CSV/Excel con reporte de errores por fila"""
+    importado = Signal()
+
+    def __init__(self, usuario, runner, parent=None):
+        super().__init__(parent)
+        self.usuario = usuario
+        self.runner = runner
+        self.errores = []
+        self.setWindowTitle("📥 Importar Asientos")
+        self.resize(760, 480)
+        self.setup_ui()
+
+    def setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        ayuda = QLabel("Una fila por línea de asiento con las columnas: numero, fecha, descripcion, "
+                       "cuenta (código), debe, haber y detalle (opcional).\n"
+                       "Los asientos con alguna fila errónea no se importan.")
+        ayuda.setWordWrap(True)
+        layout.addWidget(ayuda)
+
+        archivo_layout = QHBoxLayout()
+        self.txt_archivo = QLineEdit()
+        self.txt_archivo.setReadOnly(True)
+        self.txt_archivo.setPlaceholderText("Archivo CSV o Excel...")
+        btn_buscar = QPushButton("📂 Buscar")
+        btn_buscar.clicked.connect(self.seleccionar_archivo)
+        archivo_layout.addWidget(self.txt_archivo, 1)
+        archivo_layout.addWidget(btn_buscar)
+        layout.addLayout(archivo_layout)
+
+        self.chk_solo_validar = QCheckBox("Sólo validar (no importar)")
+        layout.addWidget(self.chk_solo_validar)
+
+        self.lbl_resultado = QLabel("")
+        self.lbl_resultado.setWordWrap(True)
+        layout.addWidget(self.lbl_resultado)
+
+        self.tabla_errores = QTableWidget(0, 3)
+        self.tabla_errores.setHorizontalHeaderLabels(["FILA", "ASIENTO", "ERROR"])
+        self.tabla_errores.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.tabla_errores.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.tabla_errores, 1)
+
+        botones = QDialogButtonBox()
+        self.btn_importar = botones.addButton("📥 IMPORTAR", QDialogButtonBox.ActionRole)
+        self.btn_guardar_errores = botones.addButton("💾 GUARDAR ERRORES", QDialogButtonBox.ActionRole)
+        self.btn_guardar_errores.setEnabled(False)
+        btn_cerrar = botones.addButton("Cerrar", QDialogButtonBox.RejectRole)
+        self.btn_importar.clicked.connect(self.importar)
+        self.btn_guardar_errores.clicked.connect(self.guardar_errores)
+        btn_cerrar.clicked.connect(self.reject)
+        layout.addWidget(botones)
+
+    def seleccionar_archivo(self):
+        ruta, _ = QFileDialog.getOpenFileName(self, "Importar asientos", "",
+                                              "Archivos de datos (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)")
+        if ruta:
+            self.txt_archivo.setText(ruta)
+
+    def importar(self):
+        ruta = self.txt_archivo.text()
+        if not ruta:
+            QMessageBox.warning(self, "Advertencia", "❌ Selecciona un archivo para importar")
+            return
+
+        self.btn_importar.setEnabled(False)
+        self.lbl_resultado.setText("⏳ Procesando archivo...")
+        self.runner.ejecutar(
+            ImportService().importar, ruta, self.usuario.id,
+            solo_validar=self.chk_solo_validar.isChecked(),
+            al_terminar=self.importacion_terminada,
+            al_fallar=self.importacion_fallida
+        )
+
+    def importacion_terminada(self, resultado):
+        self.btn_importar.setEnabled(True)
+        self.errores = resultado['errores']
+        self.lbl_resultado.setText(f"{resultado['mensaje']}\nFilas leídas: {resultado['filas']}")
+
+        self.tabla_errores.setRowCount(len(self.errores))
+        for fila, error in enumerate(self.errores):
+            self.tabla_errores.setItem(fila, 0, QTableWidgetItem(str(error['fila'])))
+            self.tabla_errores.setItem(fila, 1, QTableWidgetItem(error['numero']))
+            self.tabla_errores.setItem(fila, 2, QTableWidgetItem(error['error']))
+        self.btn_guardar_errores.setEnabled(bool(self.errores))
+
+        if resultado['asientos']:
+            self.importado.emit()
+
+    def importacion_fallida(self, mensaje):
+        self.btn_importar.setEnabled(True)
+        self.lbl_resultado.setText("")
+        QMessageBox.critical(self, "❌ Error", f"Error importando asientos: {mensaje}")
+
+    def guardar_errores(self):
+        ruta, _ = QFileDialog.getSaveFileName(self, "Guardar reporte de errores",
+                                              "errores_importacion.csv", "CSV (*.csv)")
+        if ruta:
+            ImportService.guardar_errores(self.errores, ruta)
+            QMessageBox.information(self, "✅ Éxito", f"Reporte guardado en:\n{ruta}")
+
 class JournalView(QWidget):
     def __init__(self, usuario):
         super().__init__()
         self.usuario = usuario
         self.lineas_asiento = []
+        self.runner = DbRunner(self)
         self.setup_ui()
         self.conectar_señales()
         
@@ -77,12 +185,20 @@ class JournalView(QWidget):
         self.btn_guardar = QAction("💾 GUARDAR", self)
         self.btn_cancelar = QAction("❌ CANCELAR", self)
         self.btn_eliminar = QAction("🗑️ ELIMINAR", self)
+        self.btn_anular = QAction("🚫 ANULAR", self)
+        self.btn_importar = QAction("📥 IMPORTAR", self)
         
         toolbar.addAction(self.btn_nuevo)
         toolbar.addAction(self.btn_guardar)
         toolbar.addAction(self.btn_cancelar)
         toolbar.addSeparator()
         toolbar.addAction(self.btn_eliminar)
+        toolbar.addAction(self.btn_anular)
+        toolbar.addAction(self.btn_importar)
+        
+        # Indicador de operaciones en curso contra la base de datos
+        toolbar.addSeparator()
+        toolbar.addWidget(BusyIndicator(self.runner, "Consultando..."))
         
         return toolbar
     
@@ -522,6 +638,8 @@ class JournalView(QWidget):
         self.btn_guardar.triggered.connect(self.guardar_asiento)
         self.btn_cancelar.triggered.connect(self.cancelar_edicion)
         self.btn_eliminar.triggered.connect(self.eliminar_asiento)
+        self.btn_anular.triggered.connect(self.anular_asiento)
+        self.btn_importar.triggered.connect(self.importar_asientos)
         self.btn_agregar_linea.clicked.connect(self.agregar_linea)
         self.btn_filtrar.clicked.connect(self.filtrar_asientos)
         
@@ -536,28 +654,6 @@ class JournalView(QWidget):
         if not SERVICES_AVAILABLE:
             QMessageBox.critical(self, "Error", "Servicios no disponibles. Verifique la configuración.")
             return
-            
-        try:
-            engine = init_db()
-            session = get_session(engine)
-            
-            journal_service = JournalService()
-            numero_asiento = journal_service.generar_numero_asiento(session)
-            self.txt_numero.setText(numero_asiento)
-            
-            # Cargar cuentas contables básicas
-            cuentas = journal_service.obtener_cuentas_contables(session)
-            self.combo_cuenta.clear()
-            for cuenta in cuentas:
-                self.combo_cuenta.addItem(f"{cuenta['codigo']} - {cuenta['nombre']}", cuenta['id'])
-            
-            session.close()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error cargando datos: {str(e)}")
-            # Generar número de asiento básico si hay error
-            fecha_actual = datetime.now()
-            self.txt_numero.setText(f"AS-{fecha_actual.strftime('%Y%m%d')}-001")
         
         # Limpiar formulario
         self.date_fecha.setDate(QDate.currentDate())
@@ -565,6 +661,29 @@ class JournalView(QWidget):
         self.tabla_lineas.setRowCount(0)
         self.lineas_asiento = []
         self.calcular_totales()
+        
+        def cargar_formulario(session):
+            journal_service = JournalService()
+            return (journal_service.generar_numero_asiento(session),
+                    journal_service.obtener_cuentas_contables(session))
+        
+        self.runner.ejecutar(cargar_formulario,
+                             al_terminar=self.formulario_cargado,
+                             al_fallar=self.formulario_fallido)
+    
+    def formulario_cargado(self, resultado):
+        numero_asiento, cuentas = resultado
+        self.txt_numero.setText(numero_asiento)
+        
+        # Cargar cuentas contables básicas
+        self.combo_cuenta.clear()
+        for cuenta in cuentas:
+            self.combo_cuenta.addItem(f"{cuenta['codigo']} - {cuenta['nombre']}", cuenta['id'])
+    
+    def formulario_fallido(self, mensaje):
+        QMessageBox.critical(self, "Error", f"Error cargando datos: {mensaje}")
+        # El número se asigna igual al guardar
+        self.txt_numero.clear()
     
     def agregar_linea(self):
         if self.combo_cuenta.currentIndex() == -1:
@@ -578,8 +697,8 @@ class JournalView(QWidget):
         cuenta_text = self.combo_cuenta.currentText()
         cuenta_id = self.combo_cuenta.currentData()
         descripcion = self.txt_linea_desc.text()
-        debe = self.spin_debe.value()
-        haber = self.spin_haber.value()
+        debe = a_monto(self.spin_debe.value())
+        haber = a_monto(self.spin_haber.value())
         
         # Agregar a la lista temporal
         self.lineas_asiento.append({
@@ -645,7 +764,7 @@ class JournalView(QWidget):
         self.lbl_diferencia.setText(f"DIFERENCIA: Bs {diferencia:,.2f}")
         
         # Resaltar si no está cuadrado
-        if abs(diferencia) > 0.01:
+        if diferencia != 0:
             self.lbl_diferencia.setStyleSheet("""
                 font-size: 12px;
                 font-weight: bold;
@@ -670,10 +789,6 @@ class JournalView(QWidget):
             return
 
         # Validaciones básicas
-        if not self.txt_numero.text().strip():
-            QMessageBox.warning(self, "Advertencia", "❌ El número de asiento es requerido")
-            return
-        
         if len(self.lineas_asiento) == 0:
             QMessageBox.warning(self, "Advertencia", "❌ Debe agregar al menos una línea al asiento")
             return
@@ -682,7 +797,7 @@ class JournalView(QWidget):
         total_debe = sum(linea['debe'] for linea in self.lineas_asiento)
         total_haber = sum(linea['haber'] for linea in self.lineas_asiento)
         
-        if abs(total_debe - total_haber) > 0.01:
+        if total_debe != total_haber:
             QMessageBox.warning(self, "Advertencia", 
                               f"❌ El asiento no está cuadrado!\n"
                               f"Debe: Bs {total_debe:,.2f}\n"
@@ -690,47 +805,47 @@ class JournalView(QWidget):
                               f"Diferencia: Bs {total_debe - total_haber:,.2f}")
             return
         
-        try:
-            engine = init_db()
-            session = get_session(engine)
-            
-            journal_service = JournalService()
-            
-            # Preparar líneas para el servicio
-            lineas_servicio = []
-            for linea in self.lineas_asiento:
-                lineas_servicio.append({
-                    'cuenta_id': linea['cuenta_id'],
-                    'debe': linea['debe'],
-                    'haber': linea['haber'],
-                    'descripcion': linea['descripcion']
-                })
-            
-            # Obtener descripción
-            descripcion = self.txt_descripcion.toPlainText()
-            
-            # Crear asiento
-            fecha = self.date_fecha.date().toPython()
-            success, mensaje = journal_service.crear_asiento(
-                session=session,
-                numero=self.txt_numero.text(),
-                fecha=fecha,
-                descripcion=descripcion,
-                lineas=lineas_servicio,
-                usuario_id=self.usuario.id
-            )
-            
-            if success:
-                QMessageBox.information(self, "✅ Éxito", mensaje)
-                self.nuevo_asiento()
-                self.filtrar_asientos()
-            else:
-                QMessageBox.critical(self, "❌ Error", mensaje)
-            
-            session.close()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "❌ Error", f"Error guardando asiento: {str(e)}")
+        # Preparar líneas para el servicio
+        lineas_servicio = []
+        for linea in self.lineas_asiento:
+            lineas_servicio.append({
+                'cuenta_id': linea['cuenta_id'],
+                'debe': linea['debe'],
+                'haber': linea['haber'],
+                'descripcion': linea['descripcion']
+            })
+        
+        # Obtener descripción
+        descripcion = self.txt_descripcion.toPlainText()
+        
+        # Crear asiento en segundo plano
+        fecha = self.date_fecha.date().toPython()
+        self.btn_guardar.setEnabled(False)
+        self.runner.ejecutar(
+            JournalService().crear_asiento,
+            numero=None,  # El número definitivo se asigna al insertar
+            fecha=fecha,
+            descripcion=descripcion,
+            lineas=lineas_servicio,
+            usuario_id=self.usuario.id,
+            al_terminar=self.asiento_guardado,
+            al_fallar=self.asiento_no_guardado
+        )
+    
+    def asiento_guardado(self, resultado):
+        self.btn_guardar.setEnabled(True)
+        success, mensaje = resultado
+        
+        if success:
+            QMessageBox.information(self, "✅ Éxito", mensaje)
+            self.nuevo_asiento()
+            self.filtrar_asientos()
+        else:
+            QMessageBox.critical(self, "❌ Error", mensaje)
+    
+    def asiento_no_guardado(self, mensaje):
+        self.btn_guardar.setEnabled(True)
+        QMessageBox.critical(self, "❌ Error", f"Error guardando asiento: {mensaje}")
     
     def eliminar_asiento(self):
         current_row = self.tabla_asientos.currentRow()
@@ -749,71 +864,90 @@ class JournalView(QWidget):
                 QMessageBox.critical(self, "Error", "Servicios no disponibles. Verifique la configuración.")
                 return
                 
-            try:
-                engine = init_db()
-                session = get_session(engine)
-                
-                journal_service = JournalService()
-                
-                # Buscar el asiento por número
-                asientos = journal_service.obtener_asientos(session)
-                asiento_id = None
-                for asiento in asientos:
-                    if asiento['numero'] == numero_asiento:
-                        asiento_id = asiento['id']
-                        break
-                
-                if asiento_id:
-                    success, mensaje = journal_service.eliminar_asiento(
-                        session=session, 
-                        asiento_id=asiento_id, 
-                        usuario_id=self.usuario.id
-                    )
-                    
-                    if success:
-                        QMessageBox.information(self, "✅ Éxito", mensaje)
-                        self.filtrar_asientos()
-                    else:
-                        QMessageBox.critical(self, "❌ Error", mensaje)
-                else:
-                    QMessageBox.warning(self, "Advertencia", "Asiento no encontrado")
-                
-                session.close()
+            self.runner.ejecutar(JournalService().eliminar_asiento_por_numero,
+                                 numero_asiento, self.usuario.id,
+                                 al_terminar=self.asiento_eliminado,
+                                 al_fallar=lambda mensaje: QMessageBox.critical(
+                                     self, "❌ Error", f"Error eliminando asiento: {mensaje}"))
+    
+    def asiento_eliminado(self, resultado):
+        success, mensaje = resultado
+        if success:
+            QMessageBox.information(self, "✅ Éxito", mensaje)
+            self.filtrar_asientos()
+        else:
+            QMessageBox.critical(self, "❌ Error", mensaje)
+    
+    def anular_asiento(self):
+        current_row = self.tabla_asientos.currentRow()
+        if current_row == -1:
+            QMessageBox.warning(self, "Advertencia", "❌ Selecciona un asiento para anular")
+            return
+        
+        numero_asiento = self.tabla_asientos.item(current_row, 0).text()
+        
+        reply = QMessageBox.question(self, "Confirmar Anulación",
+                                   f"¿Anular el asiento {numero_asiento}?\n"
+                                   f"Se registrará un asiento de reversión con fecha de hoy.",
+                                   QMessageBox.Yes | QMessageBox.No)
+        
+        if reply == QMessageBox.Yes:
+            if not SERVICES_AVAILABLE:
+                QMessageBox.critical(self, "Error", "Servicios no disponibles. Verifique la configuración.")
+                return
                 
-            except Exception as e:
-                QMessageBox.critical(self, "❌ Error", f"Error eliminando asiento: {str(e)}")
+            self.runner.ejecutar(JournalService().anular_asiento,
+                                 numero_asiento, self.usuario.id,
+                                 al_terminar=self.asiento_eliminado,
+                                 al_fallar=lambda mensaje: QMessageBox.critical(
+                                     self, "❌ Error", f"Error anulando asiento: {mensaje}"))
+    
+    def importar_asientos(self):
+        if not SERVICES_AVAILABLE:
+            QMessageBox.critical(self, "Error", "Servicios no disponibles. Verifique la configuración.")
+            return
+        
+        dialogo = ImportacionDialog(self.usuario, self.runner, self)
+        dialogo.importado.connect(self.filtrar_asientos)
+        dialogo.exec()
     
     def filtrar_asientos(self):
         if not SERVICES_AVAILABLE:
             QMessageBox.critical(self, "Error", "Servicios no disponibles. Verifique la configuración.")
             return
             
-        try:
-            engine = init_db()
-            session = get_session(engine)
-            
-            journal_service = JournalService()
-            
-            fecha_desde = self.date_desde.date().toPython()
-            fecha_hasta = self.date_hasta.date().toPython()
-            
-            asientos = journal_service.obtener_asientos(session, fecha_desde, fecha_hasta)
-            
-            self.tabla_asientos.setRowCount(len(asientos))
-            
-            for row, asiento in enumerate(asientos):
-                self.tabla_asientos.setItem(row, 0, QTableWidgetItem(asiento['numero']))
-                self.tabla_asientos.setItem(row, 1, QTableWidgetItem(asiento['fecha'].strftime('%d/%m/%Y')))
-                self.tabla_asientos.setItem(row, 2, QTableWidgetItem(asiento['descripcion']))
-                
-                total = sum(linea['debe'] for linea in asiento['lineas'])
-                self.tabla_asientos.setItem(row, 3, QTableWidgetItem(f"Bs {total:,.2f}"))
-                self.tabla_asientos.setItem(row, 4, QTableWidgetItem("✅ ACTIVO"))
-            
-            session.close()
+        fecha_desde = self.date_desde.date().toPython()
+        fecha_hasta = self.date_hasta.date().toPython()
+        
+        self.btn_filtrar.setEnabled(False)
+        self.runner.ejecutar(
+            JournalService().obtener_asientos, fecha_desde, fecha_hasta,
+            al_terminar=self.mostrar_asientos,
+            al_fallar=self.filtrado_fallido
+        )
+    
+    def mostrar_asientos(self, asientos):
+        self.btn_filtrar.setEnabled(True)
+        self.tabla_asientos.setRowCount(len(asientos))
+        
+        for row, asiento in enumerate(asientos):
+            self.tabla_asientos.setItem(row, 0, QTableWidgetItem(asiento['numero']))
+            self.tabla_asientos.setItem(row, 1, QTableWidgetItem(asiento['fecha'].strftime('%d/%m/%Y')))
+            self.tabla_asientos.setItem(row, 2, QTableWidgetItem(asiento['descripcion']))
             
-        except Exception as e:
-            QMessageBox.critical(self, "❌ Error", f"Error cargando asientos: {str(e)}")
+            total = sum(linea['debe'] for linea in asiento['lineas'])
+            self.tabla_asientos.setItem(row, 3, QTableWidgetItem(f"Bs {total:,.2f}"))
+            if asiento.get('anulado'):
+                estado = "🚫 ANULADO"
+            elif asiento.get('reversion_de'):
+                estado = "↩️ REVERSIÓN"
+            else:
+                estado = "✅ ACTIVO"
+            self.tabla_asientos.setItem(row, 4, QTableWidgetItem(estado))
+    
+    def filtrado_fallido(self, mensaje):
+        self.btn_filtrar.setEnabled(True)
+        QMessageBox.critical(self, "❌ Error", f"Error cargando asientos: {mensaje}")
     
     def cancelar_edicion(self):
         reply = QMessageBox.question(self, "Confirmar Cancelación",
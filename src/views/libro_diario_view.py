@@ -2,7 +2,7 @@ import os
 import sys
 from datetime import datetime
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
-                               QPushButton, QTableWidget, QTableWidgetItem,
+                               QPushButton, QTableView, QAbstractItemView,
                                QHeaderView, QDateEdit, QFrame, QMessageBox,
                                QFileDialog, QTextEdit, QComboBox, QLineEdit,
                                QSpinBox, QGroupBox, QFormLayout, QSplitter,
@@ -13,28 +13,20 @@ from PySide6.QtGui import QFont, QPalette, QColor, QLinearGradient
 # Agregar el directorio raíz al path para imports absolutos
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-try:
-    import pandas as pd
-    from reportlab.lib.pagesizes import letter, A4
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib import colors
-    from reportlab.lib.units import inch
-    PANDAS_AVAILABLE = True
-    REPORTLAB_AVAILABLE = True
-except ImportError as e:
-    print(f"❌ Librerías no disponibles: {e}")
-    PANDAS_AVAILABLE = False
-    REPORTLAB_AVAILABLE = False
-
 try:
     from services.journal_service import JournalService
-    from models import get_session, init_db
+    from services.export_service import COLUMNAS_LIBRO_DIARIO, OPENPYXL_AVAILABLE, REPORTLAB_AVAILABLE
+    from services.report_job_service import ReportJobService
+    from models import get_session
     SERVICES_AVAILABLE = True
 except ImportError as e:
     print(f"❌ Servicios no disponibles: {e}")
     SERVICES_AVAILABLE = False
 
+from views.table_models import LibroDiarioTableModel
+from views.estilos import ESTILO_LIBROS
+from views.workers import DbRunner, BusyIndicator
+
 class LibroDiarioView(QWidget):
     def __init__(self, usuario):
         super().__init__()
@@ -42,6 +34,9 @@ class LibroDiarioView(QWidget):
         self.empresa_nombre = "MISKY CHOCLOS S.A."
         self.pagina_actual = 1
         self.asientos_por_pagina = 20
+        self.sincronizar_scroll = True
+        self.pagina_pendiente = None
+        self.runner = DbRunner(self)
         self.setup_ui()
         self.setup_connections()
         self.cargar_datos_iniciales()
@@ -181,27 +176,23 @@ class LibroDiarioView(QWidget):
         asientos_frame.setObjectName("asientos_frame")
         asientos_layout = QVBoxLayout(asientos_frame)
         
-        # Tabla de asientos contables
-        self.tabla_asientos = QTableWidget()
-        self.tabla_asientos.setColumnCount(8)
-        headers = ["FECHA", "N° ASIENTO", "CÓDIGO CUENTA", "NOMBRE CUENTA", 
-                  "DETALLE/GLOBA", "DEBE (Bs)", "HABER (Bs)", "SALDO (Bs)"]
-        self.tabla_asientos.setHorizontalHeaderLabels(headers)
+        # Tabla de asientos contables: vista sobre un modelo virtual con carga incremental
+        self.modelo_asientos = LibroDiarioTableModel(self)
+        self.tabla_asientos = QTableView()
+        self.tabla_asientos.setModel(self.modelo_asientos)
         
-        # Configurar header
+        # Configurar header (anchos fijados al cargar, sin medir todas las filas)
         header = self.tabla_asientos.horizontalHeader()
-        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)  # Fecha
-        header.setSectionResizeMode(1, QHeaderView.ResizeToContents)  # N° Asiento
-        header.setSectionResizeMode(2, QHeaderView.ResizeToContents)  # Código
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.setSectionResizeMode(3, QHeaderView.Stretch)          # Nombre
         header.setSectionResizeMode(4, QHeaderView.Stretch)          # Detalle
-        header.setSectionResizeMode(5, QHeaderView.ResizeToContents) # Debe
-        header.setSectionResizeMode(6, QHeaderView.ResizeToContents) # Haber
-        header.setSectionResizeMode(7, QHeaderView.ResizeToContents) # Saldo
+        self.tabla_asientos.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.tabla_asientos.verticalHeader().setDefaultSectionSize(26)
         
         self.tabla_asientos.setAlternatingRowColors(True)
-        self.tabla_asientos.setSelectionBehavior(QTableWidget.SelectRows)
-        self.tabla_asientos.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tabla_asientos.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabla_asientos.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabla_asientos.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
         
         asientos_layout.addWidget(self.tabla_asientos)
         
@@ -261,6 +252,7 @@ class LibroDiarioView(QWidget):
         acciones = [
             ("🔄 ACTUALIZAR", self.actualizar_datos),
             ("📊 EXPORTAR EXCEL", self.exportar_excel),
+            ("🗂️ EXCEL POR MES", self.exportar_excel_por_mes),
             ("📄 EXPORTAR PDF", self.exportar_pdf),
             ("🎯 IR A REGISTRO", self.ir_a_registro),
             ("🖨️ IMPRIMIR", self.imprimir_reporte)
@@ -274,6 +266,9 @@ class LibroDiarioView(QWidget):
             
         toolbar_layout.addStretch()
         
+        # Indicador de consultas/exportaciones en segundo plano
+        toolbar_layout.addWidget(BusyIndicator(self.runner, "Procesando..."))
+        
         # Contador en tiempo real
         self.lbl_contador = QLabel("🕐 Actualizado: --:--:--")
         self.lbl_contador.setObjectName("contador_label")
@@ -287,6 +282,8 @@ class LibroDiarioView(QWidget):
         self.btn_anterior.clicked.connect(self.pagina_anterior)
         self.btn_siguiente.clicked.connect(self.pagina_siguiente)
         self.spin_pagina.valueChanged.connect(self.cambiar_pagina)
+        self.tabla_asientos.verticalScrollBar().valueChanged.connect(self.actualizar_pagina_visible)
+        self.modelo_asientos.bloque_cargado.connect(self.bloque_cargado)
         
         # Timer para actualización automática
         self.timer = QTimer()
@@ -309,139 +306,87 @@ class LibroDiarioView(QWidget):
         if not SERVICES_AVAILABLE:
             return
             
-        try:
-            engine = init_db()
-            session = get_session(engine)
-            
+        fecha_desde = self.date_desde.date().toPython()
+        fecha_hasta = self.date_hasta.date().toPython()
+        
+        def consultar_periodo(session):
+            # Conteo y totales del periodo: agregados en la base, una vez por filtro
             journal_service = JournalService()
-            
-            fecha_desde = self.date_desde.date().toPython()
-            fecha_hasta = self.date_hasta.date().toPython()
-            
-            # Obtener asientos del periodo
-            self.asientos = journal_service.obtener_asientos(session, fecha_desde, fecha_hasta)
-            
-            # Calcular total de páginas
-            total_asientos = len(self.asientos)
-            self.total_paginas = max(1, (total_asientos + self.asientos_por_pagina - 1) // self.asientos_por_pagina)
-            self.lbl_total_paginas.setText(str(self.total_paginas))
-            self.spin_pagina.setMaximum(self.total_paginas)
-            
-            # Mostrar página actual
-            self.mostrar_pagina_actual()
-            
-            # Actualizar estadísticas
-            self.actualizar_estadisticas()
-            
-            session.close()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error actualizando datos: {str(e)}")
-            
-    def mostrar_pagina_actual(self):
-        """Muestra los asientos de la página actual"""
-        if not hasattr(self, 'asientos'):
-            return
-            
-        inicio = (self.pagina_actual - 1) * self.asientos_por_pagina
-        fin = min(inicio + self.asientos_por_pagina, len(self.asientos))
+            return (journal_service.contar_asientos(session, fecha_desde, fecha_hasta),
+                    journal_service.obtener_estadisticas_generales(session, fecha_desde, fecha_hasta))
+        
+        self.btn_filtrar.setEnabled(False)
+        self.runner.ejecutar(
+            consultar_periodo,
+            al_terminar=lambda resultado: self.periodo_consultado(resultado, fecha_desde, fecha_hasta),
+            al_fallar=self.consulta_fallida
+        )
         
-        asientos_pagina = self.asientos[inicio:fin]
+    def periodo_consultado(self, resultado, fecha_desde, fecha_hasta):
+        """Recibe conteo y totales del periodo y reinicia la tabla"""
+        self.btn_filtrar.setEnabled(True)
+        total_asientos, self.estadisticas_periodo = resultado
         
-        # Limpiar tabla
-        self.tabla_asientos.setRowCount(0)
+        # Calcular total de páginas (bloques de asientos que trae el modelo)
+        self.total_paginas = max(1, (total_asientos + self.asientos_por_pagina - 1) // self.asientos_por_pagina)
+        self.pagina_actual = 1
+        self.pagina_pendiente = None
+        self.lbl_total_paginas.setText(str(self.total_paginas))
+        self.spin_pagina.blockSignals(True)
+        self.spin_pagina.setMaximum(self.total_paginas)
+        self.spin_pagina.setValue(1)
+        self.spin_pagina.blockSignals(False)
         
-        # Llenar tabla con asientos de la página
-        fila_global = 0
-        total_pagina_debe = 0
-        total_pagina_haber = 0
+        # El modelo pide el primer bloque y el resto a medida que se hace scroll
+        self.periodo_cargado = (fecha_desde, fecha_hasta)
+        self.modelo_asientos.reiniciar(self.solicitar_bloque)
         
-        for asiento in asientos_pagina:
-            # Agregar fila para cada línea del asiento
-            for linea in asiento['lineas']:
-                self.tabla_asientos.insertRow(fila_global)
-                
-                # Fecha
-                fecha = asiento['fecha'].strftime('%d/%m/%Y') if hasattr(asiento['fecha'], 'strftime') else asiento['fecha']
-                self.tabla_asientos.setItem(fila_global, 0, QTableWidgetItem(fecha))
-                
-                # Número de asiento
-                self.tabla_asientos.setItem(fila_global, 1, QTableWidgetItem(asiento['numero']))
-                
-                # Código de cuenta
-                self.tabla_asientos.setItem(fila_global, 2, QTableWidgetItem(linea['cuenta_codigo']))
-                
-                # Nombre de cuenta
-                self.tabla_asientos.setItem(fila_global, 3, QTableWidgetItem(linea['cuenta_nombre']))
-                
-                # Detalle/Glosa
-                detalle = f"{asiento['descripcion']} - {linea['descripcion']}" if linea['descripcion'] else asiento['descripcion']
-                self.tabla_asientos.setItem(fila_global, 4, QTableWidgetItem(detalle))
-                
-                # Debe
-                debe = linea['debe']
-                self.tabla_asientos.setItem(fila_global, 5, QTableWidgetItem(f"{debe:,.2f}"))
-                total_pagina_debe += debe
-                
-                # Haber
-                haber = linea['haber']
-                self.tabla_asientos.setItem(fila_global, 6, QTableWidgetItem(f"{haber:,.2f}"))
-                total_pagina_haber += haber
-                
-                # Saldo (acumulado)
-                saldo = debe - haber
-                self.tabla_asientos.setItem(fila_global, 7, QTableWidgetItem(f"{saldo:,.2f}"))
-                
-                # Aplicar estilos según el tipo de movimiento
-                self.aplicar_estilo_fila(fila_global, debe, haber)
-                
-                fila_global += 1
-                
-            # Agregar línea separadora entre asientos
-            if asiento != asientos_pagina[-1]:
-                self.tabla_asientos.insertRow(fila_global)
-                for col in range(8):
-                    item = QTableWidgetItem("─" * 5 if col == 4 else "")
-                    item.setFlags(Qt.NoItemFlags)
-                    self.tabla_asientos.setItem(fila_global, col, item)
-                fila_global += 1
-        
-        # Actualizar totales de página
-        self.lbl_total_pagina_debe.setText(f"Total Página Débito: Bs {total_pagina_debe:,.2f}")
-        self.lbl_total_pagina_haber.setText(f"Total Página Crédito: Bs {total_pagina_haber:,.2f}")
+        # Actualizar estadísticas
+        self.actualizar_estadisticas()
+        
+    def consulta_fallida(self, mensaje):
+        self.btn_filtrar.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Error actualizando datos: {mensaje}")
+        
+    def solicitar_bloque(self, despues_de, acumulado, entregar):
+        """Pide en segundo plano el siguiente bloque de asientos para el modelo"""
+        fecha_desde, fecha_hasta = self.periodo_cargado
+        
+        def bloque_fallido(mensaje):
+            entregar(None)
+            QMessageBox.critical(self, "Error", f"Error cargando asientos: {mensaje}")
+        
+        self.runner.ejecutar(
+            JournalService().obtener_pagina_asientos,
+            fecha_desde, fecha_hasta, despues_de, self.asientos_por_pagina,
+            acumulado=acumulado,
+            al_terminar=entregar,
+            al_fallar=bloque_fallido
+        )
+        
+    def bloque_cargado(self):
+        """Ajusta la tabla al llegar un bloque y termina un cambio de página pendiente"""
+        if len(self.modelo_asientos.bloques) == 1:
+            for col in (0, 1, 2, 5, 6, 7):
+                self.tabla_asientos.resizeColumnToContents(col)
+            self.tabla_asientos.scrollToTop()
+            self.actualizar_totales_pagina()
+            
+        if self.pagina_pendiente is not None:
+            self.cambiar_pagina(self.pagina_pendiente)
         
-    def aplicar_estilo_fila(self, fila, debe, haber):
-        """Aplica estilos visuales a las filas según el tipo de movimiento"""
-        if debe > 0:
-            # Movimiento de débito - color azul
-            for col in range(8):
-                item = self.tabla_asientos.item(fila, col)
-                if item:
-                    item.setBackground(QColor(30, 58, 138, 50))  # Azul oscuro translúcido
-        elif haber > 0:
-            # Movimiento de crédito - color rosa
-            for col in range(8):
-                item = self.tabla_asientos.item(fila, col)
-                if item:
-                    item.setBackground(QColor(136, 19, 55, 50))  # Rosa oscuro translúcido
-                    
     def actualizar_estadisticas(self):
         """Actualiza las estadísticas y totales generales"""
-        if not hasattr(self, 'asientos'):
+        if not hasattr(self, 'estadisticas_periodo'):
             return
             
-        total_asientos = len(self.asientos)
-        total_debe = 0
-        total_haber = 0
-        
-        # Calcular totales generales
-        for asiento in self.asientos:
-            for linea in asiento['lineas']:
-                total_debe += linea['debe']
-                total_haber += linea['haber']
+        # Totales generales del periodo (calculados en la base al aplicar el filtro)
+        total_asientos = self.estadisticas_periodo['total_asientos']
+        total_debe = self.estadisticas_periodo['total_debe']
+        total_haber = self.estadisticas_periodo['total_haber']
                 
         diferencia = total_debe - total_haber
-        estado = "✅ CUADRADO" if abs(diferencia) < 0.01 else "❌ DESCUADRADO"
+        estado = "✅ CUADRADO" if diferencia == 0 else "❌ DESCUADRADO"
         
         # Actualizar labels
         self.lbl_total_asientos.setText(f"Total Asientos: {total_asientos}")
@@ -450,49 +395,111 @@ class LibroDiarioView(QWidget):
         self.lbl_diferencia.setText(f"Diferencia: Bs {diferencia:,.2f}")
         self.lbl_estado.setText(f"Estado: {estado}")
         
-        # Calcular acumulados
-        inicio = (self.pagina_actual - 1) * self.asientos_por_pagina
-        acumulado_debe = 0
-        acumulado_haber = 0
-        
-        for i in range(inicio):
-            if i < len(self.asientos):
-                for linea in self.asientos[i]['lineas']:
-                    acumulado_debe += linea['debe']
-                    acumulado_haber += linea['haber']
-                    
-        self.lbl_acumulado_debe.setText(f"Acumulado Débito: Bs {acumulado_debe:,.2f}")
-        self.lbl_acumulado_haber.setText(f"Acumulado Crédito: Bs {acumulado_haber:,.2f}")
+        # Totales de la página visible y acumulados de las anteriores
+        self.actualizar_totales_pagina()
         
         # Resaltar estado
-        if abs(diferencia) > 0.01:
+        if diferencia != 0:
             self.lbl_estado.setStyleSheet("color: #FF4444; font-weight: bold;")
         else:
             self.lbl_estado.setStyleSheet("color: #00FF88; font-weight: bold;")
             
+    def actualizar_totales_pagina(self):
+        """Totales de la página (bloque) visible y acumulado arrastrado hasta ella"""
+        bloques = self.modelo_asientos.bloques
+        indice = self.pagina_actual - self.modelo_asientos.primera_pagina
+        if 0 <= indice < len(bloques):
+            bloque = bloques[indice]
+            total_pagina_debe = bloque['total_debe']
+            total_pagina_haber = bloque['total_haber']
+            acumulado_debe = bloque['acumulado_inicio']['total_debe']
+            acumulado_haber = bloque['acumulado_inicio']['total_haber']
+        else:
+            total_pagina_debe = total_pagina_haber = acumulado_debe = acumulado_haber = 0
+            
+        self.lbl_total_pagina_debe.setText(f"Total Página Débito: Bs {total_pagina_debe:,.2f}")
+        self.lbl_total_pagina_haber.setText(f"Total Página Crédito: Bs {total_pagina_haber:,.2f}")
+        self.lbl_acumulado_debe.setText(f"Acumulado Débito: Bs {acumulado_debe:,.2f}")
+        self.lbl_acumulado_haber.setText(f"Acumulado Crédito: Bs {acumulado_haber:,.2f}")
+            
     def aplicar_filtros(self):
         """Aplica los filtros de fecha"""
         self.pagina_actual = 1
-        self.spin_pagina.setValue(1)
         self.actualizar_datos()
         
     def cambiar_pagina(self, pagina):
-        """Cambia a la página especificada"""
+        """Desplaza la tabla hasta el inicio de la página especificada"""
+        bloques = self.modelo_asientos.bloques
+        indice = pagina - self.modelo_asientos.primera_pagina
+        if indice == len(bloques):
+            # La página que sigue a la última traída: un bloque más
+            if self.modelo_asientos.hay_mas:
+                self.pagina_pendiente = pagina
+                self.modelo_asientos.fetchMore()
+            else:
+                self.pagina_pendiente = None
+            return
+            
+        if not 0 <= indice < len(bloques):
+            # Salto a una página no cargada: su clave sale del índice (fecha, numero)
+            # y el modelo arranca ahí, sin traer los bloques intermedios
+            self.pagina_pendiente = pagina
+            fecha_desde, fecha_hasta = self.periodo_cargado
+            self.runner.ejecutar(
+                JournalService().obtener_clave_pagina,
+                fecha_desde, fecha_hasta, pagina, self.asientos_por_pagina,
+                al_terminar=lambda clave: self.saltar_a_pagina(pagina, clave),
+                al_fallar=self.consulta_fallida
+            )
+            return
+            
+        self.pagina_pendiente = None
         self.pagina_actual = pagina
-        self.mostrar_pagina_actual()
-        self.actualizar_estadisticas()
+        fila = bloques[indice]['fila_inicio']
+        
+        # Desplazamiento programático: la página elegida manda sobre la fila visible
+        self.sincronizar_scroll = False
+        self.tabla_asientos.doItemsLayout()
+        self.tabla_asientos.scrollTo(self.modelo_asientos.index(fila, 0), QAbstractItemView.PositionAtTop)
+        self.sincronizar_scroll = True
+        self.actualizar_totales_pagina()
+        
+    def saltar_a_pagina(self, pagina, clave):
+        """Reinicia el modelo en la página pedida; el servicio calcula el acumulado anterior"""
+        if pagina != self.pagina_pendiente:
+            # Respuesta de un salto que ya fue reemplazado por otro
+            return
+            
+        self.pagina_pendiente = None
+        self.pagina_actual = pagina
+        self.modelo_asientos.reiniciar(self.solicitar_bloque, primera_pagina=pagina, despues_de=clave)
+        
+    def actualizar_pagina_visible(self):
+        """Sincroniza el número de página con el bloque visible al hacer scroll"""
+        if not self.sincronizar_scroll:
+            return
+            
+        fila = self.tabla_asientos.rowAt(0)
+        if fila < 0:
+            return
+            
+        pagina = self.modelo_asientos.bloque_de_fila(fila) + self.modelo_asientos.primera_pagina
+        if pagina != self.pagina_actual:
+            self.pagina_actual = pagina
+            self.spin_pagina.blockSignals(True)
+            self.spin_pagina.setValue(pagina)
+            self.spin_pagina.blockSignals(False)
+            self.actualizar_totales_pagina()
         
     def pagina_anterior(self):
         """Va a la página anterior"""
         if self.pagina_actual > 1:
-            self.pagina_actual -= 1
-            self.spin_pagina.setValue(self.pagina_actual)
+            self.spin_pagina.setValue(self.pagina_actual - 1)
             
     def pagina_siguiente(self):
         """Va a la página siguiente"""
         if self.pagina_actual < self.total_paginas:
-            self.pagina_actual += 1
-            self.spin_pagina.setValue(self.pagina_actual)
+            self.spin_pagina.setValue(self.pagina_actual + 1)
             
     def actualizar_contador(self):
         """Actualiza el contador de tiempo"""
@@ -501,112 +508,80 @@ class LibroDiarioView(QWidget):
         
     def exportar_excel(self):
         """Exporta el libro diario a Excel"""
-        if not PANDAS_AVAILABLE:
-            QMessageBox.warning(self, "Error", "Pandas no está disponible para exportación Excel")
+        if not SERVICES_AVAILABLE or not OPENPYXL_AVAILABLE:
+            QMessageBox.warning(self, "Error", "openpyxl no está disponible para exportación Excel")
             return
             
-        try:
-            file_path, _ = QFileDialog.getSaveFileName(
-                self, "Exportar Libro Diario", "libro_diario.xlsx", "Excel Files (*.xlsx)")
-                
-            if file_path:
-                # Preparar datos para exportación
-                data = []
-                for asiento in self.asientos:
-                    for linea in asiento['lineas']:
-                        data.append({
-                            'Fecha': asiento['fecha'].strftime('%d/%m/%Y') if hasattr(asiento['fecha'], 'strftime') else asiento['fecha'],
-                            'Número Asiento': asiento['numero'],
-                            'Código Cuenta': linea['cuenta_codigo'],
-                            'Nombre Cuenta': linea['cuenta_nombre'],
-                            'Detalle/Glosa': f"{asiento['descripcion']} - {linea['descripcion']}",
-                            'Débito (Bs)': linea['debe'],
-                            'Crédito (Bs)': linea['haber'],
-                            'Saldo (Bs)': linea['debe'] - linea['haber']
-                        })
-                
-                df = pd.DataFrame(data)
-                df.to_excel(file_path, index=False, engine='openpyxl')
-                QMessageBox.information(self, "Éxito", "Libro diario exportado a Excel correctamente")
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error exportando a Excel: {str(e)}")
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar Libro Diario", "libro_diario.xlsx", "Excel Files (*.xlsx)")
+            
+        if file_path:
+            fecha_desde = self.date_desde.date().toPython()
+            fecha_hasta = self.date_hasta.date().toPython()
+            
+            # En un proceso aparte: la GUI no compite con openpyxl por el GIL
+            self.runner.ejecutar(
+                ReportJobService().generar, 'excel', file_path, fecha_desde, fecha_hasta,
+                opciones={'columnas': COLUMNAS_LIBRO_DIARIO},
+                con_sesion=False,
+                con_progreso=True,
+                al_terminar=lambda _: QMessageBox.information(
+                    self, "Éxito", "Libro diario exportado a Excel correctamente"),
+                al_fallar=lambda mensaje: QMessageBox.critical(
+                    self, "Error", f"Error exportando a Excel: {mensaje}")
+            )
+            
+    def exportar_excel_por_mes(self):
+        """Exporta un libro diario en Excel por cada mes del rango"""
+        if not SERVICES_AVAILABLE or not OPENPYXL_AVAILABLE:
+            QMessageBox.warning(self, "Error", "openpyxl no está disponible para exportación Excel")
+            return
+            
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar Libros Mensuales", "libro_diario.xlsx", "Excel Files (*.xlsx)")
+            
+        if file_path:
+            fecha_desde = self.date_desde.date().toPython()
+            fecha_hasta = self.date_hasta.date().toPython()
+            
+            # Un proceso por mes: libro_diario_AAAA-MM.xlsx con todos los núcleos
+            self.runner.ejecutar(
+                ReportJobService().generar, 'excel', file_path, fecha_desde, fecha_hasta,
+                por_mes=True,
+                opciones={'columnas': COLUMNAS_LIBRO_DIARIO},
+                con_sesion=False,
+                con_progreso=True,
+                al_terminar=lambda resultado: QMessageBox.information(
+                    self, "Éxito", f"{len(resultado['archivos'])} libros mensuales exportados a Excel"),
+                al_fallar=lambda mensaje: QMessageBox.critical(
+                    self, "Error", f"Error exportando a Excel: {mensaje}")
+            )
             
     def exportar_pdf(self):
         """Exporta el libro diario a PDF"""
-        if not REPORTLAB_AVAILABLE:
+        if not SERVICES_AVAILABLE or not REPORTLAB_AVAILABLE:
             QMessageBox.warning(self, "Error", "ReportLab no está disponible para exportación PDF")
             return
             
-        try:
-            file_path, _ = QFileDialog.getSaveFileName(
-                self, "Exportar Libro Diario", "libro_diario.pdf", "PDF Files (*.pdf)")
-                
-            if file_path:
-                self.generar_pdf(file_path)
-                QMessageBox.information(self, "Éxito", "Libro diario exportado a PDF correctamente")
-                
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error exportando a PDF: {str(e)}")
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "Exportar Libro Diario", "libro_diario.pdf", "PDF Files (*.pdf)")
+            
+        if file_path:
+            fecha_desde = self.date_desde.date().toPython()
+            fecha_hasta = self.date_hasta.date().toPython()
+            
+            # Páginas con totales 'Vienen'/'Van', dibujadas en un proceso aparte
+            self.runner.ejecutar(
+                ReportJobService().generar, 'pdf', file_path, fecha_desde, fecha_hasta,
+                opciones={'empresa': self.empresa_nombre},
+                con_sesion=False,
+                con_progreso=True,
+                al_terminar=lambda _: QMessageBox.information(
+                    self, "Éxito", "Libro diario exportado a PDF correctamente"),
+                al_fallar=lambda mensaje: QMessageBox.critical(
+                    self, "Error", f"Error exportando a PDF: {mensaje}")
+            )
             
-    def generar_pdf(self, file_path):
-        """Genera el archivo PDF del libro diario"""
-        doc = SimpleDocTemplate(file_path, pagesize=A4, topMargin=0.5*inch)
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Estilo personalizado para el título
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#00E5FF'),
-            alignment=1,  # Centrado
-            spaceAfter=20
-        )
-        
-        # Encabezado
-        elements.append(Paragraph(self.empresa_nombre, title_style))
-        elements.append(Paragraph("LIBRO DIARIO CONTABLE", styles['Heading2']))
-        elements.append(Paragraph(f"Período: {self.date_desde.date().toString('dd/MM/yyyy')} - {self.date_hasta.date().toString('dd/MM/yyyy')}", styles['Normal']))
-        elements.append(Paragraph(f"Página: {self.pagina_actual} de {self.total_paginas}", styles['Normal']))
-        elements.append(Spacer(1, 20))
-        
-        # Preparar datos para la tabla
-        table_data = [['Fecha', 'Asiento', 'Código', 'Cuenta', 'Detalle', 'Débito', 'Crédito']]
-        
-        for asiento in self.asientos:
-            for linea in asiento['lineas']:
-                fecha = asiento['fecha'].strftime('%d/%m/%Y') if hasattr(asiento['fecha'], 'strftime') else asiento['fecha']
-                table_data.append([
-                    fecha,
-                    asiento['numero'],
-                    linea['cuenta_codigo'],
-                    linea['cuenta_nombre'],
-                    f"{asiento['descripcion']} - {linea['descripcion']}",
-                    f"{linea['debe']:,.2f}",
-                    f"{linea['haber']:,.2f}"
-                ])
-        
-        # Crear tabla
-        table = Table(table_data, colWidths=[0.8*inch, 0.8*inch, 0.8*inch, 1.5*inch, 2*inch, 0.8*inch, 0.8*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1E293B')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#00E5FF')),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#0F172A')),
-            ('TEXTCOLOR', (0, 1), (-1, -1), colors.white),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#334155'))
-        ]))
-        
-        elements.append(table)
-        doc.build(elements)
-        
     def ir_a_registro(self):
         """Navega al módulo de registro de asientos"""
         # Esta función puede ser conectada al sistema de navegación principal
@@ -624,220 +599,4 @@ class LibroDiarioView(QWidget):
                            
     def apply_futurist_styles(self):
         """Aplica estilos futuristas a toda la interfaz"""
-        futurist_style = """
-            /* Estilos generales */
-            QWidget {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                    stop:0 #0A0E17, stop:0.5 #13182B, stop:1 #0A0E17);
-                color: #E6EEF3;
-                font-family: 'Segoe UI', 'Arial', sans-serif;
-            }
-
-            /* Encabezado principal */
-            #header_frame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 rgba(0, 229, 255, 0.1),
-                    stop:0.5 rgba(179, 0, 158, 0.1),
-                    stop:1 rgba(0, 229, 255, 0.1));
-                border: 1px solid rgba(0, 229, 255, 0.3);
-                border-radius: 12px;
-                padding: 15px;
-                margin: 5px;
-            }
-
-            #empresa_label {
-                color: #00E5FF;
-                font-size: 18px;
-                font-weight: 800;
-                letter-spacing: 1px;
-                text-shadow: 0 0 10px rgba(0, 229, 255, 0.5);
-            }
-
-            #libro_label {
-                color: #B3009E;
-                font-size: 24px;
-                font-weight: 900;
-                letter-spacing: 2px;
-                text-shadow: 0 0 15px rgba(179, 0, 158, 0.6);
-            }
-
-            #info_label {
-                color: #94A3B8;
-                font-size: 11px;
-                font-weight: 600;
-                letter-spacing: 0.5px;
-            }
-
-            /* Controles */
-            #controls_frame {
-                background: rgba(30, 41, 59, 0.7);
-                border: 1px solid rgba(255, 0, 128, 0.2);
-                border-radius: 8px;
-                padding: 10px;
-            }
-
-            QGroupBox {
-                color: #00E5FF;
-                font-weight: bold;
-                font-size: 12px;
-                border: 1px solid rgba(0, 229, 255, 0.3);
-                border-radius: 6px;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-                color: #00E5FF;
-            }
-
-            /* Botones principales */
-            #primary_btn {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #00E5FF, stop:1 #B3009E);
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 15px;
-                font-weight: bold;
-                font-size: 11px;
-                min-height: 25px;
-            }
-
-            #primary_btn:hover {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #00F7FF, stop:1 #FF0080);
-                border: 1px solid rgba(0, 229, 255, 0.6);
-            }
-
-            #secondary_btn {
-                background: rgba(30, 41, 59, 0.8);
-                color: #00E5FF;
-                border: 1px solid rgba(0, 229, 255, 0.4);
-                border-radius: 4px;
-                padding: 6px 12px;
-                font-weight: bold;
-                font-size: 10px;
-            }
-
-            #secondary_btn:hover {
-                background: rgba(0, 229, 255, 0.1);
-                border: 1px solid rgba(0, 229, 255, 0.8);
-            }
-
-            /* Tabla de asientos */
-            #asientos_frame {
-                background: rgba(15, 23, 42, 0.9);
-                border: 1px solid rgba(0, 229, 255, 0.2);
-                border-radius: 8px;
-            }
-
-            QTableWidget {
-                background: rgba(26, 29, 33, 0.8);
-                border: 1px solid rgba(0, 229, 255, 0.3);
-                border-radius: 6px;
-                gridline-color: rgba(0, 229, 255, 0.2);
-                font-size: 10px;
-            }
-
-            QTableWidget::item {
-                padding: 4px;
-                border-bottom: 1px solid rgba(0, 229, 255, 0.1);
-            }
-
-            QTableWidget::item:selected {
-                background: rgba(0, 229, 255, 0.3);
-            }
-
-            QHeaderView::section {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #00E5FF, stop:1 #B3009E);
-                color: white;
-                font-weight: bold;
-                padding: 6px;
-                border: none;
-                font-size: 9px;
-            }
-
-            /* Resumen y totales */
-            #resumen_frame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 rgba(0, 229, 255, 0.05),
-                    stop:1 rgba(255, 0, 128, 0.05));
-                border: 1px solid rgba(0, 229, 255, 0.2);
-                border-radius: 8px;
-                padding: 10px;
-            }
-
-            #resumen_title {
-                color: #00E5FF;
-                font-size: 14px;
-                font-weight: bold;
-                margin-bottom: 8px;
-            }
-
-            #stat_label, #total_label {
-                font-size: 11px;
-                font-weight: 600;
-                padding: 4px 8px;
-                border-radius: 4px;
-                background: rgba(30, 41, 59, 0.5);
-            }
-
-            #stat_label {
-                color: #E6EEF3;
-            }
-
-            #total_label {
-                color: #00E5FF;
-            }
-
-            /* Barra de herramientas */
-            #toolbar_frame {
-                background: rgba(30, 41, 59, 0.8);
-                border: 1px solid rgba(255, 0, 128, 0.2);
-                border-radius: 8px;
-                padding: 8px;
-            }
-
-            #toolbar_btn {
-                background: rgba(0, 229, 255, 0.1);
-                color: #00E5FF;
-                border: 1px solid rgba(0, 229, 255, 0.4);
-                border-radius: 5px;
-                padding: 6px 12px;
-                font-weight: bold;
-                font-size: 10px;
-                min-height: 25px;
-            }
-
-            #toolbar_btn:hover {
-                background: rgba(0, 229, 255, 0.2);
-                border: 1px solid rgba(0, 229, 255, 0.8);
-            }
-
-            #contador_label {
-                color: #B3009E;
-                font-size: 10px;
-                font-weight: bold;
-                font-family: 'Courier New';
-            }
-
-            /* Controles de formulario */
-            QDateEdit, QSpinBox {
-                background: rgba(26, 29, 33, 0.8);
-                border: 1px solid rgba(0, 229, 255, 0.4);
-                border-radius: 4px;
-                padding: 4px;
-                color: #E6EEF3;
-                font-size: 10px;
-            }
-
-            QDateEdit::drop-down, QSpinBox::up-button, QSpinBox::down-button {
-                background: rgba(0, 229, 255, 0.2);
-                border: none;
-            }
-        """
-        self.setStyleSheet(futurist_style)
\ No newline at end of file
+        self.setStyleSheet(ESTILO_LIBROS)
\ No newline at end of file
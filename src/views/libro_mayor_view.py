@@ -0,0 +1,253 @@
+import os
+import sys
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                               QPushButton, QTableView, QAbstractItemView,
+                               QHeaderView, QDateEdit, QFrame, QMessageBox,
+                               QComboBox, QGroupBox)
+from PySide6.QtCore import Qt, QDate
+
+# Agregar el directorio raíz al path para imports absolutos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+try:
+    from services.ledger_service import LedgerService
+    SERVICES_AVAILABLE = True
+except ImportError as e:
+    print(f"❌ Servicios no disponibles: {e}")
+    SERVICES_AVAILABLE = False
+
+from views.table_models import LibroMayorTableModel
+from views.estilos import ESTILO_LIBROS
+from views.workers import DbRunner, BusyIndicator
+
+class LibroMayorView(QWidget):
+    def __init__(self, usuario):
+        super().__init__()
+        self.usuario = usuario
+        self.empresa_nombre = "MISKY CHOCLOS S.A."
+        self.filas_por_bloque = 500
+        self.cuentas_mayor = []
+        self.periodo_cargado = (None, None)
+        self.runner = DbRunner(self)
+        self.setup_ui()
+        self.setup_connections()
+        self.cargar_datos_iniciales()
+
+    def setup_ui(self):
+        """Configura la interfaz del libro mayor"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(15, 15, 15, 15)
+        main_layout.setSpacing(12)
+
+        self.setup_header(main_layout)
+        self.setup_controls(main_layout)
+        self.setup_tabla(main_layout)
+        self.setup_resumen(main_layout)
+
+        self.setStyleSheet(ESTILO_LIBROS)
+
+    def setup_header(self, parent_layout):
+        """Configura el encabezado"""
+        header_frame = QFrame()
+        header_frame.setObjectName("header_frame")
+        header_layout = QVBoxLayout(header_frame)
+        header_layout.setSpacing(8)
+
+        empresa_label = QLabel(self.empresa_nombre)
+        empresa_label.setObjectName("empresa_label")
+        empresa_label.setAlignment(Qt.AlignCenter)
+
+        libro_label = QLabel("📚 LIBRO MAYOR")
+        libro_label.setObjectName("libro_label")
+        libro_label.setAlignment(Qt.AlignCenter)
+
+        usuario_label = QLabel(f"USUARIO: {self.usuario.username.upper()}")
+        usuario_label.setObjectName("info_label")
+        usuario_label.setAlignment(Qt.AlignRight)
+
+        header_layout.addWidget(empresa_label)
+        header_layout.addWidget(libro_label)
+        header_layout.addWidget(usuario_label)
+
+        parent_layout.addWidget(header_frame)
+
+    def setup_controls(self, parent_layout):
+        """Configura los filtros de cuentas y fechas"""
+        controls_frame = QFrame()
+        controls_frame.setObjectName("controls_frame")
+        controls_layout = QHBoxLayout(controls_frame)
+        controls_layout.setSpacing(15)
+
+        cuentas_group = QGroupBox("📒 CUENTAS")
+        cuentas_layout = QHBoxLayout(cuentas_group)
+        cuentas_layout.addWidget(QLabel("Desde:"))
+        self.combo_desde = QComboBox()
+        self.combo_desde.setMinimumWidth(220)
+        cuentas_layout.addWidget(self.combo_desde)
+        cuentas_layout.addWidget(QLabel("Hasta:"))
+        self.combo_hasta = QComboBox()
+        self.combo_hasta.setMinimumWidth(220)
+        cuentas_layout.addWidget(self.combo_hasta)
+
+        fechas_group = QGroupBox("🕐 PERIODO")
+        fechas_layout = QHBoxLayout(fechas_group)
+        fechas_layout.addWidget(QLabel("Desde:"))
+        self.date_desde = QDateEdit()
+        self.date_desde.setDate(QDate(QDate.currentDate().year(), 1, 1))
+        self.date_desde.setCalendarPopup(True)
+        fechas_layout.addWidget(self.date_desde)
+        fechas_layout.addWidget(QLabel("Hasta:"))
+        self.date_hasta = QDateEdit()
+        self.date_hasta.setDate(QDate.currentDate())
+        self.date_hasta.setCalendarPopup(True)
+        fechas_layout.addWidget(self.date_hasta)
+
+        self.btn_consultar = QPushButton("🔍 CONSULTAR")
+        self.btn_consultar.setObjectName("primary_btn")
+        fechas_layout.addWidget(self.btn_consultar)
+
+        controls_layout.addWidget(cuentas_group)
+        controls_layout.addWidget(fechas_group)
+        controls_layout.addWidget(BusyIndicator(self.runner, "Consultando..."))
+
+        parent_layout.addWidget(controls_frame)
+
+    def setup_tabla(self, parent_layout):
+        """Tabla del mayor sobre un modelo virtual con carga incremental"""
+        tabla_frame = QFrame()
+        tabla_frame.setObjectName("asientos_frame")
+        tabla_layout = QVBoxLayout(tabla_frame)
+
+        self.modelo_mayor = LibroMayorTableModel(self)
+        self.tabla_mayor = QTableView()
+        self.tabla_mayor.setModel(self.modelo_mayor)
+
+        header = self.tabla_mayor.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.Interactive)
+        header.setSectionResizeMode(2, QHeaderView.Stretch)          # Detalle
+        self.tabla_mayor.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.tabla_mayor.verticalHeader().setDefaultSectionSize(26)
+
+        self.tabla_mayor.setAlternatingRowColors(True)
+        self.tabla_mayor.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tabla_mayor.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.tabla_mayor.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+
+        tabla_layout.addWidget(self.tabla_mayor)
+        parent_layout.addWidget(tabla_frame, 1)
+
+    def setup_resumen(self, parent_layout):
+        """Totales del periodo para las cuentas consultadas"""
+        resumen_frame = QFrame()
+        resumen_frame.setObjectName("resumen_frame")
+        resumen_layout = QHBoxLayout(resumen_frame)
+
+        self.lbl_cuentas = QLabel("Cuentas: 0")
+        self.lbl_saldo_inicial = QLabel("Saldo Inicial: Bs 0.00")
+        self.lbl_total_debe = QLabel("Total Débito: Bs 0.00")
+        self.lbl_total_haber = QLabel("Total Crédito: Bs 0.00")
+        self.lbl_saldo_final = QLabel("Saldo Final: Bs 0.00")
+
+        for lbl in [self.lbl_cuentas, self.lbl_saldo_inicial, self.lbl_total_debe,
+                    self.lbl_total_haber, self.lbl_saldo_final]:
+            lbl.setObjectName("stat_label")
+            resumen_layout.addWidget(lbl)
+
+        parent_layout.addWidget(resumen_frame)
+
+    def setup_connections(self):
+        """Configura las conexiones de señales"""
+        self.btn_consultar.clicked.connect(self.consultar_mayor)
+        self.modelo_mayor.bloque_cargado.connect(self.bloque_cargado)
+
+    def cargar_datos_iniciales(self):
+        """Carga el catálogo de cuentas para los filtros"""
+        if not SERVICES_AVAILABLE:
+            QMessageBox.critical(self, "Error",
+                               "Los servicios contables no están disponibles.\n"
+                               "Verifique la conexión a la base de datos y la configuración.")
+            return
+
+        self.runner.ejecutar(
+            LedgerService().obtener_cuentas_mayor,
+            al_terminar=self.cuentas_cargadas,
+            al_fallar=self.consulta_fallida
+        )
+
+    def cuentas_cargadas(self, cuentas):
+        """Llena los combos de rango de cuentas y consulta el mayor completo"""
+        for combo in (self.combo_desde, self.combo_hasta):
+            combo.clear()
+            for cuenta in cuentas:
+                combo.addItem(f"{cuenta['codigo']} - {cuenta['nombre']}", cuenta['codigo'])
+
+        if cuentas:
+            self.combo_hasta.setCurrentIndex(len(cuentas) - 1)
+            self.consultar_mayor()
+
+    def consultar_mayor(self):
+        """Resume las cuentas del rango y reinicia la tabla"""
+        if not SERVICES_AVAILABLE or self.combo_desde.count() == 0:
+            return
+
+        codigo_desde = self.combo_desde.currentData()
+        codigo_hasta = self.combo_hasta.currentData()
+        if codigo_desde > codigo_hasta:
+            codigo_desde, codigo_hasta = codigo_hasta, codigo_desde
+        fecha_desde = self.date_desde.date().toPython()
+        fecha_hasta = self.date_hasta.date().toPython()
+
+        self.btn_consultar.setEnabled(False)
+        self.runner.ejecutar(
+            LedgerService().preparar_mayor,
+            codigo_desde, codigo_hasta, fecha_desde, fecha_hasta,
+            al_terminar=lambda cuentas: self.mayor_preparado(cuentas, fecha_desde, fecha_hasta),
+            al_fallar=self.consulta_fallida
+        )
+
+    def mayor_preparado(self, cuentas, fecha_desde, fecha_hasta):
+        """Recibe el resumen por cuenta y empieza a traer los movimientos"""
+        self.btn_consultar.setEnabled(True)
+        self.cuentas_mayor = cuentas
+        self.periodo_cargado = (fecha_desde, fecha_hasta)
+        self.actualizar_resumen()
+        self.modelo_mayor.reiniciar(self.solicitar_bloque)
+
+    def consulta_fallida(self, mensaje):
+        self.btn_consultar.setEnabled(True)
+        QMessageBox.critical(self, "Error", f"Error consultando el libro mayor: {mensaje}")
+
+    def solicitar_bloque(self, despues_de, entregar):
+        """Pide en segundo plano el siguiente bloque de filas para el modelo"""
+        fecha_desde, fecha_hasta = self.periodo_cargado
+
+        def bloque_fallido(mensaje):
+            entregar(None)
+            QMessageBox.critical(self, "Error", f"Error cargando movimientos: {mensaje}")
+
+        self.runner.ejecutar(
+            LedgerService().obtener_pagina_mayor,
+            self.cuentas_mayor, fecha_desde, fecha_hasta, despues_de, self.filas_por_bloque,
+            al_terminar=entregar,
+            al_fallar=bloque_fallido
+        )
+
+    def bloque_cargado(self):
+        """Ajusta las columnas con el primer bloque"""
+        if self.modelo_mayor.rowCount() <= self.filas_por_bloque:
+            for col in (0, 1, 3, 4, 5):
+                self.tabla_mayor.resizeColumnToContents(col)
+            self.tabla_mayor.scrollToTop()
+
+    def actualizar_resumen(self):
+        """Totales del periodo sumados desde el resumen de cada cuenta"""
+        saldo_inicial = sum(c['saldo_inicial'] for c in self.cuentas_mayor)
+        total_debe = sum(c['total_debe'] for c in self.cuentas_mayor)
+        total_haber = sum(c['total_haber'] for c in self.cuentas_mayor)
+        saldo_final = sum(c['saldo_final'] for c in self.cuentas_mayor)
+
+        self.lbl_cuentas.setText(f"Cuentas: {len(self.cuentas_mayor)}")
+        self.lbl_saldo_inicial.setText(f"Saldo Inicial: Bs {saldo_inicial:,.2f}")
+        self.lbl_total_debe.setText(f"Total Débito: Bs {total_debe:,.2f}")
+        self.lbl_total_haber.setText(f"Total Crédito: Bs {total_haber:,.2f}")
+        self.lbl_saldo_final.setText(f"Saldo Final: Bs {saldo_final:,.2f}")
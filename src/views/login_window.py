@@ -5,6 +5,8 @@ from PySide6.QtCore import Qt, Signal, QPropertyAnimation, QEasingCurve, QRect,
 from PySide6.QtGui import QColor, QFontDatabase
 import os
 
+from views.workers import DbRunner
+
 class LoginWindow(QWidget):
     login_successful = Signal(object)
     
@@ -13,6 +15,7 @@ class LoginWindow(QWidget):
         self.setWindowTitle("NecroLedger - Sistema Contable Inteligente")
         self.setMinimumSize(500, 600)
         self.setMaximumSize(800, 900)
+        self.runner = DbRunner(self)
         self.load_custom_fonts()
         self.apply_modern_style()
         self.setup_ui()
@@ -234,8 +237,7 @@ class LoginWindow(QWidget):
         self.login_frame.setMaximumWidth(width)
     
     def intentar_login(self):
-        from src.services.auth_service import AuthService
-        from src.models import get_session, init_db
+        from services.auth_service import AuthService
         
         username = self.user_input.text().strip()
         password = self.pass_input.text()
@@ -244,20 +246,32 @@ class LoginWindow(QWidget):
             QMessageBox.warning(self, "Error", "Por favor ingresa usuario y contraseña")
             return
         
-        try:
-            engine = init_db()
-            session = get_session(engine)
-            
-            auth_service = AuthService()
-            success, usuario = auth_service.login(session, username, password)
-            
-            if success:
-                QMessageBox.information(self, "Éxito", f"¡Bienvenido, {usuario.username}!")
-                self.login_successful.emit(usuario)
-            else:
-                QMessageBox.critical(self, "Error", "Usuario o contraseña incorrectos")
-                
-            session.close()
-            
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Error de conexión: {str(e)}")
\ No newline at end of file
+        if self.runner.esta_ocupado():
+            return
+        
+        # Consulta y verificación bcrypt fuera del hilo de la GUI
+        self.login_btn.setEnabled(False)
+        self.login_btn.setText("VERIFICANDO...")
+        self.runner.ejecutar(
+            AuthService().login, username, password,
+            al_terminar=self.login_terminado,
+            al_fallar=self.login_fallido
+        )
+    
+    def login_terminado(self, resultado):
+        self.restaurar_boton_login()
+        success, usuario = resultado
+        
+        if success:
+            QMessageBox.information(self, "Éxito", f"¡Bienvenido, {usuario.username}!")
+            self.login_successful.emit(usuario)
+        else:
+            QMessageBox.critical(self, "Error", "Usuario o contraseña incorrectos")
+    
+    def login_fallido(self, mensaje):
+        self.restaurar_boton_login()
+        QMessageBox.critical(self, "Error", f"Error de conexión: {mensaje}")
+    
+    def restaurar_boton_login(self):
+        self.login_btn.setEnabled(True)
+        self.login_btn.setText("INICIAR SESIÓN")
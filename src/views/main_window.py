@@ -690,6 +690,8 @@ class MainWindow(QMainWindow):
     def load_views(self):
         """Cargar vistas con manejo de errores"""
         print("🔄 Cargando vistas...")
+        # Índice en el stack de cada módulo del menú que no coincide con su botón
+        self.indices_vista = {}
         
         try:
             # Dashboard principal futurista (Index 0)
@@ -721,11 +723,31 @@ class MainWindow(QMainWindow):
             print(f"❌ Error cargando JournalView: {e}")
             self.stacked_widget.addWidget(self.create_placeholder_view("Registro Asientos", e))
         
-        # SOLO PLACEHOLDERS para módulos futuros (Index 3 en adelante)
+        try:
+            # Libro mayor por cuenta (Index 3)
+            from src.views.libro_mayor_view import LibroMayorView
+            libro_mayor = LibroMayorView(self.usuario)
+            self.indices_vista["Libro Mayor"] = self.stacked_widget.addWidget(libro_mayor)
+            print("✅ LibroMayorView cargada correctamente en índice 3")
+        except Exception as e:
+            print(f"❌ Error cargando LibroMayorView: {e}")
+            self.indices_vista["Libro Mayor"] = self.stacked_widget.addWidget(
+                self.create_placeholder_view("Libro Mayor", e))
+        
+        try:
+            # Balances (Index 4)
+            from src.views.balances_view import BalancesView
+            balances = BalancesView(self.usuario)
+            self.indices_vista["Balances"] = self.stacked_widget.addWidget(balances)
+            print("✅ BalancesView cargada correctamente en índice 4")
+        except Exception as e:
+            print(f"❌ Error cargando BalancesView: {e}")
+            self.indices_vista["Balances"] = self.stacked_widget.addWidget(
+                self.create_placeholder_view("Balances", e))
+        
+        # SOLO PLACEHOLDERS para módulos futuros (Index 5 en adelante)
         # No debería haber importaciones de módulos reales aquí
         modulo_placeholders = [
-            ("Libro Mayor", "📚 Módulo en desarrollo - Próximamente"),
-            ("Balances", "⚖️ Módulo en desarrollo - Próximamente"), 
             ("Ventas", "🛒 Módulo en desarrollo - Próximamente"),
             ("Compras", "📦 Módulo en desarrollo - Próximamente"),
             ("Tesorería", "💼 Módulo en desarrollo - Próximamente"),
@@ -736,10 +758,11 @@ class MainWindow(QMainWindow):
             ("Configuración", "⚙️ Módulo en desarrollo - Próximamente")
         ]
         
-        for i, (modulo, mensaje) in enumerate(modulo_placeholders):
+        for modulo, mensaje in modulo_placeholders:
             placeholder = self.create_placeholder_view(modulo, mensaje)
-            self.stacked_widget.addWidget(placeholder)
-            print(f"✅ Placeholder para {modulo} creado en índice {i+3}")
+            indice = self.stacked_widget.addWidget(placeholder)
+            self.indices_vista[modulo] = indice
+            print(f"✅ Placeholder para {modulo} creado en índice {indice}")
         
         print(f"🎯 Total de vistas cargadas: {self.stacked_widget.count()}")
         
@@ -961,11 +984,13 @@ class MainWindow(QMainWindow):
         for btn in self.menu_buttons:
             btn.setChecked(False)
         
+        indice_vista = index
         if 0 <= index < len(self.menu_buttons):
             self.menu_buttons[index].setChecked(True)
+            indice_vista = self.indices_vista.get(self.menu_buttons[index].full_text, index)
         
-        if index < self.stacked_widget.count():
-            self.stacked_widget.setCurrentIndex(index)
+        if indice_vista < self.stacked_widget.count():
+            self.stacked_widget.setCurrentIndex(indice_vista)
             
             # Actualizar título en toolbar
             modulo_nombre = self.menu_buttons[index].full_text
@@ -0,0 +1,473 @@
+from bisect import bisect_right
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, Signal
+from PySide6.QtGui import QColor, QFont
+
+# Colores de fila compartidos: se crean una sola vez, no por celda
+COLOR_DEBITO = QColor(30, 58, 138, 50)     # Azul oscuro translúcido
+COLOR_CREDITO = QColor(136, 19, 55, 50)    # Rosa oscuro translúcido
+COLOR_CUENTA = QColor(0, 229, 255, 40)     # Encabezado de cuenta (libro mayor)
+COLOR_TOTAL = QColor(179, 0, 158, 60)      # Total de cuenta (libro mayor)
+
+ALINEACION_NUMERO = int(Qt.AlignRight | Qt.AlignVCenter)
+
+
+class LibroDiarioTableModel(QAbstractTableModel):
+    """
+    Modelo virtual del libro diario.
+    Guarda las líneas tal como llegan del servicio y formatea cada celda recién
+    cuando la vista la pide en data(). Los asientos se traen por bloques con
+    canFetchMore/fetchMore a medida que el usuario hace scroll. Puede empezar
+    en cualquier página (primera_pagina) a partir de su clave keyset.
+
+    solicitar_bloque(despues_de, acumulado, entregar) debe pedir el bloque
+    (normalmente en un worker) y llamar a entregar() con el dict de
+    JournalService.obtener_pagina_asientos, o con None si falló.
+    acumulado None pide al servicio el arrastre de las páginas anteriores
+    """
+
+    HEADERS = ["FECHA", "N° ASIENTO", "CÓDIGO CUENTA", "NOMBRE CUENTA",
+               "DETALLE/GLOBA", "DEBE (Bs)", "HABER (Bs)", "SALDO (Bs)"]
+    COLUMNAS_NUMERICAS = (5, 6, 7)
+
+    bloque_cargado = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.solicitar_bloque = None
+        self.filas = []       # (asiento, linea) o None para el separador entre asientos
+        self.bloques = []     # resumen de cada bloque traído: fila de inicio, totales y acumulado
+        self.inicios_bloque = []
+        self.primera_pagina = 1
+        self.siguiente = None
+        self.acumulado = {'total_debe': 0, 'total_haber': 0}
+        self.hay_mas = False
+        self.cargando = False
+        self.generacion = 0
+
+    def reiniciar(self, solicitar_bloque, primera_pagina=1, despues_de=None, acumulado=None):
+        """
+        Vacía el modelo y empieza a cargar desde primera_pagina, cuyo bloque
+        arranca después de la clave despues_de (None: desde el principio)
+        """
+        self.beginResetModel()
+        self.solicitar_bloque = solicitar_bloque
+        self.filas = []
+        self.bloques = []
+        self.inicios_bloque = []
+        self.primera_pagina = primera_pagina
+        self.siguiente = despues_de
+        self.acumulado = acumulado
+        self.hay_mas = solicitar_bloque is not None
+        self.cargando = False
+        # Las respuestas pendientes de una carga anterior se descartan
+        self.generacion += 1
+        self.endResetModel()
+
+        if self.hay_mas:
+            self.fetchMore(QModelIndex())
+
+    # --- Carga incremental ---
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.hay_mas and not self.cargando
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self.hay_mas or self.cargando:
+            return
+
+        self.cargando = True
+        generacion = self.generacion
+        self.solicitar_bloque(self.siguiente, self.acumulado,
+                              lambda pagina: self._recibir_bloque(pagina, generacion))
+
+    def _recibir_bloque(self, pagina, generacion):
+        if generacion != self.generacion:
+            return
+
+        self.cargando = False
+        if pagina is None:
+            self.hay_mas = False
+            return
+
+        self.agregar_bloque(pagina)
+        self.bloque_cargado.emit()
+
+    def agregar_bloque(self, pagina):
+        """Agrega al final las filas de una página del servicio"""
+        nuevas = []
+        total_debe = 0
+        total_haber = 0
+        for asiento in pagina['asientos']:
+            if self.filas or nuevas:
+                nuevas.append(None)
+            for linea in asiento['lineas']:
+                nuevas.append((asiento, linea))
+                total_debe += linea['debe']
+                total_haber += linea['haber']
+
+        self.siguiente = pagina['siguiente']
+        self.acumulado = pagina['acumulado_fin']
+        self.hay_mas = pagina['siguiente'] is not None
+
+        if not pagina['asientos']:
+            return
+
+        inicio = len(self.filas)
+        self.bloques.append({
+            'fila_inicio': inicio,
+            'total_debe': total_debe,
+            'total_haber': total_haber,
+            'acumulado_inicio': pagina['acumulado_inicio']
+        })
+        self.inicios_bloque.append(inicio)
+
+        if nuevas:
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(nuevas) - 1)
+            self.filas.extend(nuevas)
+            self.endInsertRows()
+
+    def bloque_de_fila(self, fila):
+        """Índice (desde 0) del bloque que contiene la fila"""
+        return max(0, bisect_right(self.inicios_bloque, fila) - 1)
+
+    # --- Interfaz de QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.filas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def flags(self, index):
+        if self.filas[index.row()] is None:
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        fila = self.filas[index.row()]
+        col = index.column()
+
+        if fila is None:
+            if role == Qt.DisplayRole and col == 4:
+                return "─" * 5
+            return None
+
+        asiento, linea = fila
+
+        if role == Qt.DisplayRole:
+            if col == 0:
+                fecha = asiento['fecha']
+                return fecha.strftime('%d/%m/%Y') if hasattr(fecha, 'strftime') else fecha
+            if col == 1:
+                return asiento['numero']
+            if col == 2:
+                return linea['cuenta_codigo']
+            if col == 3:
+                return linea['cuenta_nombre']
+            if col == 4:
+                return f"{asiento['descripcion']} - {linea['descripcion']}" if linea['descripcion'] else asiento['descripcion']
+            if col == 5:
+                return f"{linea['debe']:,.2f}"
+            if col == 6:
+                return f"{linea['haber']:,.2f}"
+            if col == 7:
+                return f"{linea['saldo']:,.2f}"
+
+        elif role == Qt.BackgroundRole:
+            # Color según el tipo de movimiento
+            if linea['debe'] > 0:
+                return COLOR_DEBITO
+            if linea['haber'] > 0:
+                return COLOR_CREDITO
+
+        elif role == Qt.TextAlignmentRole:
+            if col in self.COLUMNAS_NUMERICAS:
+                return ALINEACION_NUMERO
+
+        return None
+
+
+class LibroMayorTableModel(QAbstractTableModel):
+    """
+    Modelo virtual del libro mayor.
+    Las filas llegan por bloques desde LedgerService.obtener_pagina_mayor
+    (encabezado de cuenta, movimientos con saldo acumulado y total de cuenta)
+    y se formatean recién en data().
+
+    solicitar_bloque(despues_de, entregar) debe pedir el bloque (normalmente
+    en un worker) y llamar a entregar() con la página, o con None si falló
+    """
+
+    HEADERS = ["FECHA", "N° ASIENTO", "DETALLE/GLOSA", "DEBE (Bs)", "HABER (Bs)", "SALDO (Bs)"]
+    COLUMNAS_NUMERICAS = (3, 4, 5)
+
+    bloque_cargado = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.solicitar_bloque = None
+        self.filas = []
+        self.siguiente = None
+        self.hay_mas = False
+        self.cargando = False
+        self.generacion = 0
+        self.fuente_negrita = QFont()
+        self.fuente_negrita.setBold(True)
+
+    def reiniciar(self, solicitar_bloque):
+        """Vacía el modelo y empieza a cargar desde el primer bloque"""
+        self.beginResetModel()
+        self.solicitar_bloque = solicitar_bloque
+        self.filas = []
+        self.siguiente = None
+        self.hay_mas = solicitar_bloque is not None
+        self.cargando = False
+        self.generacion += 1
+        self.endResetModel()
+
+        if self.hay_mas:
+            self.fetchMore(QModelIndex())
+
+    # --- Carga incremental ---
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.hay_mas and not self.cargando
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self.hay_mas or self.cargando:
+            return
+
+        self.cargando = True
+        generacion = self.generacion
+        self.solicitar_bloque(self.siguiente,
+                              lambda pagina: self._recibir_bloque(pagina, generacion))
+
+    def _recibir_bloque(self, pagina, generacion):
+        if generacion != self.generacion:
+            return
+
+        self.cargando = False
+        if pagina is None:
+            self.hay_mas = False
+            return
+
+        self.siguiente = pagina['siguiente']
+        self.hay_mas = pagina['siguiente'] is not None
+
+        nuevas = pagina['filas']
+        if nuevas:
+            inicio = len(self.filas)
+            self.beginInsertRows(QModelIndex(), inicio, inicio + len(nuevas) - 1)
+            self.filas.extend(nuevas)
+            self.endInsertRows()
+        self.bloque_cargado.emit()
+
+    # --- Interfaz de QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.filas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        fila = self.filas[index.row()]
+        col = index.column()
+        tipo = fila['tipo']
+        cuenta = fila['cuenta']
+
+        if role == Qt.DisplayRole:
+            if tipo == 'cuenta':
+                if col == 0:
+                    return cuenta['codigo']
+                if col == 2:
+                    return f"{cuenta['nombre']} — SALDO INICIAL"
+                if col == 5:
+                    return f"{fila['saldo']:,.2f}"
+                return None
+
+            if tipo == 'total':
+                if col == 2:
+                    return f"TOTAL {cuenta['codigo']} {cuenta['nombre']} ({cuenta['movimientos']} movimientos)"
+                if col == 3:
+                    return f"{cuenta['total_debe']:,.2f}"
+                if col == 4:
+                    return f"{cuenta['total_haber']:,.2f}"
+                if col == 5:
+                    return f"{fila['saldo']:,.2f}"
+                return None
+
+            if col == 0:
+                fecha = fila['fecha']
+                return fecha.strftime('%d/%m/%Y') if hasattr(fecha, 'strftime') else fecha
+            if col == 1:
+                return fila['numero']
+            if col == 2:
+                return fila['descripcion']
+            if col == 3:
+                return f"{fila['debe']:,.2f}"
+            if col == 4:
+                return f"{fila['haber']:,.2f}"
+            if col == 5:
+                return f"{fila['saldo']:,.2f}"
+
+        elif role == Qt.BackgroundRole:
+            if tipo == 'cuenta':
+                return COLOR_CUENTA
+            if tipo == 'total':
+                return COLOR_TOTAL
+
+        elif role == Qt.FontRole:
+            if tipo != 'movimiento':
+                return self.fuente_negrita
+
+        elif role == Qt.TextAlignmentRole:
+            if col in self.COLUMNAS_NUMERICAS:
+                return ALINEACION_NUMERO
+
+        return None
+
+
+class BalanceComprobacionTableModel(QAbstractTableModel):
+    """
+    Modelo del balance de comprobación. El balance tiene una fila por cuenta
+    (pocas), así que se carga completo; las celdas se formatean en data()
+    """
+
+    HEADERS = ["CÓDIGO", "CUENTA", "SUMAS DEBE (Bs)", "SUMAS HABER (Bs)",
+               "SALDO DEUDOR (Bs)", "SALDO ACREEDOR (Bs)"]
+    CAMPOS_NUMERICOS = ('sumas_debe', 'sumas_haber', 'saldo_deudor', 'saldo_acreedor')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cuentas = []
+        self.fuente_negrita = QFont()
+        self.fuente_negrita.setBold(True)
+
+    def cargar(self, cuentas, solo_movimiento=True):
+        """Reemplaza las filas; opcionalmente oculta las cuentas sin movimiento"""
+        self.beginResetModel()
+        self.cuentas = [
+            c for c in cuentas
+            if not solo_movimiento or c['sumas_debe'] or c['sumas_haber']
+        ]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.cuentas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        cuenta = self.cuentas[index.row()]
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return cuenta['codigo']
+            if col == 1:
+                return '    ' * (cuenta['nivel'] - 1) + cuenta['nombre']
+            valor = cuenta[self.CAMPOS_NUMERICOS[col - 2]]
+            return f"{valor:,.2f}" if valor else ""
+
+        elif role == Qt.FontRole:
+            if cuenta['es_grupo']:
+                return self.fuente_negrita
+
+        elif role == Qt.BackgroundRole:
+            if cuenta['nivel'] == 1:
+                return COLOR_CUENTA
+
+        elif role == Qt.TextAlignmentRole:
+            if col >= 2:
+                return ALINEACION_NUMERO
+
+        return None
+
+
+class EstadoFinancieroTableModel(QAbstractTableModel):
+    """
+    Modelo de un estado financiero (Balance General o Estado de Resultados)
+    con una columna por periodo comparativo. Usa las filas de
+    FinancialStatementsService.filas_estado
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.filas = []
+        self.headers = ["CÓDIGO", "CUENTA"]
+        self.fuente_negrita = QFont()
+        self.fuente_negrita.setBold(True)
+
+    def cargar(self, filas, etiquetas_periodo):
+        self.beginResetModel()
+        self.filas = filas
+        self.headers = ["CÓDIGO", "CUENTA"] + [f"{etiqueta} (Bs)" for etiqueta in etiquetas_periodo]
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.filas)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        fila = self.filas[index.row()]
+        col = index.column()
+
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return fila['codigo']
+            if col == 1:
+                return '    ' * max(fila['nivel'] - 1, 0) + fila['nombre']
+            valor = fila['valores'][col - 2]
+            return "" if valor is None else f"{valor:,.2f}"
+
+        elif role == Qt.FontRole:
+            if fila['tipo'] != 'cuenta':
+                return self.fuente_negrita
+
+        elif role == Qt.BackgroundRole:
+            if fila['tipo'] == 'seccion':
+                return COLOR_CUENTA
+            if fila['tipo'] == 'total':
+                return COLOR_TOTAL
+
+        elif role == Qt.TextAlignmentRole:
+            if col >= 2:
+                return ALINEACION_NUMERO
+
+        return None
@@ -0,0 +1,172 @@
+import threading
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal, Qt
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QProgressBar, QPushButton, QLabel
+
+
+class WorkerSignals(QObject):
+    """Señales con las que un worker entrega su resultado al hilo de la GUI"""
+    resultado = Signal(object)
+    error = Signal(str)
+    terminado = Signal()
+    progreso = Signal(int, int)
+
+
+class DbWorker(QRunnable):
+    """
+    Ejecuta funcion(session, *args, **kwargs) fuera del hilo de la GUI.
+    Cada worker usa su propia sesión del engine compartido y la cierra al terminar.
+    El resultado o el error llegan por señales (conexión en cola al hilo de la GUI)
+    """
+
+    def __init__(self, funcion, *args, con_sesion=True, **kwargs):
+        super().__init__()
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = kwargs
+        self.con_sesion = con_sesion
+        self.signals = WorkerSignals()
+        self.cancelado = threading.Event()
+        self._conexion = None
+        self.setAutoDelete(False)
+
+    def cancelar(self):
+        """
+        Marca el worker como cancelado: su resultado se descarta y, si hay una
+        consulta en curso, se le pide a PostgreSQL que la interrumpa
+        """
+        self.cancelado.set()
+        conexion = self._conexion
+        if conexion is not None:
+            try:
+                conexion.cancel()
+            except Exception:
+                pass
+
+    def informar_progreso(self, hechas, total):
+        """
+        Callback 'progreso' de las funciones largas: avisa a la GUI y corta
+        el trabajo en el siguiente lote si se pidió cancelar
+        """
+        if self.cancelado.is_set():
+            raise InterruptedError("Operación cancelada")
+        self.signals.progreso.emit(hechas, total)
+
+    def run(self):
+        session = None
+        try:
+            if self.cancelado.is_set():
+                return
+
+            if self.con_sesion:
+                from models import get_session
+                session = get_session()
+                # Conexión DBAPI para poder cancelar la consulta desde la GUI
+                self._conexion = session.connection().connection.dbapi_connection
+                resultado = self.funcion(session, *self.args, **self.kwargs)
+            else:
+                resultado = self.funcion(*self.args, **self.kwargs)
+
+            if not self.cancelado.is_set():
+                self.signals.resultado.emit(resultado)
+        except Exception as e:
+            if not self.cancelado.is_set():
+                self.signals.error.emit(str(e))
+        finally:
+            self._conexion = None
+            if session is not None:
+                session.close()
+            self.signals.terminado.emit()
+
+
+class DbRunner(QObject):
+    """
+    Lanza DbWorkers en el QThreadPool global y lleva la cuenta de los que
+    siguen activos para mostrar un indicador de ocupado
+    """
+    ocupado = Signal(bool)
+    progreso = Signal(int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool.globalInstance()
+        self.activos = set()
+
+    def ejecutar(self, funcion, *args, al_terminar=None, al_fallar=None, con_sesion=True,
+                 con_progreso=False, **kwargs):
+        """
+        Ejecuta la función en segundo plano y devuelve el worker (para cancelarlo).
+        Con con_progreso la función recibe progreso=callback(hechas, total),
+        que se reenvía por la señal progreso del runner
+        """
+        worker = DbWorker(funcion, *args, con_sesion=con_sesion, **kwargs)
+        if con_progreso:
+            worker.kwargs['progreso'] = worker.informar_progreso
+            worker.signals.progreso.connect(self.progreso)
+        if al_terminar is not None:
+            worker.signals.resultado.connect(al_terminar)
+        if al_fallar is not None:
+            worker.signals.error.connect(al_fallar)
+        worker.signals.terminado.connect(lambda w=worker: self._finalizar(w))
+
+        self.activos.add(worker)
+        if len(self.activos) == 1:
+            self.ocupado.emit(True)
+
+        self.pool.start(worker)
+        return worker
+
+    def cancelar_todo(self):
+        for worker in list(self.activos):
+            worker.cancelar()
+
+    def esta_ocupado(self):
+        return bool(self.activos)
+
+    def _finalizar(self, worker):
+        self.activos.discard(worker)
+        if not self.activos:
+            self.ocupado.emit(False)
+
+
+class BusyIndicator(QWidget):
+    """Barra de progreso indeterminada con botón de cancelar, visible mientras el runner trabaja"""
+
+    def __init__(self, runner, texto="Procesando...", parent=None):
+        super().__init__(parent)
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(6)
+
+        self.lbl_texto = QLabel(texto)
+        self.lbl_texto.setStyleSheet("color: #B3009E; font-size: 10px; font-weight: bold;")
+
+        self.barra = QProgressBar()
+        self.barra.setRange(0, 0)
+        self.barra.setTextVisible(False)
+        self.barra.setFixedHeight(8)
+        self.barra.setMaximumWidth(120)
+
+        self.btn_cancelar = QPushButton("✖")
+        self.btn_cancelar.setToolTip("Cancelar operación")
+        self.btn_cancelar.setFixedSize(22, 22)
+        self.btn_cancelar.setCursor(Qt.PointingHandCursor)
+        self.btn_cancelar.clicked.connect(runner.cancelar_todo)
+
+        layout.addWidget(self.lbl_texto)
+        layout.addWidget(self.barra)
+        layout.addWidget(self.btn_cancelar)
+
+        runner.ocupado.connect(self.cambiar_estado)
+        runner.progreso.connect(self.mostrar_progreso)
+        self.setVisible(False)
+
+    def cambiar_estado(self, ocupado):
+        if not ocupado:
+            # La próxima operación empieza indeterminada hasta que informe progreso
+            self.barra.setRange(0, 0)
+        self.setVisible(ocupado)
+
+    def mostrar_progreso(self, hechas, total):
+        # Sin total todavía (0) la barra sigue indeterminada
+        self.barra.setRange(0, max(total, 0))
+        self.barra.setValue(hechas)
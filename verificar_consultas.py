@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Prueba de regresión del N+1 en la lectura del libro diario.
+
+Registra asientos de prueba de tres líneas en un año sin movimientos y
+cuenta, con un listener before_cursor_execute, las sentencias que envían
+JournalService.obtener_asientos y obtener_pagina_asientos con 1 asiento y
+con N asientos. El número de sentencias debe ser el mismo en los dos casos.
+Al terminar borra los asientos, saldos y auditoría de la prueba.
+
+Uso: python verificar_consultas.py [asientos]
+"""
+import sys
+import os
+from datetime import datetime, date
+
+# Añadir src al path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+ANIO_PRUEBA = 2098
+PREFIJO_PRUEBA = 'PRUEBAQ'
+
+class ContadorSentencias:
+    """Cuenta las sentencias que pasan por el engine mientras está activo"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.sentencias = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.sentencias += 1
+
+    def __enter__(self):
+        from sqlalchemy import event
+        event.listen(self.engine, 'before_cursor_execute', self)
+        return self
+
+    def __exit__(self, *args):
+        from sqlalchemy import event
+        event.remove(self.engine, 'before_cursor_execute', self)
+
+def registrar(session, desde, hasta, cuentas, usuario_id):
+    from services.journal_service import JournalService
+
+    asientos = [{
+        'numero': f"{PREFIJO_PRUEBA}-{n:05d}",
+        'fecha': datetime(ANIO_PRUEBA, 1 + n % 12, 1 + n % 28),
+        'descripcion': f"Prueba de consultas {n}",
+        'lineas': [{'cuenta_id': cuentas[0], 'debe': 30, 'haber': 0},
+                   {'cuenta_id': cuentas[1], 'debe': 0, 'haber': 10},
+                   {'cuenta_id': cuentas[1], 'debe': 0, 'haber': 20}],
+    } for n in range(desde, hasta)]
+    for ok, mensaje in JournalService().crear_asientos(session, asientos, usuario_id):
+        if not ok:
+            raise RuntimeError(mensaje)
+
+def contar(session, engine):
+    """Sentencias de cada lectura del periodo de prueba"""
+    from services.journal_service import JournalService
+
+    service = JournalService()
+    periodo = (date(ANIO_PRUEBA, 1, 1), date(ANIO_PRUEBA, 12, 31))
+    cuentas = {}
+    for nombre, leer in [
+        ('obtener_asientos', lambda: service.obtener_asientos(session, *periodo)),
+        ('obtener_pagina_asientos', lambda: service.obtener_pagina_asientos(session, *periodo, limite=20)),
+    ]:
+        session.commit()
+        with ContadorSentencias(engine) as contador:
+            asientos = leer()
+            if isinstance(asientos, dict):
+                asientos = asientos['asientos']
+        cuentas[nombre] = (contador.sentencias, len(asientos))
+    return cuentas
+
+def limpiar(session):
+    from sqlalchemy import select, delete
+    from models import AsientoContable, LineaAsiento, AuditLog
+    from services.account_balance_service import AccountBalanceService
+
+    prueba = select(AsientoContable.id).where(AsientoContable.numero.like(f"{PREFIJO_PRUEBA}-%"))
+    AccountBalanceService().aplicar_lineas(session, LineaAsiento.asiento_id.in_(prueba), -1)
+    session.execute(delete(AuditLog).where(AuditLog.accion == "CREAR_ASIENTO",
+                                           AuditLog.registro_id.in_(prueba)))
+    session.execute(delete(LineaAsiento).where(LineaAsiento.asiento_id.in_(prueba)))
+    session.execute(delete(AsientoContable).where(AsientoContable.numero.like(f"{PREFIJO_PRUEBA}-%")))
+    session.commit()
+
+def main():
+    from models import init_db, get_session, get_engine, dispose_engine, Usuario, CuentaContable
+
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    init_db()
+    engine = get_engine()
+    session = get_session()
+    try:
+        usuario = session.query(Usuario).filter_by(username='admin').first()
+        cuentas = [c.id for c in session.query(CuentaContable.id)
+                   .filter(CuentaContable.codigo.in_(['1.1', '1.2'])).order_by(CuentaContable.codigo)]
+        limpiar(session)
+
+        print("🦇 PRUEBA DE CONSULTAS - LECTURA DEL LIBRO DIARIO")
+        registrar(session, 0, 1, cuentas, usuario.id)
+        con_uno = contar(session, engine)
+        registrar(session, 1, cantidad, cuentas, usuario.id)
+        con_n = contar(session, engine)
+
+        fallas = 0
+        for nombre in con_uno:
+            (sentencias_1, asientos_1), (sentencias_n, asientos_n) = con_uno[nombre], con_n[nombre]
+            print(f"   {nombre}: {sentencias_1} sentencia(s) con {asientos_1} asiento(s), "
+                  f"{sentencias_n} con {asientos_n}")
+            if sentencias_1 != sentencias_n:
+                fallas += 1
+        if fallas:
+            print("❌ La cantidad de sentencias crece con los asientos (N+1)")
+            return 1
+        print("✅ La cantidad de sentencias no depende de la cantidad de asientos")
+        return 0
+    finally:
+        limpiar(session)
+        session.close()
+        dispose_engine()
+
+if __name__ == "__main__":
+    sys.exit(main())
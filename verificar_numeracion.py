@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Prueba de concurrencia de la numeración de asientos.
+
+Registra asientos sin número desde varios hilos a la vez (cada uno con su
+propia sesión) en una serie de prueba y comprueba que los números asignados
+son 1..N, sin repetidos ni huecos, incluso con asientos rechazados en medio.
+Al terminar borra los asientos, saldos y contadores de la prueba.
+
+Uso: python verificar_numeracion.py [hilos] [asientos_por_hilo]
+"""
+import sys
+import os
+import threading
+from datetime import datetime
+
+# Añadir src al path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+ANIO_PRUEBA = 2099
+PREFIJO_PRUEBA = 'PRUEBA'
+
+def registrar(hilo, cantidad, cuentas, usuario_id, resultados, errores):
+    from models import get_session
+    from services.journal_service import JournalService
+
+    session = get_session()
+    service = JournalService()
+    try:
+        for n in range(cantidad):
+            monto = 10 + n
+            lineas = [{'cuenta_id': cuentas[0], 'debe': monto, 'haber': 0},
+                      {'cuenta_id': cuentas[1], 'debe': 0, 'haber': monto}]
+            if n % 7 == 3:
+                # Asiento descuadrado: no debe consumir número
+                lineas[1]['haber'] = monto + 1
+            ok, mensaje = service.crear_asiento(session, None, datetime(ANIO_PRUEBA, 1, 1),
+                                                f"Prueba numeración hilo {hilo}", lineas, usuario_id)
+            if ok:
+                resultados.append(mensaje.split()[2])
+            elif n % 7 != 3:
+                errores.append(mensaje)
+    finally:
+        session.close()
+
+def limpiar(session):
+    from sqlalchemy import select, delete
+    from models import AsientoContable, LineaAsiento, AuditLog, NumeracionAsiento, ContadorAsiento
+    from services.account_balance_service import AccountBalanceService
+
+    prueba = select(AsientoContable.id).where(AsientoContable.numero.like(f"{PREFIJO_PRUEBA}-%"))
+    AccountBalanceService().aplicar_lineas(session, LineaAsiento.asiento_id.in_(prueba), -1)
+    session.execute(delete(AuditLog).where(AuditLog.accion == "CREAR_ASIENTO",
+                                           AuditLog.registro_id.in_(prueba)))
+    session.execute(delete(LineaAsiento).where(LineaAsiento.asiento_id.in_(prueba)))
+    session.execute(delete(AsientoContable).where(AsientoContable.numero.like(f"{PREFIJO_PRUEBA}-%")))
+    session.execute(delete(ContadorAsiento).where(ContadorAsiento.serie.like(f"{PREFIJO_PRUEBA}-%")))
+    session.execute(delete(NumeracionAsiento).where(NumeracionAsiento.anio == ANIO_PRUEBA))
+    session.commit()
+
+def main():
+    from models import init_db, get_session, dispose_engine, Usuario, CuentaContable
+    from services.numbering_service import NumberingService
+
+    hilos = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    por_hilo = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    init_db()
+    session = get_session()
+    try:
+        usuario = session.query(Usuario).filter_by(username='admin').first()
+        cuentas = [c.id for c in session.query(CuentaContable.id)
+                   .filter(CuentaContable.codigo.in_(['1.1', '1.2'])).order_by(CuentaContable.codigo)]
+        limpiar(session)
+        NumberingService().configurar_anio(session, ANIO_PRUEBA, PREFIJO_PRUEBA, 'anual', 5)
+
+        print("🦇 PRUEBA DE CONCURRENCIA - NUMERACIÓN DE ASIENTOS")
+        print(f"   {hilos} hilos x {por_hilo} asientos (1 de cada 7 rechazado)")
+        resultados, errores = [], []
+        trabajadores = [
+            threading.Thread(target=registrar, args=(h, por_hilo, cuentas, usuario.id, resultados, errores))
+            for h in range(hilos)
+        ]
+        inicio = datetime.now()
+        for t in trabajadores:
+            t.start()
+        for t in trabajadores:
+            t.join()
+        segundos = (datetime.now() - inicio).total_seconds()
+
+        correlativos = sorted(int(numero.rsplit('-', 1)[1]) for numero in resultados)
+        esperados = list(range(1, len(correlativos) + 1))
+        repetidos = len(correlativos) - len(set(correlativos))
+
+        print(f"   {len(resultados)} asientos registrados en {segundos:.1f} s")
+        for mensaje in errores[:5]:
+            print(f"   {mensaje}")
+        if errores or repetidos or correlativos != esperados:
+            print(f"❌ Numeración inválida: {repetidos} repetidos, {len(errores)} errores, "
+                  f"huecos: {sorted(set(esperados) - set(correlativos))[:10]}")
+            return 1
+        print(f"✅ Números {PREFIJO_PRUEBA}-{ANIO_PRUEBA}-00001 a {len(correlativos):05d}: sin repetidos ni huecos")
+        return 0
+    finally:
+        limpiar(session)
+        session.close()
+        dispose_engine()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Prueba del pie 'Página N de M' del libro diario en PDF.
+
+ExportService.exportar_pdf dibuja en cada página 'Página N de ' y, a
+continuación, el formulario 'total_paginas' (doForm), que recién se define
+con beginForm al terminar el documento, cuando se conoce M. Este script
+registra asientos de prueba en un año sin movimientos, exporta ese año a
+un PDF temporal y lee el archivo sin dependencias externas: cada página
+debe mostrar su número, invocar el formulario después del texto y tenerlo
+entre sus recursos, y el formulario debe dibujar el total de páginas.
+Al terminar borra los asientos, saldos y auditoría de la prueba.
+
+Uso: python verificar_pdf.py [asientos]
+"""
+import sys
+import os
+import re
+import zlib
+import base64
+import tempfile
+from datetime import datetime, date
+
+# Añadir src al path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+ANIO_PRUEBA = 2097
+PREFIJO_PRUEBA = 'PRUEBAPDF'
+FORMULARIO = b'/FormXob.total_paginas'
+
+def registrar(session, cantidad, cuentas, usuario_id):
+    from services.journal_service import JournalService
+
+    asientos = [{
+        'numero': f"{PREFIJO_PRUEBA}-{n:05d}",
+        'fecha': datetime(ANIO_PRUEBA, 1 + n % 12, 1 + n % 28),
+        'descripcion': f"Prueba de PDF {n}",
+        'lineas': [{'cuenta_id': cuentas[0], 'debe': 30, 'haber': 0},
+                   {'cuenta_id': cuentas[1], 'debe': 0, 'haber': 10},
+                   {'cuenta_id': cuentas[1], 'debe': 0, 'haber': 20}],
+    } for n in range(cantidad)]
+    for ok, mensaje in JournalService().crear_asientos(session, asientos, usuario_id):
+        if not ok:
+            raise RuntimeError(mensaje)
+
+def limpiar(session):
+    from sqlalchemy import select, delete
+    from models import AsientoContable, LineaAsiento, AuditLog
+    from services.account_balance_service import AccountBalanceService
+
+    prueba = select(AsientoContable.id).where(AsientoContable.numero.like(f"{PREFIJO_PRUEBA}-%"))
+    AccountBalanceService().aplicar_lineas(session, LineaAsiento.asiento_id.in_(prueba), -1)
+    session.execute(delete(AuditLog).where(AuditLog.accion == "CREAR_ASIENTO",
+                                           AuditLog.registro_id.in_(prueba)))
+    session.execute(delete(LineaAsiento).where(LineaAsiento.asiento_id.in_(prueba)))
+    session.execute(delete(AsientoContable).where(AsientoContable.numero.like(f"{PREFIJO_PRUEBA}-%")))
+    session.commit()
+
+def leer_objetos(ruta):
+    """{número: cuerpo} de los objetos del PDF (ReportLab no usa object streams)"""
+    with open(ruta, 'rb') as archivo:
+        datos = archivo.read()
+    return {int(numero): cuerpo for numero, cuerpo in re.findall(rb'(\d+) 0 obj\r?\n(.*?)endobj', datos, re.S)}
+
+def contenido(objeto):
+    """Stream decodificado con los filtros de ReportLab (ASCII85 y Flate)"""
+    stream = re.search(rb'stream\r?\n(.*?)endstream', objeto, re.S).group(1).strip()
+    if b'/ASCII85Decode' in objeto:
+        stream = base64.a85decode(stream, adobe=True)
+    if b'/FlateDecode' in objeto:
+        stream = zlib.decompress(stream)
+    return stream
+
+def revisar(ruta):
+    """Lista de fallas del pie de página (vacía si todo está bien) y el total de páginas"""
+    objetos = leer_objetos(ruta)
+    arbol = next(cuerpo for cuerpo in objetos.values() if b'/Type /Pages' in cuerpo)
+    paginas = [int(n) for n in re.findall(rb'(\d+) 0 R', re.search(rb'/Kids \[(.*?)\]', arbol, re.S).group(1))]
+
+    fallas = []
+    for numero, objeto in enumerate(paginas, start=1):
+        pagina = objetos[objeto]
+        texto = contenido(objetos[int(re.search(rb'/Contents (\d+) 0 R', pagina).group(1))])
+        # 'á' se escribe en WinAnsi como \341
+        pie = texto.find(f"(P\\341gina {numero} de ) Tj".encode())
+        if pie < 0:
+            fallas.append(f"página {numero}: falta 'Página {numero} de'")
+            continue
+        if texto.find(FORMULARIO + b' Do', pie) < 0:
+            fallas.append(f"página {numero}: el formulario del total no se invoca después del número")
+        recurso = re.search(re.escape(FORMULARIO) + rb' (\d+) 0 R', pagina)
+        if recurso is None:
+            fallas.append(f"página {numero}: el formulario del total no está entre los recursos")
+            continue
+        formulario = objetos[int(recurso.group(1))]
+        if b'/Subtype /Form' not in formulario or f"({len(paginas)}) Tj".encode() not in contenido(formulario):
+            fallas.append(f"página {numero}: el formulario no dibuja el total {len(paginas)}")
+    return fallas, len(paginas)
+
+def main():
+    from models import init_db, get_session, dispose_engine, Usuario, CuentaContable
+    from services.export_service import ExportService, REPORTLAB_AVAILABLE
+
+    if not REPORTLAB_AVAILABLE:
+        print("❌ ReportLab no está disponible")
+        return 1
+
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 80
+
+    init_db()
+    session = get_session()
+    ruta = os.path.join(tempfile.mkdtemp(), 'libro_diario.pdf')
+    try:
+        usuario = session.query(Usuario).filter_by(username='admin').first()
+        cuentas = [c.id for c in session.query(CuentaContable.id)
+                   .filter(CuentaContable.codigo.in_(['1.1', '1.2'])).order_by(CuentaContable.codigo)]
+        limpiar(session)
+
+        print("🦇 PRUEBA DEL PIE DE PÁGINA - LIBRO DIARIO EN PDF")
+        registrar(session, cantidad, cuentas, usuario.id)
+        lineas = ExportService().exportar_pdf(session, ruta, date(ANIO_PRUEBA, 1, 1), date(ANIO_PRUEBA, 12, 31),
+                                              empresa="PRUEBA")
+
+        fallas, paginas = revisar(ruta)
+        print(f"   {lineas} líneas en {paginas} páginas")
+        for falla in fallas:
+            print(f"   {falla}")
+        if fallas or paginas < 2:
+            print("❌ El pie 'Página N de M' no se dibuja en todas las páginas")
+            return 1
+        print(f"✅ Todas las páginas muestran 'Página N de {paginas}'")
+        return 0
+    finally:
+        limpiar(session)
+        session.close()
+        dispose_engine()
+        if os.path.exists(ruta):
+            os.remove(ruta)
+            os.rmdir(os.path.dirname(ruta))
+
+if __name__ == "__main__":
+    sys.exit(main())